@@ -0,0 +1,104 @@
+"""ClaudeKit agent .md → Codex .toml conversion, done in memory."""
+
+from __future__ import annotations
+
+import re
+from typing import NamedTuple, Optional
+
+from .constants import (
+    AGENT_TOML_REPLACEMENTS,
+    CLAUDE_MODEL_REASONING_EFFORT,
+    CLAUDE_SYNTAX_ADAPTATIONS,
+    CLAUDE_TO_CODEX_MODELS,
+    READ_ONLY_AGENT_ROLES,
+)
+from .normalize_state import rules_version
+from .utils import apply_replacements
+
+DEFAULT_CODEX_MODEL = "gpt-5.3-codex"
+
+_FRONTMATTER_MODEL = re.compile(r"^model:\s*(.+)$")
+_COMMENTED_MODEL = re.compile(r'^#\s*model\s*=\s*"([^"\n]*)"\s*$', re.MULTILINE)
+_WORKSPACE_SANDBOX = re.compile(r'^sandbox_mode\s*=\s*"workspace-write"', re.MULTILINE)
+
+
+class AgentToml(NamedTuple):
+    """A converted agent: final TOML text plus what the log line reports."""
+
+    text: str
+    model: str
+    sandbox: str
+
+
+def agent_rules_version() -> str:
+    """Version of every table that shapes agent TOML output."""
+    return rules_version(
+        AGENT_TOML_REPLACEMENTS,
+        CLAUDE_SYNTAX_ADAPTATIONS,
+        CLAUDE_TO_CODEX_MODELS,
+        CLAUDE_MODEL_REASONING_EFFORT,
+        READ_ONLY_AGENT_ROLES,
+    )
+
+
+def agent_slug(stem: str) -> str:
+    return stem.replace("-", "_")
+
+
+def _model_lines(codex_model: str, effort: str) -> str:
+    return f'model = "{codex_model}"\nmodel_reasoning_effort = "{effort}"'
+
+
+def convert_agent_md(text: str, slug: str) -> Optional[AgentToml]:
+    """Convert agent markdown with YAML frontmatter; None if it has none.
+
+    The result is already normalized (path rewrites and syntax adaptations
+    applied), so normalize_agent_toml leaves it unchanged.
+    """
+    if not text.startswith("---"):
+        return None
+    parts = text.split("---", 2)
+    if len(parts) < 3:
+        return None
+    frontmatter = parts[1].strip()
+    body = parts[2].strip()
+
+    claude_model = ""
+    for line in frontmatter.splitlines():
+        m = _FRONTMATTER_MODEL.match(line)
+        if m:
+            claude_model = m.group(1).strip().strip("'\"")
+
+    codex_model = CLAUDE_TO_CODEX_MODELS.get(claude_model, DEFAULT_CODEX_MODEL)
+    effort = CLAUDE_MODEL_REASONING_EFFORT.get(claude_model, "high")
+    sandbox = "read-only" if slug in READ_ONLY_AGENT_ROLES else "workspace-write"
+
+    lines = []
+    if codex_model:
+        lines.append(_model_lines(codex_model, effort))
+    lines.append(f'sandbox_mode = "{sandbox}"')
+    lines.append("")
+    # Escape triple quotes in body
+    safe_body = body.replace('"""', '\\"\\"\\"\\"')
+    lines.append(f'developer_instructions = """\n{safe_body}\n"""')
+    toml = "\n".join(lines) + "\n"
+    return AgentToml(normalize_agent_toml(toml, slug), codex_model, sandbox)
+
+
+def _activate_model(m: "re.Match[str]") -> str:
+    claude_name = m.group(1)
+    if claude_name not in CLAUDE_TO_CODEX_MODELS:
+        return m.group(0)
+    codex_model = CLAUDE_TO_CODEX_MODELS[claude_name]
+    if not codex_model:
+        return ""
+    return _model_lines(codex_model, CLAUDE_MODEL_REASONING_EFFORT.get(claude_name, "high"))
+
+
+def normalize_agent_toml(text: str, slug: str) -> str:
+    """Apply path/syntax rewrites, activate commented Claude models, enforce sandbox policy."""
+    text = apply_replacements(text, AGENT_TOML_REPLACEMENTS + CLAUDE_SYNTAX_ADAPTATIONS)
+    text = _COMMENTED_MODEL.sub(_activate_model, text)
+    if slug in READ_ONLY_AGENT_ROLES:
+        text = _WORKSPACE_SANDBOX.sub('sandbox_mode = "read-only"', text)
+    return text
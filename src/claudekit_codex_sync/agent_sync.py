@@ -0,0 +1,151 @@
+"""Agent sync: .md converted straight to .toml, and agent TOMLs in codex_home normalized."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .agent_converter import agent_rules_version, agent_slug, convert_agent_md, normalize_agent_toml
+from .copy_backend import copy_file_if_changed
+from .fs_index import note_removed
+from .normalize_state import AGENT_TOML, NormalizeState, content_hash
+from .sync_registry import entry_is_fresh, make_entry
+from .utils import atomic_write_bytes, map_ordered, write_bytes_if_changed
+
+
+def sync_agent(
+    src: Path,
+    agents_src: Path,
+    agents_dst: Path,
+    *,
+    registry: dict | None,
+    dry_run: bool,
+    paranoid: bool = False,
+    rules: Optional[str] = None,
+) -> Tuple[str, str, Optional[dict]]:
+    """Convert one agent straight to its .toml; agents without frontmatter are copied.
+
+    rules is the agent rules version; an entry converted under other rules
+    is reconverted. Returns (status, target rel path, new registry entry or None).
+    """
+    toml_dst = agents_dst / f"{agent_slug(src.stem)}.toml"
+    key = f"agents/{toml_dst.name}"
+    entry = registry.get("entries", {}).get(key) if registry else None
+    if src.parent == agents_src and not paranoid and entry_is_fresh(entry, src, toml_dst, rules=rules):
+        return "unchanged", key, None
+
+    agent = None
+    if src.parent == agents_src:
+        agent = convert_agent_md(src.read_text(encoding="utf-8"), agent_slug(src.stem))
+    new_entry = None
+    if agent is None:
+        rel = src.relative_to(agents_src)
+        key = f"agents/{rel.as_posix()}"
+        changed, is_added = copy_file_if_changed(src, agents_dst / rel, mode=None, dry_run=dry_run)
+    else:
+        data = agent.text.encode("utf-8")
+        changed, is_added = write_bytes_if_changed(toml_dst, data, mode=None, dry_run=dry_run)
+        if registry and not dry_run:
+            new_entry = make_entry(src, toml_dst, previous=entry, paranoid=paranoid, rules=rules)
+    status = "unchanged"
+    if changed:
+        status = "added" if is_added else "updated"
+    return status, key, new_entry
+
+
+def sync_agents_from_dir(
+    source: Path,
+    *,
+    codex_home: Path,
+    dry_run: bool,
+    registry: dict | None = None,
+    jobs: int = 1,
+    paranoid: bool = False,
+) -> Dict[str, int]:
+    """Convert source/agents/*.md into codex_home/agents. Returns status counts."""
+    counts = {"added": 0, "updated": 0, "skipped": 0, "unchanged": 0}
+    agents_src = source / "agents"
+    if not agents_src.exists():
+        return counts
+    agents_dst = codex_home / "agents"
+    if not dry_run:
+        agents_dst.mkdir(parents=True, exist_ok=True)
+    agent_files = [p for p in sorted(agents_src.rglob("*.md")) if p.is_file()]
+    rules = agent_rules_version()
+    results = map_ordered(
+        lambda p: sync_agent(
+            p, agents_src, agents_dst,
+            registry=registry, dry_run=dry_run, paranoid=paranoid, rules=rules,
+        ),
+        agent_files,
+        jobs=jobs,
+    )
+    for status, key, entry in results:
+        counts[status] += 1
+        if entry is not None:
+            registry["entries"][key] = entry
+    return counts
+
+
+def convert_agents_md_to_toml(*, codex_home: Path, dry_run: bool) -> int:
+    """Convert ClaudeKit agent .md files already in codex_home to Codex .toml format.
+
+    Live sync converts agents straight from the source; this handles .md
+    files placed in codex_home/agents by other means.
+    """
+    agents_dir = codex_home / "agents"
+    if not agents_dir.exists():
+        return 0
+
+    converted = 0
+    for md_file in sorted(agents_dir.glob("*.md")):
+        slug = agent_slug(md_file.stem)
+        agent = convert_agent_md(md_file.read_text(encoding="utf-8"), slug)
+        if agent is None:
+            continue
+        if not dry_run:
+            write_bytes_if_changed(
+                agents_dir / f"{slug}.toml", agent.text.encode("utf-8"), mode=None, dry_run=False
+            )
+            md_file.unlink()  # Remove source .md — Codex only needs .toml
+            note_removed(md_file)
+        converted += 1
+        print(f"convert: agents/{md_file.name} → agents/{slug}.toml ({agent.model}, {agent.sandbox})")
+
+    return converted
+
+
+def normalize_agent_tomls(*, codex_home: Path, dry_run: bool, registry: Optional[dict] = None) -> int:
+    """Normalize paths and models in agent TOML files.
+
+    With a registry, TOMLs unchanged since the last run under the same
+    rules and model mappings are skipped without being read.
+    """
+    agents_dir = codex_home / "agents"
+    if not agents_dir.exists():
+        return 0
+
+    # First convert any .md agents to .toml
+    convert_agents_md_to_toml(codex_home=codex_home, dry_run=dry_run)
+
+    state = NormalizeState(registry, AGENT_TOML, agent_rules_version())
+    changed = 0
+    for toml_file in sorted(agents_dir.glob("*.toml")):
+        rel = f"agents/{toml_file.name}"
+        if state.is_current(rel, toml_file):
+            continue
+        data = toml_file.read_bytes()
+        input_hash = content_hash(data)
+        if state.already_normalized(rel, data):
+            state.record(rel, toml_file, input_hash=input_hash, output_hash=input_hash)
+            continue
+        text = data.decode("utf-8")
+        new_text = normalize_agent_toml(text, toml_file.stem)
+        new_data = new_text.encode("utf-8")
+        if new_text != text:
+            changed += 1
+            if not dry_run:
+                atomic_write_bytes(toml_file, new_data)
+        state.record(rel, toml_file, input_hash=input_hash, output_hash=content_hash(new_data))
+    state.save(dry_run=dry_run)
+    return changed
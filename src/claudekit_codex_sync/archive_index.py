@@ -0,0 +1,140 @@
+"""One-pass indexes of ClaudeKit archives (zip, tar.gz, tar.xz, tar.zst)."""
+
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from .constants import ARCHIVE_SUFFIXES, ASSET_DIRS, ASSET_FILES, TAR_SUFFIXES
+from .source_resolver import zip_mode
+from .utils import SyncError
+from .zip_extract import ExtractItem, ExtractResult, extract_members
+
+CLAUDE_PREFIX = ".claude/"
+
+
+class ArchiveEntry(NamedTuple):
+    """A validated file member with the metadata sync needs.
+
+    stamp is the member's CRC32 for zip and its mtime for tar; together with
+    size it identifies unchanged members between runs.
+    """
+
+    name: str
+    rel: str
+    size: int
+    stamp: int
+    mode: Optional[int]
+
+
+def _is_unsafe(rel: str) -> bool:
+    return rel.startswith("/") or ".." in rel.split("/")
+
+
+class ArchiveIndex(ABC):
+    """Members of an archive classified as assets, hooks or skill files.
+
+    Every path under .claude/ is validated once while indexing, so
+    consumers never re-check or re-look-up members.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.assets: Dict[str, ArchiveEntry] = {}
+        self.hooks: Dict[str, ArchiveEntry] = {}
+        # skill name -> inner path -> entry
+        self.skills: Dict[str, Dict[str, ArchiveEntry]] = {}
+        self.ignored = 0
+
+    def _add(self, name: str, size: int, stamp: int, mode: Optional[int]) -> Optional[ArchiveEntry]:
+        """Classify one file member. Returns None if sync does not use it."""
+        if not name.startswith(CLAUDE_PREFIX):
+            self.ignored += 1
+            return None
+        rel = name[len(CLAUDE_PREFIX) :].replace("\\", "/")
+        if _is_unsafe(rel):
+            raise SyncError(f"Unsafe archive entry path: {name}")
+        entry = ArchiveEntry(name, rel, size, stamp, mode)
+        first, _, rest = rel.partition("/")
+        if first == "skills":
+            skill, _, inner = rest.partition("/")
+            if not (skill and inner):
+                self.ignored += 1
+                return None
+            self.skills.setdefault(skill, {})[inner] = entry
+        elif first == "hooks":
+            self.hooks[rel] = entry
+        elif first in ASSET_DIRS or rel in ASSET_FILES:
+            self.assets[rel] = entry
+        else:
+            self.ignored += 1
+            return None
+        return entry
+
+    def managed_assets(self, *, include_hooks: bool) -> List[ArchiveEntry]:
+        """Asset (and optionally hook) entries sorted by relative path."""
+        entries = list(self.assets.values())
+        if include_hooks:
+            entries.extend(self.hooks.values())
+        return sorted(entries, key=lambda e: e.rel)
+
+    @abstractmethod
+    def extract(self, items: Sequence[ExtractItem], *, jobs: int, dry_run: bool) -> List[ExtractResult]:
+        """Write items to their destinations; results are in item order."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ArchiveIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class ZipIndex(ArchiveIndex):
+    """Index built from a single walk over zf.infolist()."""
+
+    def __init__(self, zf: zipfile.ZipFile) -> None:
+        super().__init__(Path(zf.filename) if zf.filename else None)
+        self.zf = zf
+
+    @classmethod
+    def build(cls, zf: zipfile.ZipFile) -> "ZipIndex":
+        index = cls(zf)
+        for info in zf.infolist():
+            if info.is_dir():
+                index.ignored += 1
+                continue
+            index._add(info.filename, info.file_size, info.CRC, zip_mode(info))
+        return index
+
+    def extract(self, items: Sequence[ExtractItem], *, jobs: int, dry_run: bool) -> List[ExtractResult]:
+        return extract_members(self.zf, items, jobs=jobs, dry_run=dry_run)
+
+    def close(self) -> None:
+        self.zf.close()
+
+
+def open_archive(
+    path: Path, *, skip: Optional[Callable[[ArchiveEntry], bool]] = None
+) -> ArchiveIndex:
+    """Index a ClaudeKit archive, choosing the reader from its suffix.
+
+    skip marks members sync will not extract; tar archives leave those
+    compressed (zip reads members on demand, so it needs no hint).
+    """
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        return ZipIndex.build(zipfile.ZipFile(path))
+    if name.endswith(TAR_SUFFIXES):
+        from .tar_index import TarIndex
+
+        try:
+            return TarIndex.build(path, skip=skip)
+        except tarfile.TarError as exc:
+            raise SyncError(f"Cannot read tar archive {path}: {exc}") from exc
+    raise SyncError(f"Unsupported archive type: {path.name} (expected {', '.join(ARCHIVE_SUFFIXES)})")
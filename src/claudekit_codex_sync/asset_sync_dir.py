@@ -1,172 +1,137 @@
-"""Asset and skill synchronization from live directory."""
+"""Asset synchronization from live directory."""
 
 from __future__ import annotations
 
-import shutil
+import hashlib
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
-from .constants import ASSET_DIRS, ASSET_FILES, CONFLICT_SKILLS, EXCLUDED_SKILLS_ALWAYS, MCP_SKILLS
-from .sync_registry import check_user_edit, maybe_backup, update_entry
-from .utils import compute_hash, create_backup, is_excluded_path, write_bytes_if_changed
+from .agent_sync import sync_agents_from_dir
+from .backup_store import store_backup
+from .constants import ASSET_DIRS, ASSET_FILES
+from .copy_backend import copy_file_if_changed
+from .path_normalizer import markdown_rules_version, needs_normalization, normalize_bytes
+from .sync_registry import check_user_edit, entry_is_fresh, make_entry, maybe_backup
+from .utils import compute_hash, is_excluded_path, map_ordered, write_bytes_if_changed
 
 
-def sync_assets_from_dir(
-    source: Path,
-    *,
-    codex_home: Path,
-    include_hooks: bool,
-    dry_run: bool,
-    registry: dict | None = None,
-    force: bool = True,
-) -> Dict[str, int]:
-    """Sync non-skill assets from live directory."""
-    added = updated = skipped = 0
-
-    for dirname in ASSET_DIRS:
+def _collect_asset_files(source: Path, codex_home: Path) -> List[Tuple[str, Path, Path]]:
+    """List managed asset files as (rel_path, src, dst), in sync order."""
+    files: List[Tuple[str, Path, Path]] = []
+    for dirname in sorted(ASSET_DIRS):
         src_dir = source / dirname
         if not src_dir.exists():
             continue
-        dst_dir = codex_home / dirname
-        if not dry_run:
-            dst_dir.mkdir(parents=True, exist_ok=True)
-
         for src_file in sorted(src_dir.rglob("*")):
             if not src_file.is_file() or is_excluded_path(src_file.parts):
                 continue
             rel = src_file.relative_to(src_dir)
-            rel_path = f"{dirname}/{rel}"
-            dst = dst_dir / rel
-
-            if not force and registry and dst.exists():
-                entry = registry.get("entries", {}).get(rel_path)
-                if entry:
-                    if dry_run and check_user_edit(entry, dst):
-                        skipped += 1
-                        continue
-                    backup = maybe_backup(registry, rel_path, dst, respect_edits=True)
-                    if backup:
-                        skipped += 1
-                        continue
-                elif compute_hash(src_file) != compute_hash(dst):
-                    if not dry_run:
-                        create_backup(dst)
-
-            data = src_file.read_bytes()
-            mode = src_file.stat().st_mode & 0o777 if src_file.stat().st_mode & 0o111 else None
-            changed, is_added = write_bytes_if_changed(dst, data, mode=mode, dry_run=dry_run)
-            if changed:
-                if is_added:
-                    added += 1
-                else:
-                    updated += 1
-            if registry and not dry_run and dst.exists():
-                update_entry(registry, rel_path, src_file, dst)
-
-    for filename in ASSET_FILES:
+            files.append((f"{dirname}/{rel.as_posix()}", src_file, codex_home / dirname / rel))
+    for filename in sorted(ASSET_FILES):
         src = source / filename
-        if not src.exists():
-            continue
-        rel_path = filename
-        dst = codex_home / filename
-
-        if not force and registry and dst.exists():
-            entry = registry.get("entries", {}).get(rel_path)
-            if entry:
-                if dry_run and check_user_edit(entry, dst):
-                    skipped += 1
-                    continue
-                backup = maybe_backup(registry, rel_path, dst, respect_edits=True)
-                if backup:
-                    skipped += 1
-                    continue
-            elif compute_hash(src) != compute_hash(dst):
-                if not dry_run:
-                    create_backup(dst)
-
-        data = src.read_bytes()
-        mode = src.stat().st_mode & 0o777 if src.stat().st_mode & 0o111 else None
-        changed, is_added = write_bytes_if_changed(dst, data, mode=mode, dry_run=dry_run)
-        if changed:
-            if is_added:
-                added += 1
-            else:
-                updated += 1
-        if registry and not dry_run and dst.exists():
-            update_entry(registry, rel_path, src, dst)
-
-    # Copy agents directly to codex_home/agents/
-    agents_src = source / "agents"
-    if agents_src.exists():
-        agents_dst = codex_home / "agents"
-        if not dry_run:
-            agents_dst.mkdir(parents=True, exist_ok=True)
-        for src_file in sorted(agents_src.rglob("*.md")):
-            if not src_file.is_file():
-                continue
-            rel = src_file.relative_to(agents_src)
-            dst = agents_dst / rel
-            data = src_file.read_bytes()
-            changed, is_added = write_bytes_if_changed(dst, data, mode=None, dry_run=dry_run)
-            if changed:
-                if is_added:
-                    added += 1
-                else:
-                    updated += 1
+        if src.exists():
+            files.append((filename, src, codex_home / filename))
+    return files
 
-    return {"added": added, "updated": updated, "removed": 0, "skipped": skipped}
 
-
-def sync_skills_from_dir(
-    source: Path,
+def _sync_asset(
+    rel_path: str,
+    src: Path,
+    dst: Path,
     *,
     codex_home: Path,
-    include_mcp: bool,
-    include_conflicts: bool,
+    registry: dict | None,
+    force: bool,
     dry_run: bool,
-) -> Dict[str, int]:
-    """Sync skills from live directory."""
-    skills_src = source / "skills"
-    skills_dst = codex_home / "skills"
-    added = updated = skipped = 0
-
-    if not skills_src.exists():
-        return {"added": 0, "updated": 0, "skipped": 0, "total_skills": 0}
-
-    for skill_dir in sorted(skills_src.iterdir()):
-        if not skill_dir.is_dir() or skill_dir.name.startswith("."):
-            continue
-        skill = skill_dir.name
-
-        if skill in EXCLUDED_SKILLS_ALWAYS:
-            skipped += 1
-            continue
-        if not include_mcp and skill in MCP_SKILLS:
-            skipped += 1
-            continue
-        if skill in CONFLICT_SKILLS:
-            skipped += 1
-            continue
-        if not include_conflicts and (skills_dst / ".system" / skill).exists():
-            skipped += 1
-            continue
-
-        dst = skills_dst / skill
-        exists = dst.exists()
-        if exists:
-            updated += 1
+    paranoid: bool = False,
+    md_rules: Optional[str] = None,
+) -> Tuple[str, Optional[dict]]:
+    """Sync one managed asset. Returns (status, new registry entry or None).
+
+    md_rules is the markdown rules version, recorded for normalized files.
+    """
+    rules = md_rules if needs_normalization(rel_path) else None
+    entry = registry.get("entries", {}).get(rel_path) if registry else None
+    if not paranoid and entry_is_fresh(entry, src, dst, rules=rules):
+        return "unchanged", None
+
+    # Normalized on copy, so the target holds the transformed bytes.
+    data = normalize_bytes(src.read_bytes()) if rules is not None else None
+
+    if not force and registry and dst.exists():
+        if entry:
+            if dry_run and check_user_edit(entry, dst, paranoid=paranoid):
+                return "skipped", None
+            backup = maybe_backup(registry, rel_path, dst, respect_edits=True, paranoid=paranoid)
+            if backup:
+                return "skipped", None
         else:
-            added += 1
-
-        if dry_run:
-            continue
+            expected = compute_hash(src) if data is None else hashlib.sha256(data).hexdigest()
+            if expected != compute_hash(dst) and not dry_run:
+                store_backup(codex_home, rel_path, dst)
+
+    st_mode = src.stat().st_mode
+    mode = st_mode & 0o777 if st_mode & 0o111 else None
+    if registry and not dry_run:
+        # Hash before copying so the copy inherits the digest and make_entry reads nothing.
+        compute_hash(src)
+    if data is not None:
+        changed, is_added = write_bytes_if_changed(dst, data, mode=mode, dry_run=dry_run)
+    else:
+        changed, is_added = copy_file_if_changed(src, dst, mode=mode, dry_run=dry_run)
+    status = "unchanged"
+    if changed:
+        status = "added" if is_added else "updated"
+    new_entry = None
+    if registry and not dry_run and dst.exists():
+        new_entry = make_entry(src, dst, previous=entry, paranoid=paranoid, rules=rules)
+    return status, new_entry
 
-        if exists:
-            shutil.rmtree(dst)
-        ignore = shutil.ignore_patterns("*.pyc", "__pycache__", ".venv", "node_modules", "dist", "build")
-        shutil.copytree(skill_dir, dst, ignore=ignore)
 
-    if not dry_run:
-        skills_dst.mkdir(parents=True, exist_ok=True)
-    total_skills = len(list(skills_dst.rglob("SKILL.md")))
-    return {"added": added, "updated": updated, "skipped": skipped, "total_skills": total_skills}
+def sync_assets_from_dir(
+    source: Path,
+    *,
+    codex_home: Path,
+    include_hooks: bool,
+    dry_run: bool,
+    registry: dict | None = None,
+    force: bool = True,
+    jobs: int = 1,
+    paranoid: bool = False,
+) -> Dict[str, int]:
+    """Sync non-skill assets from live directory."""
+    counts = {"added": 0, "updated": 0, "skipped": 0, "unchanged": 0}
+
+    files = _collect_asset_files(source, codex_home)
+    md_rules = markdown_rules_version()
+    results = map_ordered(
+        lambda f: _sync_asset(
+            *f,
+            codex_home=codex_home,
+            registry=registry,
+            force=force,
+            dry_run=dry_run,
+            paranoid=paranoid,
+            md_rules=md_rules,
+        ),
+        files,
+        jobs=jobs,
+    )
+    for (rel_path, _, _), (status, entry) in zip(files, results):
+        counts[status] += 1
+        if entry is not None:
+            registry["entries"][rel_path] = entry
+
+    # Convert agents straight to codex_home/agents/*.toml
+    agents = sync_agents_from_dir(
+        source, codex_home=codex_home, dry_run=dry_run, registry=registry, jobs=jobs, paranoid=paranoid
+    )
+    for status, count in agents.items():
+        counts[status] += count
+
+    return {
+        "added": counts["added"],
+        "updated": counts["updated"],
+        "removed": 0,
+        "skipped": counts["skipped"],
+    }
@@ -1,22 +1,18 @@
-"""Asset and skill synchronization from zip files."""
+"""Asset synchronization from zip files."""
 
 from __future__ import annotations
 
-import shutil
-import zipfile
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
-from .constants import (
-    ASSET_DIRS,
-    ASSET_FILES,
-    ASSET_MANIFEST,
-    CONFLICT_SKILLS,
-    EXCLUDED_SKILLS_ALWAYS,
-    MCP_SKILLS,
-)
-from .source_resolver import collect_skill_entries, zip_mode
-from .utils import SyncError, load_manifest, save_manifest, write_bytes_if_changed
+from .archive_index import ArchiveEntry, ArchiveIndex
+from .constants import ASSET_MANIFEST, SKILLS_MANIFEST
+from .fs_index import note_removed
+from .manifest_store import load_manifest_records, save_manifest_records
+from .path_normalizer import markdown_rules_version, needs_normalization, normalize_bytes
+from .tree_delta import source_unchanged, stat_record
+from .utils import SyncError, prune_empty_parents
+from .zip_extract import ExtractItem
 
 
 def _validate_zip_relpath(rel: str, zip_name: str) -> str:
@@ -28,30 +24,58 @@ def _validate_zip_relpath(rel: str, zip_name: str) -> str:
     return normalized
 
 
+def extract_item(
+    entry: ArchiveEntry, rel: str, dst: Path, md_rules: str
+) -> Tuple[ExtractItem, List[int], Optional[str]]:
+    """Describe an archive member to extract, its [stamp, size] source stat and rules version.
+
+    The stat comes from the archive index, so unchanged members can be
+    recognised without decompressing them. Files that get path
+    normalization are normalized on the way out, and their record carries
+    md_rules so a rule change re-extracts them.
+    """
+    rules = md_rules if needs_normalization(rel) else None
+    transform = normalize_bytes if rules is not None else None
+    item = ExtractItem(entry.name, dst, entry.size, entry.mode, transform)
+    return item, [entry.stamp, entry.size], rules
+
+
+def unchanged_members(codex_home: Path) -> Callable[[ArchiveEntry], bool]:
+    """Predicate for archive members whose last extraction into codex_home is current.
+
+    Lets a streaming archive index skip decompressing members that
+    sync_assets/sync_skills will leave alone.
+    """
+    records = {
+        **load_manifest_records(codex_home / ASSET_MANIFEST),
+        **load_manifest_records(codex_home / SKILLS_MANIFEST),
+    }
+    md_rules = markdown_rules_version()
+
+    def unchanged(entry: ArchiveEntry) -> bool:
+        item, stat, rules = extract_item(entry, entry.rel, codex_home / entry.rel, md_rules)
+        return source_unchanged(records.get(entry.rel), stat, item.dst, rules)
+
+    return unchanged
+
+
 def sync_assets(
-    zf: zipfile.ZipFile,
+    index: ArchiveIndex,
     *,
     codex_home: Path,
     include_hooks: bool,
     dry_run: bool,
+    paranoid: bool = False,
+    jobs: int = 1,
 ) -> Dict[str, int]:
     """Sync non-skill assets from zip to codex_home."""
     manifest_path = codex_home / ASSET_MANIFEST
-    old_manifest = load_manifest(manifest_path)
+    old_records = load_manifest_records(manifest_path)
+    old_manifest = set(old_records)
 
-    selected: List[Tuple[str, str]] = []
-    for name in zf.namelist():
-        if name.endswith("/") or not name.startswith(".claude/"):
-            continue
-        rel = _validate_zip_relpath(name[len(".claude/") :], name)
-        first = rel.split("/", 1)[0]
-        if first == "hooks" and include_hooks:
-            selected.append((name, rel))
-            continue
-        if first in ASSET_DIRS or rel in ASSET_FILES:
-            selected.append((name, rel))
-
-    new_manifest = {rel for _, rel in selected}
+    selected = index.managed_assets(include_hooks=include_hooks)
+    new_manifest = {entry.rel for entry in selected}
+    new_records: Dict[str, Optional[Dict[str, List[int]]]] = {}
     added = updated = removed = 0
 
     for rel in sorted(old_manifest - new_manifest):
@@ -62,12 +86,26 @@ def sync_assets(
             print(f"remove: {safe_rel}")
             if not dry_run:
                 target.unlink()
+                note_removed(target)
+                prune_empty_parents(target.parent, stop=codex_home)
+
+    md_rules = markdown_rules_version()
+    items: List[ExtractItem] = []
+    pending: List[Tuple[str, List[int], Optional[str]]] = []
+    for entry in selected:
+        rel = entry.rel
+        item, stat, rules = extract_item(entry, rel, codex_home / rel, md_rules)
+        prev = old_records.get(rel)
+        if not paranoid and source_unchanged(prev, stat, item.dst, rules):
+            new_records[rel] = prev
+            continue
+        items.append(item)
+        pending.append((rel, stat, rules))
 
-    for zip_name, rel in sorted(selected, key=lambda x: x[1]):
-        info = zf.getinfo(zip_name)
-        data = zf.read(zip_name)
-        dst = codex_home / rel
-        changed, is_added = write_bytes_if_changed(dst, data, mode=zip_mode(info), dry_run=dry_run)
+    results = index.extract(items, jobs=jobs, dry_run=dry_run)
+    for (rel, stat, rules), (changed, is_added, target_stat) in zip(pending, results):
+        if target_stat is not None:
+            new_records[rel] = stat_record(stat, target_stat, rules)
         if changed:
             if is_added:
                 added += 1
@@ -78,73 +116,8 @@ def sync_assets(
 
     if not dry_run:
         codex_home.mkdir(parents=True, exist_ok=True)
-    save_manifest(manifest_path, new_manifest, dry_run=dry_run)
-
-    if not dry_run:
-        for d in sorted(codex_home.rglob("*"), reverse=True):
-            if d.is_dir():
-                try:
-                    d.rmdir()
-                except OSError:
-                    pass
+    for rel in new_manifest - set(new_records):
+        new_records[rel] = old_records.get(rel)
+    save_manifest_records(manifest_path, new_records, dry_run=dry_run)
 
     return {"added": added, "updated": updated, "removed": removed, "managed_files": len(new_manifest)}
-
-
-def sync_skills(
-    zf: zipfile.ZipFile,
-    *,
-    codex_home: Path,
-    include_mcp: bool,
-    include_conflicts: bool,
-    dry_run: bool,
-) -> Dict[str, int]:
-    """Sync skills from zip to codex_home/skills."""
-    skills_dir = codex_home / "skills"
-    skill_entries = collect_skill_entries(zf)
-    added = updated = skipped = 0
-
-    for skill in sorted(skill_entries):
-        if skill in EXCLUDED_SKILLS_ALWAYS:
-            skipped += 1
-            print(f"skip: {skill}")
-            continue
-        if not include_mcp and skill in MCP_SKILLS:
-            skipped += 1
-            print(f"skip: {skill}")
-            continue
-        if skill in CONFLICT_SKILLS:
-            skipped += 1
-            print(f"skip: {skill}")
-            continue
-        if not include_conflicts and (skills_dir / ".system" / skill).exists():
-            skipped += 1
-            print(f"skip: {skill}")
-            continue
-
-        dst_skill_dir = skills_dir / skill
-        exists = dst_skill_dir.exists()
-        if exists:
-            updated += 1
-            print(f"update: {skill}")
-        else:
-            added += 1
-            print(f"add: {skill}")
-
-        if dry_run:
-            continue
-
-        if exists:
-            shutil.rmtree(dst_skill_dir)
-        dst_skill_dir.mkdir(parents=True, exist_ok=True)
-
-        for zip_name, inner in sorted(skill_entries[skill], key=lambda x: x[1]):
-            info = zf.getinfo(zip_name)
-            data = zf.read(zip_name)
-            dst = dst_skill_dir / inner
-            write_bytes_if_changed(dst, data, mode=zip_mode(info), dry_run=False)
-
-    if not dry_run:
-        skills_dir.mkdir(parents=True, exist_ok=True)
-    total_skills = len(list(skills_dir.rglob("SKILL.md")))
-    return {"added": added, "updated": updated, "skipped": skipped, "total_skills": total_skills}
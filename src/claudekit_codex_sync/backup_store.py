@@ -0,0 +1,124 @@
+"""Content-addressed backup store for user-edited managed files."""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .copy_backend import copy_file
+from .utils import atomic_write_bytes, compute_hash
+
+BACKUP_DIR = ".ck-backups"
+DEFAULT_KEEP = 5
+DEFAULT_MAX_AGE_DAYS = 30
+
+_lock = threading.Lock()
+
+
+def _root(codex_home: Path) -> Path:
+    return codex_home / BACKUP_DIR
+
+
+def _object_path(codex_home: Path, digest: str) -> Path:
+    return _root(codex_home) / "objects" / digest[:2] / digest
+
+
+def _index_path(codex_home: Path) -> Path:
+    return _root(codex_home) / "index.jsonl"
+
+
+def list_backups(codex_home: Path) -> List[Dict[str, str]]:
+    """Return backup records ({path, ts, hash}) oldest first."""
+    index = _index_path(codex_home)
+    if not index.exists():
+        return []
+    lines = index.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def store_backup(codex_home: Path, rel_path: str, target: Path) -> Path:
+    """Back up target under its content hash. Identical content is stored once.
+
+    No record is added when the newest backup of rel_path already holds
+    this content, so an edit skipped on every run is indexed once.
+    """
+    digest = compute_hash(target)
+    obj = _object_path(codex_home, digest)
+    with _lock:
+        if not obj.exists():
+            # A skipped user-edited target stays in place and may be edited again,
+            # so the object must not share its inode; reflink keeps this free on CoW filesystems.
+            copy_file(target, obj)
+        previous = [r for r in list_backups(codex_home) if r["path"] == rel_path]
+        if previous and previous[-1]["hash"] == digest:
+            return obj
+        record = {
+            "path": rel_path,
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "hash": digest,
+        }
+        with open(_index_path(codex_home), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    return obj
+
+
+def restore_backup(codex_home: Path, rel_path: str, *, ts: Optional[str] = None) -> Optional[str]:
+    """Restore the newest backup of rel_path (or the one taken at ts). Returns its ts."""
+    matches = [r for r in list_backups(codex_home) if r["path"] == rel_path]
+    if ts is not None:
+        matches = [r for r in matches if r["ts"].startswith(ts)]
+    if not matches:
+        return None
+    record = matches[-1]
+    copy_file(_object_path(codex_home, record["hash"]), codex_home / rel_path)
+    return record["ts"]
+
+
+def gc_backups(
+    codex_home: Path,
+    *,
+    keep: int = DEFAULT_KEEP,
+    max_age_days: int = DEFAULT_MAX_AGE_DAYS,
+    now: Optional[datetime] = None,
+) -> Tuple[int, int]:
+    """Apply retention and drop unreferenced objects. Returns (records, objects) removed.
+
+    Per path, the newest `keep` records younger than `max_age_days` are kept;
+    the newest record of every path is always kept.
+    """
+    records = list_backups(codex_home)
+    if not records:
+        return 0, 0
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max_age_days)
+    by_path: Dict[str, List[Dict[str, str]]] = {}
+    for record in records:
+        by_path.setdefault(record["path"], []).append(record)
+
+    kept_ids = set()
+    for path_records in by_path.values():
+        newest_first = path_records[::-1]
+        for i, record in enumerate(newest_first):
+            fresh = datetime.fromisoformat(record["ts"]) >= cutoff
+            if i == 0 or (i < keep and fresh):
+                kept_ids.add(id(record))
+    kept = [r for r in records if id(r) in kept_ids]
+
+    with _lock:
+        if len(kept) != len(records):
+            data = "".join(json.dumps(r) + "\n" for r in kept)
+            atomic_write_bytes(_index_path(codex_home), data.encode("utf-8"))
+        referenced = {r["hash"] for r in kept}
+        removed_objects = 0
+        objects_dir = _root(codex_home) / "objects"
+        for obj in sorted(objects_dir.glob("*/*")):
+            if obj.name not in referenced:
+                obj.unlink()
+                removed_objects += 1
+                try:
+                    obj.parent.rmdir()
+                except OSError:
+                    pass
+    return len(records) - len(kept), removed_objects
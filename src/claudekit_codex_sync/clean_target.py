@@ -56,7 +56,11 @@ def clean_target(codex_home: Path, *, dry_run: bool) -> int:
     # Clean top-level files
     for name in (
         ".claudekit-sync-registry.json",
+        ".claudekit-sync-registry.sqlite",
+        ".claudekit-sync-registry.sqlite-wal",
+        ".claudekit-sync-registry.sqlite-shm",
         ".sync-manifest-assets.txt",
+        ".sync-manifest-skills.txt",
         ".ck.json",
         ".env.example",
     ):
@@ -3,94 +3,57 @@
 
 from __future__ import annotations
 
-import argparse
 import os
-import zipfile
 from pathlib import Path
 
-from .asset_sync_dir import sync_assets_from_dir, sync_skills_from_dir
-from .asset_sync_zip import sync_assets, sync_skills
+from .agent_sync import normalize_agent_tomls
+from .archive_index import open_archive
+from .asset_sync_dir import sync_assets_from_dir
+from .asset_sync_zip import sync_assets, unchanged_members
+from .backup_store import gc_backups
 from .bridge_generator import ensure_bridge_skill
 from .clean_target import clean_target
+from .cli_args import parse_args
+from .cli_commands import run_backups_command, run_registry_command
+from .cli_report import log_bootstrap, log_stats, log_verify
 from .config_enforcer import (
-    enforce_config,
-    enforce_multi_agent_flag,
+    apply_agent_roles,
+    apply_config_defaults,
+    apply_multi_agent_flag,
     ensure_agents,
-    register_agents,
+    load_config,
+    save_config,
 )
+from .copy_backend import set_copy_backend
 from .dep_bootstrapper import bootstrap_deps
-from .log_formatter import log_done, log_error, log_ok, log_section, log_skip
-from .log_formatter import log_header, log_summary
-from .path_normalizer import normalize_agent_tomls, normalize_files
+from .fs_index import activate_index, deactivate_index
+from .hash_cache import reset_hash_cache
+from .log_formatter import log_done, log_header, log_ok, log_section, log_summary
+from .path_normalizer import normalize_files
 from .rules_generator import generate_hook_rules
 from .runtime_verifier import verify_runtime
-from .source_resolver import detect_claude_source, find_latest_zip, validate_source
+from .skill_sync_dir import sync_skills_from_dir
+from .skill_sync_zip import sync_skills
+from .source_resolver import detect_claude_source, find_latest_archive, validate_source
 from .sync_registry import load_registry, save_registry
 from .utils import SyncError, eprint
 
 
-def parse_args() -> argparse.Namespace:
-    p = argparse.ArgumentParser(
-        prog="ckc-sync",
-        description="Sync ClaudeKit skills, agents, and config to Codex CLI.",
-    )
-    p.add_argument(
-        "-g",
-        "--global",
-        dest="global_scope",
-        action="store_true",
-        help="Sync to ~/.codex/ (default: ./.codex/)",
-    )
-    p.add_argument(
-        "-f",
-        "--fresh",
-        action="store_true",
-        help="Clean target dirs before sync",
-    )
-    p.add_argument(
-        "--force",
-        action="store_true",
-        help="Overwrite user-edited files without backup (required for zip write mode)",
-    )
-    p.add_argument(
-        "--zip",
-        dest="zip_path",
-        type=Path,
-        help="Sync from zip instead of live ~/.claude/",
-    )
-    p.add_argument(
-        "--source",
-        type=Path,
-        default=None,
-        help="Custom source dir (default: ~/.claude/)",
-    )
-    p.add_argument(
-        "--mcp",
-        action="store_true",
-        help="Include MCP skills",
-    )
-    p.add_argument(
-        "--no-deps",
-        action="store_true",
-        help="Skip dependency bootstrap (venv)",
-    )
-    p.add_argument(
-        "-n",
-        "--dry-run",
-        action="store_true",
-        help="Preview only",
-    )
-    return p.parse_args()
-
-
 def main() -> int:
     args = parse_args()
+    set_copy_backend(args.copy_backend)
+    reset_hash_cache()
 
     if args.global_scope:
         codex_home = Path(os.environ.get("CODEX_HOME", "~/.codex")).expanduser().resolve()
     else:
         codex_home = (Path.cwd() / ".codex").resolve()
 
+    if args.command == "registry":
+        return run_registry_command(args, codex_home)
+    if args.command == "backups":
+        return run_backups_command(args, codex_home)
+
     scope = "global" if args.global_scope else "project"
     workspace = Path.cwd().resolve()
     if not args.dry_run:
@@ -102,11 +65,12 @@ def main() -> int:
         log_section("Fresh")
         log_summary(removed=removed)
 
-    registry = load_registry(codex_home)
+    registry = load_registry(codex_home, args.registry_backend, dry_run=args.dry_run)
+    activate_index(codex_home)
 
     use_live = args.zip_path is None
     if not use_live and not args.force and not args.dry_run:
-        raise SyncError("zip sync requires --force for write mode")
+        raise SyncError("archive sync requires --force for write mode")
 
     if use_live:
         source = args.source or detect_claude_source()
@@ -118,7 +82,7 @@ def main() -> int:
             )
         registry["sourceDir"] = str(source)
     else:
-        zip_path = find_latest_zip(args.zip_path)
+        zip_path = find_latest_archive(args.zip_path)
         registry["sourceDir"] = None
 
     # --- Header ---
@@ -134,6 +98,8 @@ def main() -> int:
             dry_run=args.dry_run,
             registry=registry,
             force=args.force,
+            jobs=args.jobs,
+            paranoid=args.paranoid,
         )
         skills_stats = sync_skills_from_dir(
             source,
@@ -141,21 +107,29 @@ def main() -> int:
             include_mcp=args.mcp,
             include_conflicts=False,
             dry_run=args.dry_run,
+            jobs=args.jobs,
+            registry=registry,
+            paranoid=args.paranoid,
         )
     else:
-        with zipfile.ZipFile(zip_path) as zf:
+        skip = None if args.paranoid else unchanged_members(codex_home)
+        with open_archive(zip_path, skip=skip) as index:
             assets_stats = sync_assets(
-                zf,
+                index,
                 codex_home=codex_home,
                 include_hooks=True,
                 dry_run=args.dry_run,
+                paranoid=args.paranoid,
+                jobs=args.jobs,
             )
             skills_stats = sync_skills(
-                zf,
+                index,
                 codex_home=codex_home,
                 include_mcp=args.mcp,
                 include_conflicts=False,
                 dry_run=args.dry_run,
+                paranoid=args.paranoid,
+                jobs=args.jobs,
             )
 
     log_section("Assets")
@@ -172,26 +146,45 @@ def main() -> int:
         updated=skills_stats.get("updated", 0),
         skipped=skills_stats.get("skipped", 0),
     )
+    files_added = skills_stats.get("files_added", 0)
+    files_updated = skills_stats.get("files_updated", 0)
+    files_removed = skills_stats.get("files_removed", 0)
+    if files_added or files_updated or files_removed:
+        log_ok(f"files +{files_added} ↻{files_updated} -{files_removed}")
+
+    # --- Generated files ---
+    # Written before normalization so its scan records them on the first run.
+    rules_generated = generate_hook_rules(codex_home=codex_home, dry_run=args.dry_run)
+    bridge_changed = ensure_bridge_skill(codex_home=codex_home, dry_run=args.dry_run)
 
     # --- Normalize paths ---
-    changed = normalize_files(codex_home=codex_home, include_mcp=args.mcp, dry_run=args.dry_run)
+    normalize_stats = normalize_files(
+        codex_home=codex_home,
+        include_mcp=args.mcp,
+        dry_run=args.dry_run,
+        registry=registry,
+        jobs=args.jobs,
+    )
     log_section("Normalize")
-    log_summary(updated=changed)
-
-    # --- Hook rules ---
-    rules_generated = generate_hook_rules(codex_home=codex_home, dry_run=args.dry_run)
+    log_summary(updated=normalize_stats["updated"])
+    if normalize_stats["scanned"]:
+        log_ok(
+            f"scanned {normalize_stats['scanned']}  transformed {normalize_stats['transformed']}"
+        )
 
     # --- Config enforcement ---
+    # config.toml is parsed once here and written once after agent registration.
+    config_path = codex_home / "config.toml"
+    config = load_config(config_path)
     baseline_changed = 0
     if ensure_agents(workspace=workspace, dry_run=args.dry_run):
         baseline_changed += 1
-    if enforce_config(codex_home=codex_home, include_mcp=args.mcp, dry_run=args.dry_run):
+    if apply_config_defaults(config, codex_home=codex_home, include_mcp=args.mcp):
         baseline_changed += 1
-    if ensure_bridge_skill(codex_home=codex_home, dry_run=args.dry_run):
+    if bridge_changed:
         baseline_changed += 1
 
-    config_path = codex_home / "config.toml"
-    multi_agent_changed = enforce_multi_agent_flag(config_path, dry_run=args.dry_run)
+    multi_agent_changed = apply_multi_agent_flag(config)
 
     log_section("Config")
     parts = []
@@ -207,65 +200,43 @@ def main() -> int:
         log_ok("no changes")
 
     # --- Agent conversion ---
-    agent_toml_changed = normalize_agent_tomls(codex_home=codex_home, dry_run=args.dry_run)
-    agents_registered = register_agents(codex_home=codex_home, dry_run=args.dry_run)
+    agent_toml_changed = normalize_agent_tomls(
+        codex_home=codex_home, dry_run=args.dry_run, registry=registry
+    )
+    agents_registered = apply_agent_roles(config, codex_home=codex_home)
+    save_config(config, config_path, dry_run=args.dry_run)
 
     if agent_toml_changed or agents_registered:
         log_section("Agents")
         log_summary(updated=agent_toml_changed + agents_registered)
 
     # --- Bootstrap deps ---
-    bootstrap_stats = None
     if not args.no_deps:
         bootstrap_stats = bootstrap_deps(
             codex_home=codex_home,
             include_mcp=args.mcp,
             dry_run=args.dry_run,
+            deps_jobs=args.deps_jobs,
+            registry=registry,
+            refresh=args.deps_refresh,
+            installer=args.installer,
+            wheelhouse=args.wheelhouse.expanduser().resolve() if args.wheelhouse else None,
         )
-        log_section("Bootstrap")
-        py_ok = bootstrap_stats["python_ok"]
-        py_fail = bootstrap_stats["python_fail"]
-        node_ok = bootstrap_stats["node_ok"]
-        node_fail = bootstrap_stats["node_fail"]
-        if py_fail or node_fail:
-            log_error(f"py:{py_ok}ok/{py_fail}fail  node:{node_ok}ok/{node_fail}fail")
-            if not args.dry_run:
-                raise SyncError("Dependency bootstrap reported failures")
-        else:
-            venv_path = codex_home / "skills" / ".venv"
-            venv_status = "symlinked" if venv_path.is_symlink() else "created"
-            log_ok(f"venv {venv_status}")
-            if py_ok or node_ok:
-                log_ok(f"deps installed (py:{py_ok} node:{node_ok})")
-            else:
-                log_skip("deps shared")
+        failed = log_bootstrap(bootstrap_stats, codex_home=codex_home)
+        if failed and not args.dry_run:
+            raise SyncError("Dependency bootstrap reported failures")
 
     # --- Verify ---
     verify_stats = verify_runtime(codex_home=codex_home, dry_run=args.dry_run)
-    log_section("Verify")
-    if verify_stats.get("skipped"):
-        log_skip("dry-run")
-    else:
-        codex_st = verify_stats.get("codex", "unknown")
-        copy_st = verify_stats.get("copywriting", "unknown")
-        skills_n = verify_stats.get("skills", 0)
-        status_parts = []
-        if codex_st == "ok":
-            status_parts.append("codex")
-        if copy_st == "ok":
-            status_parts.append("copywriting")
-        if skills_n:
-            status_parts.append(f"{skills_n} skills")
-        if status_parts:
-            log_ok("  ".join(status_parts))
-        if codex_st not in ("ok", "not-found"):
-            log_error(f"codex: {codex_st}")
-        if copy_st not in ("ok", "not-found"):
-            log_error(f"copywriting: {copy_st}")
+    log_verify(verify_stats)
 
     if not args.dry_run:
         save_registry(codex_home, registry)
+        gc_backups(codex_home)
+
+    deactivate_index()
 
+    log_stats()
     log_done()
     return 0
 
@@ -0,0 +1,138 @@
+"""Command-line arguments for ckc-sync."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .backup_store import DEFAULT_KEEP, DEFAULT_MAX_AGE_DAYS
+from .copy_backend import COPY_BACKENDS
+from .installer_backend import INSTALLERS
+from .sync_registry import REGISTRY_BACKENDS
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {value}")
+    return n
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="ckc-sync",
+        description="Sync ClaudeKit skills, agents, and config to Codex CLI.",
+    )
+    p.add_argument(
+        "-g",
+        "--global",
+        dest="global_scope",
+        action="store_true",
+        help="Sync to ~/.codex/ (default: ./.codex/)",
+    )
+    p.add_argument(
+        "-f",
+        "--fresh",
+        action="store_true",
+        help="Clean target dirs before sync",
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite user-edited files without backup (required for zip write mode)",
+    )
+    p.add_argument(
+        "--zip",
+        "--archive",
+        dest="zip_path",
+        type=Path,
+        help="Sync from an export archive (.zip, .tar.gz, .tar.xz, .tar.zst) instead of live ~/.claude/",
+    )
+    p.add_argument(
+        "--source",
+        type=Path,
+        default=None,
+        help="Custom source dir (default: ~/.claude/)",
+    )
+    p.add_argument(
+        "--mcp",
+        action="store_true",
+        help="Include MCP skills",
+    )
+    p.add_argument(
+        "--no-deps",
+        action="store_true",
+        help="Skip dependency bootstrap (venv)",
+    )
+    p.add_argument(
+        "--deps-jobs",
+        type=_positive_int,
+        default=4,
+        metavar="N",
+        help="Concurrent npm installs during dependency bootstrap (default: 4)",
+    )
+    p.add_argument(
+        "--deps-refresh",
+        action="store_true",
+        help="Reinstall dependencies even when their fingerprints are unchanged",
+    )
+    p.add_argument(
+        "--installer",
+        choices=INSTALLERS,
+        default="auto",
+        help="Python installer backend (default: auto = uv if on PATH, else pip)",
+    )
+    p.add_argument(
+        "--wheelhouse",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Wheel dir: filled after pip/uv installs, installed from offline with --installer wheelhouse",
+    )
+    p.add_argument(
+        "--paranoid",
+        action="store_true",
+        help="Ignore the registry stat fast path and re-hash every file",
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        help="Parallel workers for file sync, zip extraction and normalization (default: 1)",
+    )
+    p.add_argument(
+        "--copy-backend",
+        choices=COPY_BACKENDS,
+        default="auto",
+        help="File copy backend (default: auto-probe reflink > copy_file_range > sendfile > hardlink > copy; "
+        "hardlink only for read-only skill files)",
+    )
+    p.add_argument(
+        "--registry",
+        dest="registry_backend",
+        choices=REGISTRY_BACKENDS,
+        default=None,
+        help="Registry storage (default: keep existing; json if none). Converts the other format",
+    )
+    p.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="Preview only",
+    )
+    sub = p.add_subparsers(dest="command", metavar="COMMAND")
+    reg = sub.add_parser("registry", help="Maintain the sync registry")
+    reg.add_argument("action", choices=["compact"], help="compact: drop entries for missing files")
+    bak = sub.add_parser("backups", help="Inspect, restore and prune backups of user-edited files")
+    bak_sub = bak.add_subparsers(dest="action", metavar="ACTION", required=True)
+    bak_sub.add_parser("list", help="List backups")
+    restore = bak_sub.add_parser("restore", help="Restore the newest backup of a file")
+    restore.add_argument("path", help="Path relative to codex home, e.g. rules/foo.md")
+    restore.add_argument("--at", default=None, help="Restore the backup whose timestamp starts with this")
+    gc = bak_sub.add_parser("gc", help="Apply retention and drop unreferenced objects")
+    gc.add_argument("--keep", type=_positive_int, default=DEFAULT_KEEP, help="Backups kept per file")
+    gc.add_argument(
+        "--max-age-days", type=_positive_int, default=DEFAULT_MAX_AGE_DAYS, help="Drop older backups"
+    )
+    return p.parse_args()
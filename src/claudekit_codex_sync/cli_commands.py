@@ -0,0 +1,47 @@
+"""Maintenance subcommands: `registry` and `backups`."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .backup_store import gc_backups, list_backups, restore_backup
+from .log_formatter import log_backup, log_done, log_ok, log_section, log_skip, log_summary
+from .registry_compact import compact_registry, orphan_keys
+from .sync_registry import load_registry
+from .utils import SyncError
+
+
+def run_backups_command(args: argparse.Namespace, codex_home: Path) -> int:
+    """`backups list|restore|gc`."""
+    log_section("Backups")
+    if args.action == "list":
+        records = list_backups(codex_home)
+        for record in records:
+            log_backup(record["ts"], record["hash"], record["path"])
+        if not records:
+            log_skip("no backups")
+    elif args.dry_run:
+        log_skip("dry-run")
+    elif args.action == "restore":
+        ts = restore_backup(codex_home, args.path, ts=args.at)
+        if ts is None:
+            raise SyncError(f"No backup found for {args.path}")
+        log_ok(f"restored {args.path} from {ts}")
+    else:
+        records, objects = gc_backups(codex_home, keep=args.keep, max_age_days=args.max_age_days)
+        log_summary(removed=records + objects)
+    log_done()
+    return 0
+
+
+def run_registry_command(args: argparse.Namespace, codex_home: Path) -> int:
+    """`registry compact`; a dry run only counts the orphaned entries."""
+    registry = load_registry(codex_home, args.registry_backend, dry_run=args.dry_run)
+    log_section("Registry")
+    if args.dry_run:
+        log_summary(removed=len(orphan_keys(codex_home, registry["entries"])))
+    else:
+        log_summary(removed=compact_registry(codex_home, registry))
+    log_done()
+    return 0
@@ -0,0 +1,103 @@
+"""Report sections printed at the end of a sync: Bootstrap, Verify and Stats."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+from .copy_backend import copy_stats
+from .hash_cache import hash_cache_stats
+from .log_formatter import log_detail, log_error, log_ok, log_section, log_skip
+from .node_deps import NodeReport
+from .stream_io import peak_rss_bytes
+
+# Lines of a failed install's captured output echoed to stderr.
+NPM_ERROR_TAIL = 20
+
+
+def _log_npm(report: NodeReport) -> None:
+    for result in report.installs:
+        if result.returncode == 0:
+            log_ok(f"npm: {result.package} ({result.seconds:.1f}s)")
+            continue
+        log_error(f"npm: {result.package} exit {result.returncode} ({result.seconds:.1f}s)")
+        for line in result.output.strip().splitlines()[-NPM_ERROR_TAIL:]:
+            log_detail(line)
+    if report.installs:
+        total = sum(r.seconds for r in report.installs)
+        log_ok(
+            f"npm: {report.ok} ok, {report.failed} failed, {report.skipped} skipped"
+            f" in {report.seconds:.1f}s ({total:.1f}s of installs, jobs={report.jobs})"
+        )
+
+
+def log_bootstrap(stats: Dict[str, Any], *, codex_home: Path) -> bool:
+    """Print the Bootstrap section. Returns True if any install failed."""
+    log_section("Bootstrap")
+    if stats["python_ok"]:
+        log_ok(
+            f"{stats['python_installer']}: {stats['python_ok']} requirements files"
+            f" in one pass ({stats['python_seconds']:.1f}s)"
+        )
+    _log_npm(stats["node"])
+    py_ok = stats["python_ok"]
+    py_fail = stats["python_fail"]
+    node_ok = stats["node_ok"]
+    node_fail = stats["node_fail"]
+    if py_fail or node_fail:
+        log_error(f"py:{py_ok}ok/{py_fail}fail  node:{node_ok}ok/{node_fail}fail")
+        return True
+    venv_path = codex_home / "skills" / ".venv"
+    venv_status = "symlinked" if venv_path.is_symlink() else "created"
+    log_ok(f"venv {venv_status}")
+    py_skipped = stats["python_skipped"]
+    node_skipped = stats["node_skipped"]
+    if py_ok or node_ok:
+        log_ok(f"deps installed (py:{py_ok} node:{node_ok})")
+    if py_skipped or node_skipped:
+        log_skip(f"deps unchanged (py:{py_skipped} node:{node_skipped})")
+    elif not (py_ok or node_ok):
+        log_skip("deps shared")
+    return False
+
+
+def log_verify(stats: Dict[str, Any]) -> None:
+    """Print the Verify section from verify_runtime() output."""
+    log_section("Verify")
+    if stats.get("skipped"):
+        log_skip("dry-run")
+        return
+    codex_st = stats.get("codex", "unknown")
+    copy_st = stats.get("copywriting", "unknown")
+    skills_n = stats.get("skills", 0)
+    status_parts = []
+    if codex_st == "ok":
+        status_parts.append("codex")
+    if copy_st == "ok":
+        status_parts.append("copywriting")
+    if skills_n:
+        status_parts.append(f"{skills_n} skills")
+    if status_parts:
+        log_ok("  ".join(status_parts))
+    if codex_st not in ("ok", "not-found"):
+        log_error(f"codex: {codex_st}")
+    if copy_st not in ("ok", "not-found"):
+        log_error(f"copywriting: {copy_st}")
+
+
+def log_stats() -> None:
+    """Print the Stats section: hash cache, copy backends and peak RSS."""
+    log_section("Stats")
+    cache = hash_cache_stats()
+    lookups = cache["hits"] + cache["misses"]
+    if lookups:
+        rate = 100 * cache["hits"] // lookups
+        log_ok(f"hash cache {cache['hits']}/{lookups} hits ({rate}%)")
+    else:
+        log_skip("hash cache unused")
+    copies = copy_stats()
+    if copies:
+        log_ok("copies " + ", ".join(f"{name} {n}" for name, n in sorted(copies.items())))
+    peak = peak_rss_bytes()
+    if peak is not None:
+        log_ok(f"peak RSS {peak / (1 << 20):.1f} MiB")
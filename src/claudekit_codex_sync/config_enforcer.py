@@ -4,7 +4,11 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import List
+
+from .toml_document import TomlDocument, toml_string
+from .utils import atomic_write_bytes
+
+FALLBACK_FILENAMES = '["AGENTS.md", "CLAUDE.md", "AGENTS.override.md"]'
 
 
 def ensure_agents(*, workspace: Path, dry_run: bool) -> bool:
@@ -15,72 +19,67 @@ def ensure_agents(*, workspace: Path, dry_run: bool) -> bool:
     return write_text_if_changed(target, template, dry_run=dry_run)
 
 
-def enforce_config(*, codex_home: Path, include_mcp: bool, dry_run: bool) -> bool:
-    """Enforce Codex config defaults."""
-    config = codex_home / "config.toml"
-    if config.exists():
-        text = config.read_text(encoding="utf-8")
-    else:
-        text = ""
-    orig = text
-
-    if re.search(r"^project_doc_max_bytes\s*=", text, flags=re.M):
-        text = re.sub(r"^project_doc_max_bytes\s*=.*$", "project_doc_max_bytes = 65536", text, flags=re.M)
-    else:
-        text = (text.rstrip("\n") + "\nproject_doc_max_bytes = 65536\n").lstrip("\n")
-
-    fallback_line = 'project_doc_fallback_filenames = ["AGENTS.md", "CLAUDE.md", "AGENTS.override.md"]'
-    if re.search(r"^project_doc_fallback_filenames\s*=", text, flags=re.M):
-        text = re.sub(r"^project_doc_fallback_filenames\s*=.*$", fallback_line, text, flags=re.M)
-    else:
-        text = text.rstrip("\n") + "\n" + fallback_line + "\n"
-
-    mcp_management_path = str((codex_home / "skills" / "mcp-management").resolve())
-    mcp_builder_path = str((codex_home / "skills" / "mcp-builder").resolve())
-    mcp_enabled = "true" if include_mcp else "false"
-
-    pattern = re.compile(r"\n\[\[skills\.config\]\]\n(?:[^\n]*\n)*?(?=\n\[\[skills\.config\]\]|\Z)", re.M)
-    blocks = pattern.findall("\n" + text)
-    kept: List[str] = []
-    for block in blocks:
-        if f'path = "{mcp_management_path}"' in block:
-            continue
-        if f'path = "{mcp_builder_path}"' in block:
-            continue
-        kept.append(block.rstrip("\n"))
-
-    base = pattern.sub("", "\n" + text).lstrip("\n").rstrip("\n")
-    for block in kept:
-        if block:
-            base += "\n\n" + block
+def load_config(config_path: Path) -> TomlDocument:
+    """Parse config.toml once; enforcement steps edit the returned document."""
+    text = config_path.read_text(encoding="utf-8") if config_path.exists() else ""
+    return TomlDocument.parse(text)
 
-    base += f'\n\n[[skills.config]]\npath = "{mcp_management_path}"\nenabled = {mcp_enabled}\n'
-    base += f'\n[[skills.config]]\npath = "{mcp_builder_path}"\nenabled = {mcp_enabled}\n'
 
-    if base == orig:
+def save_config(doc: TomlDocument, config_path: Path, *, dry_run: bool) -> bool:
+    """Write the document back if any step edited it. Returns True if changed."""
+    if not doc.revision:
         return False
     if not dry_run:
-        config.parent.mkdir(parents=True, exist_ok=True)
-        config.write_text(base, encoding="utf-8")
+        atomic_write_bytes(config_path, doc.render().encode("utf-8"))
     return True
 
 
-def enforce_multi_agent_flag(config_path: Path, dry_run: bool) -> bool:
-    """Ensure multi_agent and child_agents_md flags are set in config."""
-    text = config_path.read_text() if config_path.exists() else ""
-    orig = text
+def apply_config_defaults(doc: TomlDocument, *, codex_home: Path, include_mcp: bool) -> bool:
+    """Enforce project_doc defaults and MCP skill entries. Returns True if edited."""
+    start = doc.revision
+    doc.root.set("project_doc_max_bytes", "65536")
+    doc.root.set("project_doc_fallback_filenames", FALLBACK_FILENAMES)
+
+    enabled = "true" if include_mcp else "false"
+    for skill in ("mcp-management", "mcp-builder"):
+        path = str((codex_home / "skills" / skill).resolve())
+        entries = [t for t in doc.array("skills.config") if t.get("path") == path]
+        for duplicate in entries[1:]:
+            doc.remove_table(duplicate)
+        if entries:
+            entries[0].set("enabled", enabled)
+        else:
+            entry = doc.add_table("skills.config", array=True)
+            entry.set("path", toml_string(path))
+            entry.set("enabled", enabled)
+    return doc.revision != start
+
+
+def apply_multi_agent_flag(doc: TomlDocument) -> bool:
+    """Ensure [features] has multi_agent and child_agents_md. Returns True if edited."""
+    features = doc.table("features") or doc.add_table("features")
+    added = features.setdefault("multi_agent", "true")
+    added |= features.setdefault("child_agents_md", "true")
+    return added
 
-    if "[features]" in text:
-        if "multi_agent" not in text:
-            text = text.replace("[features]", "[features]\nmulti_agent = true")
-        if "child_agents_md" not in text:
-            text = text.replace("[features]", "[features]\nchild_agents_md = true")
-    else:
-        text += "\n[features]\nmulti_agent = true\nchild_agents_md = true\n"
 
-    if text != orig and not dry_run:
-        config_path.write_text(text)
-    return text != orig
+def apply_agent_roles(doc: TomlDocument, *, codex_home: Path) -> int:
+    """Add an [agents.<slug>] role for each agent TOML not yet registered."""
+    agents_dir = codex_home / "agents"
+    if not agents_dir.exists():
+        return 0
+    added = 0
+    for toml_file in sorted(agents_dir.glob("*.toml")):
+        slug = toml_file.stem
+        if doc.table(f"agents.{slug}") is not None:
+            continue
+        content = toml_file.read_text(encoding="utf-8")
+        desc = _extract_description(content) or f"{slug.replace('_', ' ').title()} agent"
+        role = doc.add_table(f"agents.{slug}")
+        role.set("description", toml_string(desc))
+        role.set("config_file", toml_string(f"agents/{toml_file.name}"))
+        added += 1
+    return added
 
 
 def _extract_description(toml_text: str) -> str:
@@ -105,36 +104,3 @@ def _extract_description(toml_text: str) -> str:
             return line[: dot + 1]
         return line[:120]
     return ""
-
-
-def register_agents(*, codex_home: Path, dry_run: bool) -> int:
-    """Register agent TOMLs as [agents.*] roles in config.toml."""
-    agents_dir = codex_home / "agents"
-    config_path = codex_home / "config.toml"
-    if not agents_dir.exists():
-        return 0
-
-    text = config_path.read_text(encoding="utf-8") if config_path.exists() else ""
-    added = 0
-
-    for toml_file in sorted(agents_dir.glob("*.toml")):
-        slug = toml_file.stem
-        section_header = f"[agents.{slug}]"
-        if section_header in text:
-            continue
-
-        content = toml_file.read_text(encoding="utf-8")
-        desc = _extract_description(content) or f"{slug.replace('_', ' ').title()} agent"
-        # Escape quotes in description
-        desc = desc.replace('"', '\\"')
-
-        text += (
-            f"\n{section_header}\n"
-            f'description = "{desc}"\n'
-            f'config_file = "agents/{toml_file.name}"\n'
-        )
-        added += 1
-
-    if added > 0 and not dry_run:
-        config_path.write_text(text, encoding="utf-8")
-    return added
@@ -5,6 +5,9 @@ from typing import List, Set, Tuple
 ASSET_DIRS = {"output-styles", "rules", "scripts"}
 ASSET_FILES = {".env.example", ".ck.json"}
 ASSET_MANIFEST = ".sync-manifest-assets.txt"
+SKILLS_MANIFEST = ".sync-manifest-skills.txt"
+TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.xz", ".txz", ".tar.zst", ".tzst", ".tar")
+ARCHIVE_SUFFIXES = (".zip",) + TAR_SUFFIXES
 REGISTRY_FILE = ".claudekit-sync-registry.json"
 
 
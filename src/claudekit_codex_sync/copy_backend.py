@@ -0,0 +1,176 @@
+"""Pluggable file copy backends (reflink, kernel copy, hardlink, plain copy)."""
+
+from __future__ import annotations
+
+import errno
+import os
+import secrets
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from .fs_index import note_added
+from .hash_cache import cached_hash, peek_hash, remember_hash
+from .utils import SyncError
+
+COPY_BACKENDS = ("auto", "reflink", "copy_file_range", "sendfile", "hardlink", "copy")
+_AUTO_CHAIN = ("reflink", "copy_file_range", "sendfile", "hardlink", "copy")
+_FICLONE = 0x40049409
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EBADF,
+}
+
+_selected = "auto"
+# (src device, dst device) -> backends that failed with "not supported" there
+_unsupported: Dict[Tuple[int, int], Set[str]] = {}
+_used: Dict[str, int] = {}
+# Guards _unsupported and _used; copy_file runs on -j worker threads.
+_used_lock = threading.Lock()
+
+
+def set_copy_backend(name: str) -> None:
+    """Select the copy backend used for the rest of the run."""
+    global _selected
+    if name not in COPY_BACKENDS:
+        raise SyncError(f"Unknown copy backend: {name}")
+    _selected = name
+    with _used_lock:
+        _unsupported.clear()
+        _used.clear()
+
+
+def copy_stats() -> Dict[str, int]:
+    """Return how many files each backend materialized this run."""
+    with _used_lock:
+        return dict(_used)
+
+
+def _short_copy(name: str, copied: int, size: int) -> OSError:
+    # Some filesystems (procfs, FUSE, older cross-fs kernels) report 0 bytes
+    # early; EINVAL marks the backend unsupported so the chain falls back.
+    return OSError(errno.EINVAL, f"{name} copied {copied} of {size} bytes")
+
+
+def _tmp_path(dst: Path) -> Path:
+    return dst.with_name(f".{dst.name}.ck-{secrets.token_hex(4)}")
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int) -> None:
+    import fcntl
+
+    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range unavailable")
+    remaining = size
+    while remaining > 0:
+        n = os.copy_file_range(src_fd, dst_fd, remaining)
+        if n == 0:
+            raise _short_copy("copy_file_range", size - remaining, size)
+        remaining -= n
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> None:
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile unavailable")
+    offset = 0
+    while offset < size:
+        n = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if n == 0:
+            raise _short_copy("sendfile", offset, size)
+        offset += n
+
+
+_FD_BACKENDS = {
+    "reflink": _reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _sendfile,
+}
+
+
+def _try_backend(name: str, src: Path, tmp: Path, size: int) -> None:
+    """Materialize src at tmp with one backend; raises OSError on failure."""
+    if name == "hardlink":
+        os.link(src, tmp)
+        return
+    if name == "copy":
+        shutil.copyfile(src, tmp)
+        return
+    with open(src, "rb") as fsrc:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            _FD_BACKENDS[name](fsrc.fileno(), fd, size)
+        finally:
+            os.close(fd)
+
+
+def copy_file(src: Path, dst: Path, *, mode: Optional[int] = None, link_ok: bool = False) -> str:
+    """Copy src over dst atomically with the best backend available. Returns backend name."""
+    st = src.stat()
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    key = (st.st_dev, dst.parent.stat().st_dev)
+    with _used_lock:
+        failed = set(_unsupported.get(key, ()))
+
+    if _selected == "auto":
+        chain = [b for b in _AUTO_CHAIN if b not in failed]
+    else:
+        chain = [_selected, "copy"] if _selected != "copy" else ["copy"]
+    if not link_ok:
+        chain = [b for b in chain if b != "hardlink"]
+
+    tmp = _tmp_path(dst)
+    for name in chain:
+        try:
+            _try_backend(name, src, tmp, st.st_size)
+        except OSError as exc:
+            tmp.unlink(missing_ok=True)
+            if name == "copy" or exc.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            with _used_lock:
+                _unsupported.setdefault(key, set()).add(name)
+            continue
+        if name != "hardlink":
+            os.chmod(tmp, mode if mode is not None else st.st_mode & 0o777)
+        os.replace(tmp, dst)
+        note_added(dst)
+        digest = peek_hash(src)
+        if digest is not None:
+            remember_hash(dst, digest)
+        with _used_lock:
+            _used[name] = _used.get(name, 0) + 1
+        return name
+    raise SyncError(f"No copy backend could copy {src}")
+
+
+def copy_file_if_changed(
+    src: Path, dst: Path, *, mode: Optional[int], dry_run: bool, link_ok: bool = False
+) -> Tuple[bool, bool]:
+    """Copy src to dst if content differs. Returns (changed, is_new)."""
+    exists = dst.exists()
+    if exists and files_equal(src, dst):
+        if mode is not None and not dry_run:
+            os.chmod(dst, mode)
+        return False, False
+    if not dry_run:
+        copy_file(src, dst, mode=mode, link_ok=link_ok)
+    return True, not exists
+
+
+def files_equal(a: Path, b: Path) -> bool:
+    """Compare two files by size, inode, then memoized content hash."""
+    sa, sb = a.stat(), b.stat()
+    if sa.st_size != sb.st_size:
+        return False
+    if (sa.st_dev, sa.st_ino) == (sb.st_dev, sb.st_ino):
+        return True
+    return cached_hash(a) == cached_hash(b)
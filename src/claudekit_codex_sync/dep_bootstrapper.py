@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-import shutil
-import subprocess
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional
 
-from .utils import eprint, is_excluded_path, run_cmd
+from .deps_fingerprint import DepsFingerprints, python_fingerprint, venv_matches_lock
+from .fs_index import get_index
+from .installer_backend import DEPS_DIR, PIP_LOCK, install_merged, select_installer
+from .node_deps import install_node_deps
+from .requirements_merge import merge_requirements
+from .utils import is_excluded_path
 
 
 def _try_symlink_venv(codex_home: Path, *, dry_run: bool) -> bool:
@@ -35,36 +38,33 @@ def _try_symlink_venv(codex_home: Path, *, dry_run: bool) -> bool:
     return False
 
 
-def _install_node_deps(*, skills_dir: Path, include_mcp: bool, dry_run: bool) -> tuple[int, int]:
-    """Install Node dependencies for skills."""
-    node_ok = node_fail = 0
-    npm = shutil.which("npm")
-    if not npm:
-        return 0, 0
-
-    pkg_files = sorted(skills_dir.rglob("package.json"))
-    for pkg in pkg_files:
-        if is_excluded_path(pkg.parts):
-            continue
-        if not include_mcp and ("mcp-builder" in pkg.parts or "mcp-management" in pkg.parts):
-            continue
-        try:
-            run_cmd([npm, "install", "--prefix", str(pkg.parent)], dry_run=dry_run)
-            node_ok += 1
-        except subprocess.CalledProcessError:
-            node_fail += 1
-    return node_ok, node_fail
-
-
 def bootstrap_deps(
     *,
     codex_home: Path,
     include_mcp: bool,
     dry_run: bool,
-) -> Dict[str, int]:
-    """Bootstrap Python and Node dependencies for skills."""
+    deps_jobs: int = 1,
+    registry: Optional[dict] = None,
+    refresh: bool = False,
+    installer: str = "auto",
+    wheelhouse: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Bootstrap Python and Node dependencies for skills.
+
+    Python requirements are resolved together in a single run of the
+    selected installer backend (see installer_backend.select_installer);
+    deps_jobs bounds how many npm installs run at once. With a registry,
+    installs whose inputs, interpreter and platform match the last
+    successful run are skipped while their environment still holds what
+    was installed (the pip-lock.txt freeze, or every package.json
+    dependency); refresh forces them all. Counts are returned with the
+    installer's name and timing and the npm NodeReport under "node" for
+    the CLI to print.
+    """
     skills_dir = codex_home / "skills"
-    py_ok = py_fail = node_ok = node_fail = 0
+    py_ok = py_fail = py_skipped = 0
+    py_installer, py_seconds = "", 0.0
+    fingerprints = DepsFingerprints(registry, refresh=refresh)
 
     symlinked = _try_symlink_venv(codex_home, dry_run=dry_run)
     venv_dir = skills_dir / ".venv"
@@ -74,40 +74,49 @@ def bootstrap_deps(
             venv_dir.unlink()
         symlinked = False
 
-    if not symlinked:
-        if not shutil.which("python3"):
-            from .utils import SyncError
-
-            raise SyncError("python3 not found")
-        run_cmd(["python3", "-m", "venv", str(venv_dir)], dry_run=dry_run)
-        run_cmd([str(py_bin), "-m", "pip", "install", "--upgrade", "pip"], dry_run=dry_run)
-
     # Skip Python pip install when venv is symlinked — packages already in source
     if not symlinked:
-        req_files = sorted(skills_dir.rglob("requirements*.txt"))
-        for req in req_files:
-            if is_excluded_path(req.parts):
+        req_files = []
+        for req in sorted(get_index(codex_home).files("skills/", "requirements*.txt")):
+            if is_excluded_path(req.relative_to(codex_home).parts):
                 continue
             if not include_mcp and ("mcp-builder" in req.parts or "mcp-management" in req.parts):
                 continue
-            try:
-                run_cmd([str(py_bin), "-m", "pip", "install", "-r", str(req)], dry_run=dry_run)
-                py_ok += 1
-            except subprocess.CalledProcessError:
-                py_fail += 1
-    else:
-        pass  # venv symlinked, pip install skipped
+            req_files.append(req)
+        merged = merge_requirements(req_files, root=codex_home)
+        lock = skills_dir / DEPS_DIR / PIP_LOCK
+        installed = py_bin.exists() and (not req_files or venv_matches_lock(venv_dir, lock))
+        if installed and fingerprints.matches("python", python_fingerprint(venv_dir, merged.text)):
+            py_skipped = len(req_files)
+        else:
+            backend = select_installer(installer, venv_dir, wheelhouse=wheelhouse)
+            backend.create_venv(dry_run=dry_run)
+            if req_files:
+                py_ok, py_fail, py_seconds = install_merged(
+                    backend, merged, codex_home=codex_home, dry_run=dry_run, wheelhouse=wheelhouse
+                )
+                py_installer = backend.name
+            if not py_fail:
+                fingerprints.record("python", python_fingerprint(venv_dir, merged.text))
 
     # Node deps always run — independent of Python venv state
-    node_ok, node_fail = _install_node_deps(
-        skills_dir=skills_dir,
+    node = install_node_deps(
+        codex_home=codex_home,
         include_mcp=include_mcp,
         dry_run=dry_run,
+        jobs=deps_jobs,
+        fingerprints=fingerprints,
     )
+    fingerprints.save(dry_run=dry_run)
 
     return {
         "python_ok": py_ok,
         "python_fail": py_fail,
-        "node_ok": node_ok,
-        "node_fail": node_fail,
+        "node_ok": node.ok,
+        "node_fail": node.failed,
+        "python_skipped": py_skipped,
+        "python_installer": py_installer,
+        "python_seconds": py_seconds,
+        "node_skipped": node.skipped,
+        "node": node,
     }
@@ -0,0 +1,139 @@
+"""Fingerprints of the last successful dependency installs, kept in the registry."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .requirements_merge import canonical_name
+
+NODE_LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml")
+
+
+def platform_tag() -> str:
+    return f"{sys.platform}-{platform.machine()}"
+
+
+def venv_version(venv_dir: Path) -> str:
+    """Interpreter version recorded in venv_dir/pyvenv.cfg ("" if absent)."""
+    try:
+        text = (venv_dir / "pyvenv.cfg").read_text(encoding="utf-8")
+    except OSError:
+        return ""
+    for line in text.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip() in ("version", "version_info"):
+            return value.strip()
+    return ""
+
+
+def fingerprint(parts: Iterable[str], files: Iterable[Path] = ()) -> str:
+    """Digest of string parts plus the names and contents of files (missing ones skipped)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") + b"\0")
+    for path in files:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        digest.update(path.name.encode("utf-8") + b"\0" + hashlib.sha256(data).digest())
+    return digest.hexdigest()
+
+
+def node_fingerprint(pkg_dir: Path, node_version: str) -> str:
+    """package.json plus any lockfile, node version and platform."""
+    files = [pkg_dir / "package.json"] + [pkg_dir / name for name in NODE_LOCKFILES]
+    return fingerprint([node_version, platform_tag()], files)
+
+
+def python_fingerprint(venv_dir: Path, merged_text: str) -> str:
+    """Merged requirements plus the venv interpreter and platform."""
+    # The merged text is the parsed form of every file (and its -r includes),
+    # so comment-only edits do not force a reinstall.
+    return fingerprint([merged_text, venv_version(venv_dir), platform_tag()])
+
+
+def _installed_distributions(venv_dir: Path) -> Dict[str, str]:
+    """Canonical name -> version of every distribution installed in venv_dir."""
+    found: Dict[str, str] = {}
+    for site in [*venv_dir.glob("lib/python*/site-packages"), venv_dir / "Lib" / "site-packages"]:
+        if not site.is_dir():
+            continue
+        for meta in site.iterdir():
+            if meta.suffix in (".dist-info", ".egg-info"):
+                name, _, version = meta.stem.partition("-")
+                found[canonical_name(name)] = version.split("-")[0]
+    return found
+
+
+def venv_matches_lock(venv_dir: Path, lock: Path) -> bool:
+    """True if every distribution in lock (a `pip freeze`) is still installed in venv_dir.
+
+    Only directory listings are read, so this is much cheaper than running pip.
+    """
+    try:
+        lines = lock.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return False
+    installed = _installed_distributions(venv_dir)
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        name, pinned, version = line.partition("==")
+        name = canonical_name((name if pinned else line.partition(" @ ")[0]).strip())
+        if name not in installed or (pinned and installed[name] != version.strip()):
+            return False
+    return True
+
+
+def node_modules_complete(pkg_dir: Path) -> bool:
+    """True if node_modules holds every dependency package.json declares."""
+    modules = pkg_dir / "node_modules"
+    if not modules.is_dir():
+        return False
+    try:
+        manifest = json.loads((pkg_dir / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    for field in ("dependencies", "devDependencies"):
+        deps = manifest.get(field) if isinstance(manifest, dict) else None
+        for name in deps if isinstance(deps, dict) else ():
+            if not (modules / name / "package.json").is_file():
+                return False
+    return True
+
+
+class DepsFingerprints:
+    """Install fingerprints kept in registry["deps"], keyed by unit.
+
+    A unit ("python", or "node:<package dir>") whose fingerprint matches
+    the last successful install is skipped. With refresh, stored
+    fingerprints are ignored but this run's are still recorded.
+    """
+
+    def __init__(self, registry: Optional[Dict[str, Any]], *, refresh: bool = False) -> None:
+        self._registry = registry
+        self._previous: Dict[str, str] = {} if refresh else dict((registry or {}).get("deps") or {})
+        self._current: Dict[str, str] = {}
+
+    def matches(self, unit: str, value: str) -> bool:
+        """True (and the fingerprint is kept) if unit was installed with value."""
+        if self._previous.get(unit) == value:
+            self._current[unit] = value
+            return True
+        return False
+
+    def record(self, unit: str, value: str) -> None:
+        self._current[unit] = value
+
+    def save(self, *, dry_run: bool) -> None:
+        """Store this run's fingerprints, dropping units no longer present."""
+        if dry_run or self._registry is None:
+            return
+        self._registry["deps"] = dict(sorted(self._current.items()))
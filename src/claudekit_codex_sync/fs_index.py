@@ -0,0 +1,111 @@
+"""Single pruned file index of codex_home shared by all pipeline stages."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Runtime and backup trees that no stage ever needs to look inside.
+PRUNED_DIRS = {"node_modules", ".venv", "__pycache__", ".pytest_cache", ".git", ".ck-backups"}
+
+
+class FsIndex:
+    """Set of files under root (relative posix paths), grouped by file name."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._by_name: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, root: Path) -> "FsIndex":
+        """Walk root once with os.scandir, pruning PRUNED_DIRS while walking."""
+        index = cls(root)
+        if not root.is_dir():
+            return index
+        stack = [(str(root), "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                rel = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in PRUNED_DIRS:
+                        stack.append((entry.path, rel + "/"))
+                elif not entry.is_dir():
+                    index._by_name.setdefault(entry.name, set()).add(rel)
+        return index
+
+    def _rel(self, path: Path) -> Optional[str]:
+        try:
+            rel = path.relative_to(self.root)
+        except ValueError:
+            return None
+        if any(p in PRUNED_DIRS for p in rel.parts[:-1]):
+            return None
+        return rel.as_posix()
+
+    def add(self, path: Path) -> None:
+        """Record a file a writer just created."""
+        rel = self._rel(path)
+        if rel is not None:
+            with self._lock:
+                self._by_name.setdefault(path.name, set()).add(rel)
+
+    def discard(self, path: Path) -> None:
+        """Forget a file a writer just removed."""
+        rel = self._rel(path)
+        if rel is not None:
+            with self._lock:
+                self._by_name.get(path.name, set()).discard(rel)
+
+    def files(self, prefix: str = "", pattern: str = "*") -> List[Path]:
+        """Sorted files under prefix (e.g. "skills/") whose name matches pattern."""
+        with self._lock:
+            if any(ch in pattern for ch in "*?["):
+                names = [n for n in self._by_name if fnmatch.fnmatchcase(n, pattern)]
+            else:
+                names = [pattern] if pattern in self._by_name else []
+            rels = [r for n in names for r in self._by_name[n] if r.startswith(prefix)]
+        return [self.root / r for r in sorted(rels)]
+
+
+_active: Optional[FsIndex] = None
+
+
+def activate_index(root: Path) -> FsIndex:
+    """Build the run's index of root and make writers keep it current."""
+    global _active
+    _active = FsIndex.build(root)
+    return _active
+
+
+def deactivate_index() -> None:
+    """Stop tracking writes (end of run)."""
+    global _active
+    _active = None
+
+
+def get_index(root: Path) -> FsIndex:
+    """Return the active index for root, or build a one-off index."""
+    if _active is not None and _active.root == root:
+        return _active
+    return FsIndex.build(root)
+
+
+def note_added(path: Path) -> None:
+    """Tell the active index (if any) that path was written."""
+    if _active is not None:
+        _active.add(path)
+
+
+def note_removed(path: Path) -> None:
+    """Tell the active index (if any) that path was removed."""
+    if _active is not None:
+        _active.discard(path)
@@ -0,0 +1,69 @@
+"""Run-scoped SHA-256 cache keyed by file identity."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+_CHUNK = 1 << 20
+
+_lock = threading.Lock()
+# (st_dev, st_ino, st_size, st_mtime_ns) -> hex digest
+_digests: Dict[Tuple[int, int, int, int], str] = {}
+_counts = {"hits": 0, "misses": 0}
+
+
+def _key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def reset_hash_cache() -> None:
+    """Forget all digests and counters (start of a run)."""
+    with _lock:
+        _digests.clear()
+        _counts["hits"] = _counts["misses"] = 0
+
+
+def hash_cache_stats() -> Dict[str, int]:
+    """Return {"hits", "misses"} for this run."""
+    with _lock:
+        return dict(_counts)
+
+
+def cached_hash(path: Path) -> str:
+    """Return SHA-256 of path, reading the file at most once per identity."""
+    key = _key(path.stat())
+    with _lock:
+        digest = _digests.get(key)
+        if digest is not None:
+            _counts["hits"] += 1
+            return digest
+        _counts["misses"] += 1
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _lock:
+        _digests[key] = digest
+    return digest
+
+
+def peek_hash(path: Path) -> Optional[str]:
+    """Return the cached digest of path without reading it, or None."""
+    try:
+        key = _key(path.stat())
+    except FileNotFoundError:
+        return None
+    with _lock:
+        return _digests.get(key)
+
+
+def remember_hash(path: Path, digest: str) -> None:
+    """Record the digest of a file this run just wrote."""
+    key = _key(path.stat())
+    with _lock:
+        _digests[key] = digest
@@ -0,0 +1,167 @@
+"""Python installer backends for the skills venv: pip, uv, or an offline wheelhouse."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .requirements_merge import MergedRequirements
+from .utils import SyncError, eprint, run_cmd, write_text_if_changed
+
+INSTALLERS = ("auto", "pip", "uv", "wheelhouse")
+
+# Under skills/; names chosen so the requirements*.txt scan never picks them up.
+DEPS_DIR = ".deps"
+MERGED_REQUIREMENTS = "merged-requirements.txt"
+PIP_LOCK = "pip-lock.txt"
+
+
+class PipInstaller:
+    """Creates the venv with `python3 -m venv` and installs with its pip."""
+
+    name = "pip"
+
+    def __init__(self, venv_dir: Path) -> None:
+        self.venv_dir = venv_dir
+        self.py_bin = venv_dir / "bin" / "python3"
+
+    def create_venv(self, *, dry_run: bool) -> None:
+        if not shutil.which("python3"):
+            raise SyncError("python3 not found")
+        run_cmd(["python3", "-m", "venv", str(self.venv_dir)], dry_run=dry_run)
+        run_cmd([str(self.py_bin), "-m", "pip", "install", "--upgrade", "pip"], dry_run=dry_run)
+
+    def install_cmd(self, requirements: Path) -> List[str]:
+        return [str(self.py_bin), "-m", "pip", "install", "-r", str(requirements)]
+
+    def install(self, requirements: Path, *, dry_run: bool) -> None:
+        """Install requirements; raises CalledProcessError on failure."""
+        run_cmd(self.install_cmd(requirements), dry_run=dry_run)
+
+    def freeze(self, *, dry_run: bool) -> Optional[str]:
+        """`pip freeze` of the venv, or None if it failed."""
+        proc = run_cmd(
+            [str(self.py_bin), "-m", "pip", "freeze"], dry_run=dry_run, check=False, capture=True
+        )
+        return (proc.stdout or "") if proc.returncode == 0 else None
+
+    def populate_wheelhouse(self, requirements: Path, wheelhouse: Path, *, dry_run: bool) -> bool:
+        """Build wheels for requirements into wheelhouse for later offline installs."""
+        if not dry_run:
+            wheelhouse.mkdir(parents=True, exist_ok=True)
+        proc = run_cmd(
+            [str(self.py_bin), "-m", "pip", "wheel", "-r", str(requirements), "-w", str(wheelhouse)],
+            dry_run=dry_run,
+            check=False,
+            capture=True,
+        )
+        if proc.returncode != 0:
+            eprint(f"wheelhouse: pip wheel exit {proc.returncode}; {wheelhouse} may be incomplete")
+        return proc.returncode == 0
+
+
+class UvInstaller(PipInstaller):
+    """Creates the venv and installs with uv; pip is seeded for freeze/wheel."""
+
+    name = "uv"
+
+    def __init__(self, venv_dir: Path, uv: str) -> None:
+        super().__init__(venv_dir)
+        self.uv = uv
+
+    def create_venv(self, *, dry_run: bool) -> None:
+        # --allow-existing keeps an existing venv (and its packages) like `python -m venv`.
+        run_cmd([self.uv, "venv", "--seed", "--allow-existing", str(self.venv_dir)], dry_run=dry_run)
+
+    def install_cmd(self, requirements: Path) -> List[str]:
+        return [self.uv, "pip", "install", "--python", str(self.py_bin), "-r", str(requirements)]
+
+
+class WheelhouseInstaller(PipInstaller):
+    """Installs offline from a wheelhouse directory filled by an earlier run."""
+
+    name = "wheelhouse"
+
+    def __init__(self, venv_dir: Path, wheelhouse: Path) -> None:
+        super().__init__(venv_dir)
+        self.wheelhouse = wheelhouse
+
+    def create_venv(self, *, dry_run: bool) -> None:
+        if not shutil.which("python3"):
+            raise SyncError("python3 not found")
+        run_cmd(["python3", "-m", "venv", str(self.venv_dir)], dry_run=dry_run)
+
+    def install_cmd(self, requirements: Path) -> List[str]:
+        return [
+            str(self.py_bin), "-m", "pip", "install",
+            "--no-index", "--find-links", str(self.wheelhouse),
+            "-r", str(requirements),
+        ]
+
+    def populate_wheelhouse(self, requirements: Path, wheelhouse: Path, *, dry_run: bool) -> bool:
+        return True  # Installing from it; nothing new to fetch.
+
+
+def select_installer(name: str, venv_dir: Path, *, wheelhouse: Optional[Path] = None) -> PipInstaller:
+    """Resolve an INSTALLERS name; auto picks uv when it is on PATH, else pip."""
+    if name not in INSTALLERS:
+        raise SyncError(f"Unknown installer: {name}")
+    if name == "wheelhouse":
+        if wheelhouse is None:
+            raise SyncError("--installer wheelhouse requires --wheelhouse DIR")
+        if not wheelhouse.is_dir() or not any(wheelhouse.iterdir()):
+            raise SyncError(
+                f"Wheelhouse is empty or missing: {wheelhouse} "
+                "(populate it by passing --wheelhouse to an online run)"
+            )
+        return WheelhouseInstaller(venv_dir, wheelhouse)
+    uv = shutil.which("uv")
+    if name == "uv" and not uv:
+        raise SyncError("uv not found on PATH")
+    if name in ("auto", "uv") and uv:
+        return UvInstaller(venv_dir, uv)
+    return PipInstaller(venv_dir)
+
+
+def install_merged(
+    installer: PipInstaller,
+    merged: MergedRequirements,
+    *,
+    codex_home: Path,
+    dry_run: bool,
+    wheelhouse: Optional[Path] = None,
+) -> tuple[int, int, float]:
+    """Install every skill's requirements in one resolver pass.
+
+    The files are merged into skills/.deps/merged-requirements.txt; specs
+    that can never be satisfied together are reported and nothing is
+    installed. After a successful install, `pip freeze` is written to
+    skills/.deps/pip-lock.txt and, with wheelhouse, wheels for the merged
+    requirements are built there. Returns (ok, failed, seconds of the
+    install run); counts are per requirements file.
+    """
+    req_files = merged.files
+    if merged.conflicts:
+        for conflict in merged.conflicts:
+            eprint(f"pip conflict: {conflict}")
+        return 0, len(req_files), 0.0
+
+    deps_dir = codex_home / "skills" / DEPS_DIR
+    merged_path = deps_dir / MERGED_REQUIREMENTS
+    write_text_if_changed(merged_path, merged.text, dry_run=dry_run)
+    start = time.monotonic()
+    try:
+        installer.install(merged_path, dry_run=dry_run)
+    except subprocess.CalledProcessError:
+        return 0, len(req_files), time.monotonic() - start
+    seconds = time.monotonic() - start
+
+    frozen = installer.freeze(dry_run=dry_run)
+    if frozen is not None:
+        write_text_if_changed(deps_dir / PIP_LOCK, frozen, dry_run=dry_run)
+    if wheelhouse is not None:
+        installer.populate_wheelhouse(merged_path, wheelhouse, dry_run=dry_run)
+    return len(req_files), 0, seconds
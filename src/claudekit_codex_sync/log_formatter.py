@@ -88,6 +88,11 @@ def log_skip(msg: str) -> None:
     print(f"  {dim('⊘')} {msg}")
 
 
+def log_backup(ts: str, digest: str, path: str) -> None:
+    """Print one backup record."""
+    print(f"  {ts}  {dim(digest[:12])}  {path}")
+
+
 def log_warn(msg: str) -> None:
     """Print warning to stderr."""
     print(f"  {yellow('⚠')} {msg}", file=sys.stderr)
@@ -98,6 +103,11 @@ def log_error(msg: str) -> None:
     print(f"  {red('✗')} {msg}", file=sys.stderr)
 
 
+def log_detail(msg: str) -> None:
+    """Print a dimmed detail line (e.g. captured tool output) to stderr."""
+    print(f"    {dim(msg)}", file=sys.stderr)
+
+
 def log_done() -> None:
     """Print completion message."""
     print(f"\n{green('✓')} {bold('completed')}")
@@ -0,0 +1,66 @@
+"""Archive sync manifests: managed paths with their source and target stats."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .utils import write_text_if_changed
+
+
+def load_manifest(path: Path) -> Set[str]:
+    """Load manifest file as set of paths."""
+    return set(load_manifest_records(path))
+
+
+def load_manifest_records(path: Path) -> Dict[str, Optional[Dict[str, List[int]]]]:
+    """Load manifest lines `path[\tcrc\tsize\tsize,mtime_ns,ino[\trules]]`.
+
+    Records map to {sourceStat: [crc, size], targetStat: [...], rules?}; bare
+    paths (older manifests) map to None.
+    """
+    records: Dict[str, Optional[Dict[str, List[int]]]] = {}
+    if not path.exists():
+        return records
+    for line in path.read_text(encoding="utf-8").splitlines():
+        fields = line.strip().split("\t")
+        if not fields[0]:
+            continue
+        record = None
+        if len(fields) in (4, 5):
+            try:
+                record = {
+                    "sourceStat": [int(fields[1]), int(fields[2])],
+                    "targetStat": [int(v) for v in fields[3].split(",")],
+                    **({"rules": fields[4]} if len(fields) == 5 else {}),
+                }
+            except ValueError:
+                record = None
+        records[fields[0]] = record
+    return records
+
+
+def save_manifest(path: Path, values: Iterable[str], dry_run: bool) -> None:
+    """Save manifest file from set of paths."""
+    data = "\n".join(sorted(set(values)))
+    if data:
+        data += "\n"
+    write_text_if_changed(path, data, dry_run=dry_run)
+
+
+def save_manifest_records(
+    path: Path, records: Dict[str, Optional[Dict[str, List[int]]]], dry_run: bool
+) -> None:
+    """Save manifest records in the format read by load_manifest_records."""
+    lines = []
+    for rel in sorted(records):
+        record = records[rel]
+        if record and record.get("targetStat"):
+            crc, size = record["sourceStat"]
+            target = ",".join(str(v) for v in record["targetStat"])
+            rules = f"\t{record['rules']}" if record.get("rules") else ""
+            lines.append(f"{rel}\t{crc}\t{size}\t{target}{rules}")
+        else:
+            lines.append(rel)
+    data = "".join(line + "\n" for line in lines)
+    write_text_if_changed(path, data, dry_run=dry_run)
@@ -0,0 +1,116 @@
+"""Concurrent npm installs for skills that ship a package.json."""
+
+from __future__ import annotations
+
+import shutil
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from .deps_fingerprint import DepsFingerprints, node_fingerprint, node_modules_complete
+from .fs_index import get_index
+from .utils import is_excluded_path, map_ordered, run_cmd
+
+class NodeInstall(NamedTuple):
+    """Outcome of one `npm install`, with its output captured."""
+
+    package: str
+    returncode: int
+    seconds: float
+    output: str
+
+
+class NodeReport(NamedTuple):
+    """All npm installs of one bootstrap, for the CLI to report."""
+
+    installs: Tuple[NodeInstall, ...] = ()
+    skipped: int = 0
+    seconds: float = 0.0
+    jobs: int = 1
+
+    @property
+    def ok(self) -> int:
+        return sum(1 for r in self.installs if r.returncode == 0)
+
+    @property
+    def failed(self) -> int:
+        return len(self.installs) - self.ok
+
+
+def _npm_install(npm: str, pkg_dir: Path, rel: str, *, dry_run: bool) -> NodeInstall:
+    start = time.monotonic()
+    try:
+        proc = run_cmd(
+            [npm, "install", "--prefix", str(pkg_dir)], dry_run=dry_run, check=False, capture=True
+        )
+        returncode, output = proc.returncode, (proc.stdout or "") + (proc.stderr or "")
+    except OSError as exc:
+        returncode, output = 127, str(exc)
+    return NodeInstall(rel, returncode, time.monotonic() - start, output)
+
+
+def _node_version(*, dry_run: bool) -> str:
+    node = shutil.which("node")
+    if not node:
+        return ""
+    try:
+        proc = run_cmd([node, "--version"], dry_run=dry_run, check=False, capture=True)
+    except OSError:
+        return ""
+    return (proc.stdout or "").strip()
+
+
+def install_node_deps(
+    *,
+    codex_home: Path,
+    include_mcp: bool,
+    dry_run: bool,
+    jobs: int = 1,
+    fingerprints: Optional[DepsFingerprints] = None,
+) -> NodeReport:
+    """Install Node dependencies for skills, up to jobs installs at a time.
+
+    Each install's output is captured for the report; a failed package
+    never stops the others. Packages whose fingerprint matches their last
+    successful install and whose node_modules still holds every declared
+    dependency are skipped.
+    """
+    npm = shutil.which("npm")
+    if not npm:
+        return NodeReport(jobs=jobs)
+
+    pkg_dirs = []
+    for pkg in get_index(codex_home).files("skills/", "package.json"):
+        if is_excluded_path(pkg.relative_to(codex_home).parts):
+            continue
+        if not include_mcp and ("mcp-builder" in pkg.parts or "mcp-management" in pkg.parts):
+            continue
+        pkg_dirs.append(pkg.parent)
+    if not pkg_dirs:
+        return NodeReport(jobs=jobs)
+
+    fingerprints = fingerprints or DepsFingerprints(None)
+    node_version = _node_version(dry_run=dry_run)
+    prints = {d: node_fingerprint(d, node_version) for d in pkg_dirs}
+    units = {d: f"node:{d.relative_to(codex_home).as_posix()}" for d in pkg_dirs}
+    pending = []
+    for pkg_dir in pkg_dirs:
+        installed = node_modules_complete(pkg_dir)
+        if not (installed and fingerprints.matches(units[pkg_dir], prints[pkg_dir])):
+            pending.append(pkg_dir)
+    skipped = len(pkg_dirs) - len(pending)
+    if not pending:
+        return NodeReport(skipped=skipped, jobs=jobs)
+
+    start = time.monotonic()
+    results = map_ordered(
+        lambda d: _npm_install(npm, d, d.relative_to(codex_home).as_posix(), dry_run=dry_run),
+        pending,
+        jobs=jobs,
+    )
+    wall = time.monotonic() - start
+
+    for pkg_dir, result in zip(pending, results):
+        if result.returncode == 0:
+            fingerprints.record(units[pkg_dir], prints[pkg_dir])
+    return NodeReport(tuple(results), skipped, wall, jobs)
@@ -0,0 +1,85 @@
+"""Apply a bytes transform to many files, optionally across a process pool."""
+
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .hash_cache import remember_hash
+from .utils import atomic_write_bytes
+
+# (file path, output hash recorded by the last run or None)
+NormalizeJob = Tuple[Path, Optional[str]]
+# (changed, transform ran, input hash, output hash)
+NormalizeResult = Tuple[bool, bool, str, str]
+Transform = Callable[[bytes], bytes]
+Prefilter = Callable[[bytes], bool]
+
+# Work items per worker; chunks keep small files from costing one IPC round trip each.
+CHUNKS_PER_WORKER = 4
+
+
+def normalize_path(
+    path: Path,
+    known_output: Optional[str],
+    transform: Transform,
+    prefilter: Optional[Prefilter],
+    dry_run: bool,
+) -> NormalizeResult:
+    """Transform one file in place. transform returns its input object when nothing changes.
+
+    Files the prefilter rejects (or already equal to the recorded output)
+    are never decoded or transformed.
+    """
+    data = path.read_bytes()
+    input_hash = hashlib.sha256(data).hexdigest()
+    if input_hash == known_output or (prefilter is not None and not prefilter(data)):
+        return False, False, input_hash, input_hash
+    new_data = transform(data)
+    if new_data is data:
+        return False, True, input_hash, input_hash
+    if not dry_run:
+        atomic_write_bytes(path, new_data)
+    return True, True, input_hash, hashlib.sha256(new_data).hexdigest()
+
+
+def _normalize_chunk(
+    chunk: List[NormalizeJob], transform: Transform, prefilter: Optional[Prefilter], dry_run: bool
+) -> List[NormalizeResult]:
+    """Worker: normalize one contiguous slice of the work list."""
+    return [normalize_path(path, known, transform, prefilter, dry_run) for path, known in chunk]
+
+
+def normalize_paths(
+    items: Sequence[NormalizeJob],
+    transform: Transform,
+    *,
+    jobs: int,
+    dry_run: bool,
+    prefilter: Optional[Prefilter] = None,
+) -> List[NormalizeResult]:
+    """Normalize items, returning results in input order.
+
+    With jobs > 1 the list is cut into contiguous chunks that worker
+    processes read, transform and write; transform and prefilter must be
+    module-level functions so they can be pickled.
+    """
+    if jobs <= 1 or len(items) < 2:
+        results = [normalize_path(path, known, transform, prefilter, dry_run) for path, known in items]
+    else:
+        size = -(-len(items) // (jobs * CHUNKS_PER_WORKER))
+        chunks = [list(items[i : i + size]) for i in range(0, len(items), size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            n = len(chunks)
+            for chunk_results in pool.map(
+                _normalize_chunk, chunks, [transform] * n, [prefilter] * n, [dry_run] * n
+            ):
+                results.extend(chunk_results)
+    if not dry_run:
+        for (path, _), (changed, _, _, output_hash) in zip(items, results):
+            if changed:
+                remember_hash(path, output_hash)
+    return results
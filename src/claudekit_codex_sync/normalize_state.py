@@ -0,0 +1,96 @@
+"""Per-file normalization records so unchanged files are not re-read."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, MutableMapping, Optional
+
+from .sync_registry import NORMALIZED_PREFIX, entries_with_prefix, stat_key
+
+# File classes, each normalized by its own rule tables.
+MARKDOWN = "markdown"
+AGENT_TOML = "agent-toml"
+
+
+def rules_version(*tables: Any) -> str:
+    """Short digest of rule tables; changes whenever any rule or mapping does."""
+    payload = json.dumps(
+        [sorted(t) if isinstance(t, (set, frozenset)) else t for t in tables],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class NormalizeState:
+    """Records of one file class, one registry entry per file.
+
+    Records live at entries["normalized:<class>:<rel>"], with the rules
+    version at entries["normalized:<class>"], so the SQLite backend writes
+    only records that changed. A record holds the file's stat after
+    normalization plus input and output hashes. A file whose stat still
+    matches under the same rules version is skipped without being read. A
+    rules version change drops every record of that class, so only that
+    class is reprocessed.
+    """
+
+    def __init__(self, registry: Optional[Dict[str, Any]], file_class: str, version: str) -> None:
+        self.version = version
+        self._registry = registry
+        self._entries: Optional[MutableMapping[str, Any]] = (
+            registry.get("entries") if registry is not None else None
+        )
+        self._version_key = f"{NORMALIZED_PREFIX}{file_class}"
+        self._prefix = f"{self._version_key}:"
+        self._stored: Dict[str, Dict[str, Any]] = (
+            entries_with_prefix(self._entries, self._prefix) if self._entries is not None else {}
+        )
+        stored_version = (self._entries or {}).get(self._version_key) or {}
+        self._previous = self._stored if stored_version.get("rules") == version else {}
+        self._current: Dict[str, Dict[str, Any]] = {}
+        self.skipped = 0
+
+    def is_current(self, rel: str, path: Path) -> bool:
+        """True (and the record is kept) if path is unchanged since it was normalized."""
+        record = self._previous.get(rel)
+        if record and record.get("stat") and record["stat"] == stat_key(path):
+            self._current[rel] = record
+            self.skipped += 1
+            return True
+        return False
+
+    def recorded_output(self, rel: str) -> Optional[str]:
+        """Output hash recorded for rel under the current rules version, if any."""
+        record = self._previous.get(rel)
+        return record.get("outputHash") if record else None
+
+    def already_normalized(self, rel: str, data: bytes) -> bool:
+        """True if data is the output recorded for rel (e.g. only its stat changed)."""
+        return self.recorded_output(rel) == content_hash(data)
+
+    def record(self, rel: str, path: Path, *, input_hash: str, output_hash: str) -> None:
+        self._current[rel] = {
+            "stat": stat_key(path),
+            "inputHash": input_hash,
+            "outputHash": output_hash,
+        }
+
+    def save(self, *, dry_run: bool) -> None:
+        """Write changed records and drop those of files that no longer exist."""
+        if dry_run or self._registry is None or self._entries is None:
+            return
+        self._registry.pop("normalized", None)  # layout before per-file rows
+        entries = self._entries
+        if (entries.get(self._version_key) or {}).get("rules") != self.version:
+            entries[self._version_key] = {"rules": self.version}
+        for rel in sorted(self._stored.keys() - self._current.keys()):
+            del entries[self._prefix + rel]
+        for rel, record in sorted(self._current.items()):
+            if self._stored.get(rel) != record:
+                entries[self._prefix + rel] = record
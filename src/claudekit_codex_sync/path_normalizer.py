@@ -3,15 +3,51 @@
 from __future__ import annotations
 
 import re
-import shutil
 from pathlib import Path
-
-from .constants import (
-    AGENT_TOML_REPLACEMENTS,
-    CLAUDE_SYNTAX_ADAPTATIONS,
-    SKILL_MD_REPLACEMENTS,
+from typing import Dict, List, Optional, Tuple
+
+from .constants import SKILL_MD_REPLACEMENTS
+from .copy_backend import copy_file
+from .fs_index import get_index
+from .normalize_pool import normalize_paths
+from .normalize_state import MARKDOWN, NormalizeState, rules_version
+from .replacement_engine import compile_rules
+from .utils import (
+    apply_replacements,
+    atomic_write_bytes,
+    load_template,
+    write_text_if_changed,
 )
-from .utils import apply_replacements, load_template, write_text_if_changed
+
+
+NORMALIZED_ASSET_DIRS = ("commands", "output-styles", "rules")
+
+
+def needs_normalization(rel: str) -> bool:
+    """True for codex_home-relative paths whose content gets SKILL_MD_REPLACEMENTS."""
+    parts = rel.split("/")
+    if parts[0] == "skills":
+        return parts[-1] == "SKILL.md" and ".system" not in parts
+    return parts[0] in NORMALIZED_ASSET_DIRS and rel.endswith(".md")
+
+
+def markdown_rules_version() -> str:
+    """Version of the markdown rule table; recorded with every file normalized on copy."""
+    return rules_version(SKILL_MD_REPLACEMENTS)
+
+
+def may_need_normalization(data: bytes) -> bool:
+    """Byte-level prefilter: False when data holds none of the rule anchors."""
+    return compile_rules(tuple(SKILL_MD_REPLACEMENTS)).may_match(data)
+
+
+def normalize_bytes(data: bytes) -> bytes:
+    """Normalize file content; returns data itself when no rule applies."""
+    if not may_need_normalization(data):
+        return data
+    text = data.decode("utf-8", errors="ignore")
+    new_text = apply_replacements(text, SKILL_MD_REPLACEMENTS)
+    return data if new_text == text else new_text.encode("utf-8")
 
 
 def normalize_files(
@@ -19,39 +55,61 @@ def normalize_files(
     codex_home: Path,
     include_mcp: bool,
     dry_run: bool,
-) -> int:
-    """Normalize paths in skill files and asset files."""
+    registry: Optional[dict] = None,
+    jobs: int = 1,
+) -> Dict[str, int]:
+    """Normalize paths in skill files and asset files.
+
+    Sync already normalizes these files on copy, so this pass only catches
+    files placed by other means (and generated helpers below). With a
+    registry, files unchanged since the last run under the same rules are
+    skipped without being read; files holding none of the rule anchors
+    are read but never decoded. jobs > 1 spreads the remaining files over
+    a process pool; output order matches a serial run.
+
+    Returns counts: updated (files written), scanned (markdown files read),
+    transformed (of those, passed the prefilter) and unchanged (skipped by
+    stat).
+    """
     changed = 0
     skills_dir = codex_home / "skills"
+    state = NormalizeState(registry, MARKDOWN, markdown_rules_version())
 
-    for path in sorted(skills_dir.rglob("SKILL.md")):
-        if ".system" in path.parts:
-            continue
+    # Written first so the scan below verifies (and records) it too.
+    command_map = codex_home / "commands" / "codex-command-map.md"
+    template = load_template("command-map.md")
+    if write_text_if_changed(command_map, template, dry_run=dry_run):
+        changed += 1
+        print("upsert: commands/codex-command-map.md")
+
+    index = get_index(codex_home)
+    paths = index.files("skills/", "SKILL.md")
+    for subdir in NORMALIZED_ASSET_DIRS:
+        paths.extend(index.files(f"{subdir}/", "*.md"))
+    work: List[Tuple[str, Path]] = []
+    for path in sorted(paths):
         rel = path.relative_to(codex_home).as_posix()
+        if not needs_normalization(rel):
+            continue
         if not include_mcp and any(m in rel for m in ("/mcp-builder/", "/mcp-management/")):
             continue
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        new_text = apply_replacements(text, SKILL_MD_REPLACEMENTS)
-        if new_text != text:
+        if not state.is_current(rel, path):
+            work.append((rel, path))
+    results = normalize_paths(
+        [(path, state.recorded_output(rel)) for rel, path in work],
+        normalize_bytes,
+        jobs=jobs,
+        dry_run=dry_run,
+        prefilter=may_need_normalization,
+    )
+    transformed = 0
+    for (rel, path), (file_changed, ran, input_hash, output_hash) in zip(work, results):
+        transformed += ran
+        if file_changed:
             changed += 1
             print(f"normalize: {rel}")
-            if not dry_run:
-                path.write_text(new_text, encoding="utf-8")
-
-    # Normalize asset .md files (commands, output-styles, rules)
-    for subdir in ("commands", "output-styles", "rules"):
-        target_dir = codex_home / subdir
-        if not target_dir.exists():
-            continue
-        for path in sorted(target_dir.rglob("*.md")):
-            rel = path.relative_to(codex_home).as_posix()
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            new_text = apply_replacements(text, SKILL_MD_REPLACEMENTS)
-            if new_text != text:
-                changed += 1
-                print(f"normalize: {rel}")
-                if not dry_run:
-                    path.write_text(new_text, encoding="utf-8")
+        state.record(rel, path, input_hash=input_hash, output_hash=output_hash)
+    state.save(dry_run=dry_run)
 
     copy_script = skills_dir / "copywriting" / "scripts" / "extract-writing-styles.py"
     if patch_copywriting_script(copy_script, dry_run=dry_run):
@@ -64,133 +122,14 @@ def normalize_files(
         changed += 1
         print("add: skills/copywriting/assets/writing-styles/default.md")
         if not dry_run:
-            default_style.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(fallback_style, default_style)
-
-    command_map = codex_home / "commands" / "codex-command-map.md"
-    template = load_template("command-map.md")
-    if write_text_if_changed(command_map, template, dry_run=dry_run):
-        changed += 1
-        print("upsert: commands/codex-command-map.md")
-
-    return changed
-
-
-def convert_agents_md_to_toml(*, codex_home: Path, dry_run: bool) -> int:
-    """Convert ClaudeKit agent .md files to Codex .toml format."""
-    from .constants import (
-        CLAUDE_MODEL_REASONING_EFFORT,
-        CLAUDE_TO_CODEX_MODELS,
-        READ_ONLY_AGENT_ROLES,
-    )
-
-    agents_dir = codex_home / "agents"
-    if not agents_dir.exists():
-        return 0
-    if not dry_run:
-        agents_dir.mkdir(parents=True, exist_ok=True)
-
-    converted = 0
-    for md_file in sorted(agents_dir.glob("*.md")):
-        text = md_file.read_text(encoding="utf-8")
-        # Parse YAML frontmatter
-        if not text.startswith("---"):
-            continue
-        parts = text.split("---", 2)
-        if len(parts) < 3:
-            continue
-
-        frontmatter = parts[1].strip()
-        body = parts[2].strip()
-
-        # Extract fields from frontmatter
-        claude_model = ""
-        for line in frontmatter.splitlines():
-            m = re.match(r"^model:\s*(.+)$", line)
-            if m:
-                claude_model = m.group(1).strip().strip("'\"")
-
-        # Map model
-        codex_model = CLAUDE_TO_CODEX_MODELS.get(claude_model, "gpt-5.3-codex")
-        effort = CLAUDE_MODEL_REASONING_EFFORT.get(claude_model, "high")
-
-        # Determine sandbox mode
-        slug = md_file.stem.replace("-", "_")
-        if slug in READ_ONLY_AGENT_ROLES:
-            sandbox = "read-only"
-        else:
-            sandbox = "workspace-write"
-
-        # Build TOML
-        toml_lines = []
-        if codex_model:
-            toml_lines.append(f'model = "{codex_model}"')
-            toml_lines.append(f'model_reasoning_effort = "{effort}"')
-        toml_lines.append(f'sandbox_mode = "{sandbox}"')
-        toml_lines.append("")
-        # Escape triple quotes in body
-        safe_body = body.replace('"""', '\\"\\"\\"\\"')
-        toml_lines.append(f'developer_instructions = """\n{safe_body}\n"""')
-
-        toml_content = "\n".join(toml_lines) + "\n"
-        toml_file = agents_dir / f"{slug}.toml"
-
-        if not dry_run:
-            toml_file.write_text(toml_content, encoding="utf-8")
-            md_file.unlink()  # Remove source .md — Codex only needs .toml
-        converted += 1
-        print(f"convert: agents/{md_file.name} → agents/{slug}.toml ({codex_model}, {sandbox})")
-
-    return converted
-
+            copy_file(fallback_style, default_style)
 
-def normalize_agent_tomls(*, codex_home: Path, dry_run: bool) -> int:
-    """Normalize paths and models in agent TOML files."""
-    from .constants import (
-        CLAUDE_MODEL_REASONING_EFFORT,
-        CLAUDE_TO_CODEX_MODELS,
-        READ_ONLY_AGENT_ROLES,
-    )
-
-    agents_dir = codex_home / "agents"
-    if not agents_dir.exists():
-        return 0
-
-    # First convert any .md agents to .toml
-    convert_agents_md_to_toml(codex_home=codex_home, dry_run=dry_run)
-
-    changed = 0
-    for toml_file in sorted(agents_dir.glob("*.toml")):
-        text = toml_file.read_text(encoding="utf-8")
-        new_text = apply_replacements(text, AGENT_TOML_REPLACEMENTS)
-        new_text = apply_replacements(new_text, CLAUDE_SYNTAX_ADAPTATIONS)
-
-        # Map commented Claude models to active Codex models
-        for claude_name, codex_model in CLAUDE_TO_CODEX_MODELS.items():
-            pattern = rf'^#\s*model\s*=\s*"{claude_name}"\s*$'
-            if re.search(pattern, new_text, re.MULTILINE):
-                effort = CLAUDE_MODEL_REASONING_EFFORT.get(claude_name, "high")
-                if codex_model:
-                    replacement = f'model = "{codex_model}"\nmodel_reasoning_effort = "{effort}"'
-                else:
-                    replacement = ""
-                new_text = re.sub(pattern, replacement, new_text, flags=re.MULTILINE)
-
-        # Set read-only sandbox for appropriate roles
-        slug = toml_file.stem
-        if slug in READ_ONLY_AGENT_ROLES:
-            new_text = re.sub(
-                r'^sandbox_mode\s*=\s*"workspace-write"',
-                'sandbox_mode = "read-only"',
-                new_text,
-                flags=re.MULTILINE,
-            )
-
-        if new_text != text:
-            changed += 1
-            if not dry_run:
-                toml_file.write_text(new_text, encoding="utf-8")
-    return changed
+    return {
+        "updated": changed,
+        "scanned": len(work),
+        "transformed": transformed,
+        "unchanged": state.skipped,
+    }
 
 
 def patch_copywriting_script(copy_script: Path, *, dry_run: bool) -> bool:
@@ -251,5 +190,5 @@ AI_MULTIMODAL_SCRIPTS = next((p for p in _ai_multimodal_candidates if p.exists()
     if text == original:
         return False
     if not dry_run:
-        copy_script.write_text(text, encoding="utf-8")
+        atomic_write_bytes(copy_script, text.encode("utf-8"))
     return True
@@ -0,0 +1,37 @@
+"""Registry compaction: drop entries whose files no longer exist."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from .sync_registry import NORMALIZED_PREFIX, save_registry
+
+
+def _entry_target(key: str) -> Optional[str]:
+    """codex_home-relative file an entry describes (None for version rows)."""
+    if not key.startswith(NORMALIZED_PREFIX):
+        return key
+    parts = key.split(":", 2)
+    return parts[2] if len(parts) == 3 else None
+
+
+def orphan_keys(codex_home: Path, entries: Mapping[str, Any]) -> List[str]:
+    """Entries whose file no longer exists."""
+    return [
+        key
+        for key in entries
+        if (target := _entry_target(key)) is not None and not (codex_home / target).exists()
+    ]
+
+
+def compact_registry(codex_home: Path, registry: Dict[str, Any]) -> int:
+    """Drop entries whose target file no longer exists. Returns entries removed."""
+    entries = registry["entries"]
+    orphans = orphan_keys(codex_home, entries)
+    for key in orphans:
+        del entries[key]
+    save_registry(codex_home, registry)
+    if hasattr(entries, "vacuum"):
+        entries.vacuum()
+    return len(orphans)
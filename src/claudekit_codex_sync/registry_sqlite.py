@@ -0,0 +1,141 @@
+"""SQLite-backed storage for sync registry entries."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (path TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class SqliteEntries(MutableMapping[str, Dict[str, Any]]):
+    """Registry entries stored as rows; writes are buffered until flush().
+
+    read_only opens an existing database without creating or altering it
+    (dry runs); flush() then discards pending writes.
+    """
+
+    def __init__(self, db_path: Path, *, read_only: bool = False) -> None:
+        self.db_path = db_path
+        self.read_only = read_only
+        if read_only:
+            # Without a -wal file the main file is complete; immutable then
+            # stops SQLite from creating -wal/-shm files next to it.
+            wal = db_path.with_name(db_path.name + "-wal")
+            flags = "mode=ro" if wal.exists() else "mode=ro&immutable=1"
+            self._conn = sqlite3.connect(
+                f"{db_path.resolve().as_uri()}?{flags}", uri=True, check_same_thread=False
+            )
+        else:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # path -> entry to upsert, or None to delete
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _fetch(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM entries WHERE path = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        if key in self._pending:
+            value = self._pending[key]
+        else:
+            value = self._fetch(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Dict[str, Any]) -> None:
+        self._pending[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._pending[key] = None
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._pending:
+            return self._pending[key] is not None
+        return isinstance(key, str) and self._fetch(key) is not None
+
+    def _stored_keys(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM entries ORDER BY path").fetchall()
+        for (path,) in rows:
+            yield path
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for key in self._stored_keys():
+            seen.add(key)
+            if self._pending.get(key, True) is not None:
+                yield key
+        for key, value in list(self._pending.items()):
+            if key not in seen and value is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def with_prefix(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Entries whose path starts with prefix, keyed by the remainder."""
+        # Range scan on the primary key index.
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, data FROM entries WHERE path >= ? AND path < ?",
+                (prefix, prefix + "\uffff"),
+            ).fetchall()
+        found = {path: json.loads(data) for path, data in rows}
+        for key, value in list(self._pending.items()):
+            if key.startswith(prefix):
+                if value is None:
+                    found.pop(key, None)
+                else:
+                    found[key] = value
+        return {key[len(prefix) :]: value for key, value in found.items()}
+
+    def load_meta(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM meta").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def flush(self, meta: Dict[str, Any]) -> int:
+        """Write pending rows and meta in one transaction. Returns rows written."""
+        pending, self._pending = self._pending, {}
+        if self.read_only:
+            return 0
+        upserts = [(k, json.dumps(v)) for k, v in pending.items() if v is not None]
+        deletes = [(k,) for k, v in pending.items() if v is None]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO entries (path, data) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET data = excluded.data",
+                upserts,
+            )
+            self._conn.executemany("DELETE FROM entries WHERE path = ?", deletes)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v)) for k, v in meta.items()],
+            )
+            stale = [(k,) for (k,) in self._conn.execute("SELECT key FROM meta") if k not in meta]
+            self._conn.executemany("DELETE FROM meta WHERE key = ?", stale)
+        return len(upserts) + len(deletes)
+
+    def vacuum(self) -> None:
+        with self._lock:
+            self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,165 @@
+"""Compiled multi-pattern replacement with ordered str.replace semantics."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Rule = Tuple[str, str]
+
+
+def _tail_overlaps(a: str, b: str) -> bool:
+    """True if a proper suffix of a is a prefix of b, or b sits inside a past offset 0."""
+    for k in range(1, len(a)):
+        tail = a[k:]
+        if b.startswith(tail) or tail.startswith(b):
+            return True
+    return False
+
+
+def _conflicts(earlier: Rule, later: Rule) -> bool:
+    """True if one leftmost-first scan over both rules could differ from applying them in order.
+
+    Two things break the single scan: a later match that starts before an
+    overlapping earlier match (the scan would take it first), and a later
+    pattern that can appear in or around an earlier rule's output (only a
+    second scan would see it).
+    """
+    (p_i, o_i), (p_j, _) = earlier, later
+    if _tail_overlaps(p_j, p_i):
+        return True
+    if not o_i or p_j in o_i or o_i in p_j:
+        return True
+    return _tail_overlaps(o_i, p_j) or _tail_overlaps(p_j, o_i)
+
+
+def _segment(rules: Sequence[Rule]) -> List[List[Rule]]:
+    """Split rules into consecutive groups that are each safe to apply in one pass."""
+    segments: List[List[Rule]] = []
+    for rule in rules:
+        if not rule[0]:
+            continue
+        if segments and not any(_conflicts(prev, rule) for prev in segments[-1]):
+            segments[-1].append(rule)
+        else:
+            segments.append([rule])
+    return segments
+
+
+def pick_anchors(patterns: Sequence[str], *, min_len: int = 4, max_len: int = 12) -> Tuple[str, ...]:
+    """Small set of literal substrings such that every pattern contains one.
+
+    Greedy cover: repeatedly take the substring (at least min_len chars,
+    so it is rare in ordinary text) shared by the most uncovered patterns,
+    preferring longer ones. A text containing no anchor matches no pattern.
+    """
+    uncovered = [p for p in dict.fromkeys(patterns) if p]
+    anchors: List[str] = []
+    while uncovered:
+        counts: Dict[str, int] = {}
+        for p in uncovered:
+            lengths = range(min(min_len, len(p)), min(len(p), max_len) + 1)
+            subs = {p[i : i + n] for n in lengths for i in range(len(p) - n + 1)}
+            for sub in subs:
+                counts[sub] = counts.get(sub, 0) + 1
+        best = max(counts, key=lambda sub: (counts[sub], len(sub), sub))
+        anchors.append(best)
+        uncovered = [p for p in uncovered if best not in p]
+    return tuple(anchors)
+
+
+class _LiteralPass:
+    """One left-to-right scan applying several literal rules at once.
+
+    At each position the earliest-listed rule that matches wins, and the
+    leftmost match is taken first (the semantics of an ordered regex
+    alternation). Candidates are found by str.find on the anchors, so the
+    scan runs at C speed between hits.
+    """
+
+    def __init__(self, segment: List[Rule]) -> None:
+        table: Dict[str, str] = {}
+        for old, new in segment:
+            table.setdefault(old, new)
+        self.anchors = pick_anchors(list(table))
+        # anchor -> [(offset of anchor in pattern, priority, pattern, replacement)]
+        self._by_anchor: Dict[str, List[Tuple[int, int, str, str]]] = {a: [] for a in self.anchors}
+        for prio, (old, new) in enumerate(table.items()):
+            for anchor in self.anchors:
+                k = old.find(anchor)
+                while k != -1:
+                    self._by_anchor[anchor].append((k, prio, old, new))
+                    k = old.find(anchor, k + 1)
+        self._span = max(len(old) for old in table)
+
+    def _next_match(self, text: str, cursor: int) -> Optional[Tuple[int, int, str, str]]:
+        best: Optional[Tuple[int, int, str, str]] = None
+        hits = {a: text.find(a, cursor) for a in self.anchors}
+        while True:
+            live = [(h, a) for a, h in hits.items() if h != -1]
+            if not live:
+                return best
+            h, anchor = min(live)
+            # A hit this far right can only belong to a match starting after best.
+            if best is not None and h >= best[0] + self._span:
+                return best
+            for k, prio, old, new in self._by_anchor[anchor]:
+                start = h - k
+                if start >= cursor and (best is None or (start, prio) < best[:2]):
+                    if text.startswith(old, start):
+                        best = (start, prio, old, new)
+            hits[anchor] = text.find(anchor, h + 1)
+
+    def __call__(self, text: str) -> str:
+        out: List[str] = []
+        cursor = 0
+        while True:
+            match = self._next_match(text, cursor)
+            if match is None:
+                break
+            start, _, old, new = match
+            out.append(text[cursor:start])
+            out.append(new)
+            cursor = start + len(old)
+        if not out:
+            return text
+        out.append(text[cursor:])
+        return "".join(out)
+
+
+def _compile_pass(segment: List[Rule]) -> Callable[[str], str]:
+    if len(segment) == 1:
+        old, new = segment[0]
+        return lambda text: text.replace(old, new)
+    return _LiteralPass(segment)
+
+
+class ReplacementEngine:
+    """A rule table compiled into as few scans as ordered semantics allow."""
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = tuple(rules)
+        self.segments = _segment(self.rules)
+        self._passes = [_compile_pass(segment) for segment in self.segments]
+        # Every rule pattern contains one of these; no anchor means no change.
+        self.anchors = pick_anchors([old for old, _ in self.rules])
+        self._byte_anchors = tuple(a.encode("utf-8") for a in self.anchors)
+
+    @property
+    def passes(self) -> int:
+        return len(self._passes)
+
+    def may_match(self, data: bytes) -> bool:
+        """Cheap byte-level prefilter: False means apply() would return text unchanged."""
+        return any(anchor in data for anchor in self._byte_anchors)
+
+    def apply(self, text: str) -> str:
+        for run in self._passes:
+            text = run(text)
+        return text
+
+
+@lru_cache(maxsize=32)
+def compile_rules(rules: Tuple[Rule, ...]) -> ReplacementEngine:
+    """Compile (and cache) the engine for a rule table."""
+    return ReplacementEngine(rules)
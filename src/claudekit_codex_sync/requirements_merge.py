@@ -0,0 +1,196 @@
+"""Merge skill requirements files into one pip input and find conflicts up front."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+_REQ = re.compile(
+    r"^(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[(?P<extras>[^\]]*)\])?"
+    r"\s*(?P<spec>[^;@]*?)\s*(?:;\s*(?P<marker>.+?))?\s*$"
+)
+_SPEC = re.compile(r"^\s*(===|==|!=|~=|>=|<=|>|<)\s*(\S+)\s*$")
+_RELEASE = re.compile(r"\d+(?:\.\d+)*")
+_PATH_OPTIONS = ("-r", "--requirement", "-c", "--constraint", "-e", "--editable")
+
+
+class Requirement(NamedTuple):
+    """One named requirement line and the file it came from."""
+
+    name: str
+    extras: Tuple[str, ...]
+    specs: Tuple[Tuple[str, str], ...]
+    marker: str
+    source: str
+
+
+class MergedRequirements(NamedTuple):
+    text: str
+    conflicts: List[str]
+    files: List[Path]
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _release(version: str) -> Optional[Tuple[int, ...]]:
+    if not _RELEASE.fullmatch(version):
+        return None
+    parts = [int(p) for p in version.split(".")]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def _logical_lines(path: Path) -> List[str]:
+    lines: List[str] = []
+    pending = ""
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", raw).rstrip()
+        if line.endswith("\\"):
+            pending += line[:-1]
+            continue
+        line, pending = (pending + line).strip(), ""
+        if line:
+            lines.append(line)
+    return lines
+
+
+def parse_requirements(
+    path: Path, *, root: Path, _seen: Optional[Set[Path]] = None
+) -> Tuple[List[Requirement], List[str]]:
+    """Parse path (following -r includes) into named requirements and pass-through lines.
+
+    Pass-through lines (options, URLs, editables) have relative paths made
+    absolute so they still resolve from the merged file.
+    """
+    seen = _seen if _seen is not None else set()
+    path = path.resolve()
+    if path in seen:
+        return [], []
+    seen.add(path)
+    try:
+        source = path.relative_to(root.resolve()).as_posix()
+    except ValueError:
+        source = str(path)
+
+    reqs: List[Requirement] = []
+    other: List[str] = []
+    for line in _logical_lines(path):
+        if line.startswith("-"):
+            opt, _, value = line.partition(" ")
+            if "=" in opt and not value:
+                opt, _, value = opt.partition("=")
+            value = value.strip()
+            if opt in ("-r", "--requirement"):
+                sub_reqs, sub_other = parse_requirements(path.parent / value, root=root, _seen=seen)
+                reqs.extend(sub_reqs)
+                other.extend(sub_other)
+                continue
+            if opt in _PATH_OPTIONS and value and "://" not in value:
+                value = str((path.parent / value).resolve())
+            other.append(f"{opt} {value}".strip())
+            continue
+        m = _REQ.match(line)
+        specs: List[Tuple[str, str]] = []
+        for part in (m.group("spec").split(",") if m and m.group("spec") else []):
+            spec = _SPEC.match(part)
+            if spec is None:
+                m = None
+                break
+            specs.append((spec.group(1), spec.group(2)))
+        if m is None:
+            other.append(line)
+            continue
+        extras = tuple(sorted(e.strip() for e in (m.group("extras") or "").split(",") if e.strip()))
+        reqs.append(
+            Requirement(
+                canonical_name(m.group("name")), extras, tuple(specs), m.group("marker") or "", source
+            )
+        )
+    return reqs, other
+
+
+def _bounds_conflict(specs: Sequence[Tuple[str, str, str]]) -> bool:
+    """True if numeric specifiers (op, version, source) can never hold together."""
+    low: Optional[Tuple[Tuple[int, ...], bool]] = None  # (version, inclusive)
+    high: Optional[Tuple[Tuple[int, ...], bool]] = None
+    pins: Set[Tuple[int, ...]] = set()
+    excluded: Set[Tuple[int, ...]] = set()
+    for op, version, _ in specs:
+        rel = _release(version)
+        if rel is None:
+            continue
+        if op in ("==", "==="):
+            pins.add(rel)
+        elif op == "!=":
+            excluded.add(rel)
+        if op in (">=", ">", "~="):
+            bound = (rel, op != ">")
+            if low is None or bound[0] > low[0] or (bound[0] == low[0] and not bound[1]):
+                low = bound
+        if op == "~=" and "." in version:
+            # ~=1.4.2 allows up to (excluding) 1.5; use the unstripped parts.
+            parts = [int(p) for p in version.split(".")[:-1]]
+            parts[-1] += 1
+            bound = (_release(".".join(map(str, parts))) or rel, False)
+            if high is None or bound[0] < high[0] or (bound[0] == high[0] and not bound[1]):
+                high = bound
+        if op in ("<=", "<"):
+            bound = (rel, op == "<=")
+            if high is None or bound[0] < high[0] or (bound[0] == high[0] and not bound[1]):
+                high = bound
+    if len(pins) > 1:
+        return True
+    if low and high and (low[0] > high[0] or (low[0] == high[0] and not (low[1] and high[1]))):
+        return True
+    for pin in pins:
+        if pin in excluded:
+            return True
+        if low and (pin < low[0] or (pin == low[0] and not low[1])):
+            return True
+        if high and (pin > high[0] or (pin == high[0] and not high[1])):
+            return True
+    return False
+
+
+def _is_option(line: str) -> bool:
+    return line.startswith("-") and not line.startswith(("-e", "--editable"))
+
+
+def merge_requirements(paths: Sequence[Path], *, root: Path) -> MergedRequirements:
+    """Combine requirements files into one pip input, grouping specs per project.
+
+    Each project line carries every specifier any skill asked for, so one
+    resolver pass honours all of them; provably unsatisfiable combinations
+    are returned as conflicts instead.
+    """
+    groups: Dict[Tuple[str, str], List[Requirement]] = {}
+    passthrough: List[str] = []
+    for path in paths:
+        reqs, other = parse_requirements(path, root=root)
+        for req in reqs:
+            groups.setdefault((req.name, req.marker), []).append(req)
+        passthrough.extend(line for line in other if line not in passthrough)
+
+    # Global options (index URLs, constraints) first, then direct references.
+    lines = [line for line in passthrough if _is_option(line)]
+    lines += [line for line in passthrough if not _is_option(line)]
+    conflicts: List[str] = []
+    for (name, marker), reqs in sorted(groups.items()):
+        specs = [(op, version, req.source) for req in reqs for op, version in req.specs]
+        if _bounds_conflict(specs):
+            detail = "; ".join(f"{op}{version} ({source})" for op, version, source in specs)
+            conflicts.append(f"{name}: {detail}")
+        extras = sorted({e for req in reqs for e in req.extras})
+        spec_text = ",".join(dict.fromkeys(f"{op}{version}" for op, version, _ in specs))
+        sources = ", ".join(dict.fromkeys(req.source for req in reqs))
+        line = name + (f"[{','.join(extras)}]" if extras else "") + spec_text
+        if marker:
+            line += f" ; {marker}"
+        lines.append(f"{line}  # {sources}")
+    text = "".join(line + "\n" for line in lines)
+    return MergedRequirements(text, conflicts, list(paths))
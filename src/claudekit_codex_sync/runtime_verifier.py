@@ -7,6 +7,8 @@ import subprocess
 from pathlib import Path
 from typing import Any, Dict
 
+from .fs_index import get_index
+
 
 def verify_runtime(*, codex_home: Path, dry_run: bool) -> Dict[str, Any]:
     """Verify runtime health after sync."""
@@ -38,7 +40,7 @@ def verify_runtime(*, codex_home: Path, dry_run: bool) -> Dict[str, Any]:
 
     prompts_dir = codex_home / "prompts"
     prompts_count = len(list(prompts_dir.glob("*.md"))) if prompts_dir.exists() else 0
-    skills_count = len(list((codex_home / "skills").rglob("SKILL.md")))
+    skills_count = len(get_index(codex_home).files("skills/", "SKILL.md"))
     return {
         "codex": codex_status,
         "copywriting": copy_status,
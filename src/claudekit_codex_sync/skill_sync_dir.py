@@ -0,0 +1,119 @@
+"""Skill synchronization from live directory."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .constants import CONFLICT_SKILLS, EXCLUDED_SKILLS_ALWAYS, MCP_SKILLS
+from .fs_index import get_index
+from .path_normalizer import markdown_rules_version, needs_normalization, normalize_bytes
+from .sync_registry import entries_with_prefix
+from .tree_delta import collect_dir_sources, sync_tree
+from .utils import map_ordered
+
+
+def sync_skills_from_dir(
+    source: Path,
+    *,
+    codex_home: Path,
+    include_mcp: bool,
+    include_conflicts: bool,
+    dry_run: bool,
+    jobs: int = 1,
+    registry: dict | None = None,
+    paranoid: bool = False,
+) -> Dict[str, int]:
+    """Sync skills from live directory."""
+    skills_src = source / "skills"
+    skills_dst = codex_home / "skills"
+    added = updated = skipped = 0
+    files_added = files_updated = files_removed = 0
+
+    if not skills_src.exists():
+        return {
+            "added": 0,
+            "updated": 0,
+            "skipped": 0,
+            "total_skills": 0,
+            "files_added": 0,
+            "files_updated": 0,
+            "files_removed": 0,
+        }
+
+    selected: List[Path] = []
+    for skill_dir in sorted(skills_src.iterdir()):
+        if not skill_dir.is_dir() or skill_dir.name.startswith("."):
+            continue
+        skill = skill_dir.name
+
+        if skill in EXCLUDED_SKILLS_ALWAYS:
+            skipped += 1
+            continue
+        if not include_mcp and skill in MCP_SKILLS:
+            skipped += 1
+            continue
+        if skill in CONFLICT_SKILLS:
+            skipped += 1
+            continue
+        if not include_conflicts and (skills_dst / ".system" / skill).exists():
+            skipped += 1
+            continue
+        selected.append(skill_dir)
+
+    entries = registry.get("entries") if registry is not None else None
+    md_rules = markdown_rules_version()
+
+    def sync_one(skill_dir: Path) -> Tuple[bool, Dict[str, int], Dict[str, dict], Dict[str, dict]]:
+        dst = skills_dst / skill_dir.name
+        exists = dst.exists()
+        known = entries_with_prefix(entries, f"skills/{skill_dir.name}/") if entries is not None else {}
+        fresh: Dict[str, dict] = {}
+        prefix = f"skills/{skill_dir.name}/"
+        sources = {
+            rel: (
+                src._replace(transform=normalize_bytes, rules=md_rules)
+                if needs_normalization(prefix + rel)
+                else src
+            )
+            for rel, src in collect_dir_sources(skill_dir).items()
+        }
+        delta = sync_tree(
+            dst,
+            sources,
+            dry_run=dry_run,
+            known=known,
+            fresh=fresh,
+            paranoid=paranoid,
+        )
+        return exists, delta, known, fresh
+
+    results = map_ordered(sync_one, selected, jobs=jobs)
+    for skill_dir, (exists, delta, known, fresh) in zip(selected, results):
+        files_added += delta["added"]
+        files_updated += delta["updated"]
+        files_removed += delta["removed"]
+        if not exists:
+            added += 1
+        elif any(delta.values()):
+            updated += 1
+        if entries is not None and not dry_run:
+            prefix = f"skills/{skill_dir.name}/"
+            for inner in sorted(known.keys() - fresh.keys()):
+                del entries[prefix + inner]
+            for inner in sorted(fresh):
+                if known.get(inner) != fresh[inner]:
+                    entries[prefix + inner] = fresh[inner]
+
+    if not dry_run:
+        skills_dst.mkdir(parents=True, exist_ok=True)
+    total_skills = len(get_index(codex_home).files("skills/", "SKILL.md"))
+    return {
+        "added": added,
+        "updated": updated,
+        "skipped": skipped,
+        "total_skills": total_skills,
+        "files_added": files_added,
+        "files_updated": files_updated,
+        "files_removed": files_removed,
+    }
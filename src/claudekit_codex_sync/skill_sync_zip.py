@@ -0,0 +1,113 @@
+"""Skill synchronization from zip files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .archive_index import ArchiveIndex
+from .asset_sync_zip import extract_item
+from .constants import CONFLICT_SKILLS, EXCLUDED_SKILLS_ALWAYS, MCP_SKILLS, SKILLS_MANIFEST
+from .fs_index import get_index
+from .manifest_store import load_manifest_records, save_manifest_records
+from .path_normalizer import markdown_rules_version
+from .sync_registry import entries_with_prefix
+from .tree_delta import remove_stale, source_unchanged, stat_record
+from .zip_extract import ExtractItem
+
+
+def _is_skipped(skill: str, *, skills_dir: Path, include_mcp: bool, include_conflicts: bool) -> bool:
+    if skill in EXCLUDED_SKILLS_ALWAYS or skill in CONFLICT_SKILLS:
+        return True
+    if not include_mcp and skill in MCP_SKILLS:
+        return True
+    return not include_conflicts and (skills_dir / ".system" / skill).exists()
+
+
+def sync_skills(
+    index: ArchiveIndex,
+    *,
+    codex_home: Path,
+    include_mcp: bool,
+    include_conflicts: bool,
+    dry_run: bool,
+    paranoid: bool = False,
+    jobs: int = 1,
+) -> Dict[str, int]:
+    """Sync skills from zip to codex_home/skills.
+
+    Members of all skills are planned first and extracted in one batch, so
+    jobs > 1 spreads decompression across processes.
+    """
+    skills_dir = codex_home / "skills"
+    manifest_path = codex_home / SKILLS_MANIFEST
+    old_records = load_manifest_records(manifest_path)
+    new_records: Dict[str, Optional[Dict[str, List[int]]]] = {}
+
+    # skill -> (existed before sync, wanted inner paths); None marks a skipped skill
+    plans: Dict[str, Optional[Tuple[bool, List[str]]]] = {}
+    md_rules = markdown_rules_version()
+    items: List[ExtractItem] = []
+    pending: List[Tuple[str, str, List[int], Optional[str]]] = []
+    for skill in sorted(index.skills):
+        if _is_skipped(
+            skill, skills_dir=skills_dir, include_mcp=include_mcp, include_conflicts=include_conflicts
+        ):
+            plans[skill] = None
+            continue
+        dst_skill_dir = skills_dir / skill
+        prefix = f"skills/{skill}/"
+        known = entries_with_prefix(old_records, prefix)
+        inners = []
+        for inner, entry in index.skills[skill].items():
+            inners.append(inner)
+            item, stat, rules = extract_item(entry, prefix + inner, dst_skill_dir / inner, md_rules)
+            prev = known.get(inner)
+            if not paranoid and source_unchanged(prev, stat, item.dst, rules):
+                new_records[prefix + inner] = prev
+                continue
+            items.append(item)
+            pending.append((skill, prefix + inner, stat, rules))
+        plans[skill] = (dst_skill_dir.exists(), inners)
+
+    changes: Dict[str, List[int]] = {skill: [0, 0] for skill in plans}
+    results = index.extract(items, jobs=jobs, dry_run=dry_run)
+    for (skill, key, stat, rules), (changed, is_new, target_stat) in zip(pending, results):
+        if target_stat is not None:
+            new_records[key] = stat_record(stat, target_stat, rules)
+        if changed:
+            changes[skill][0 if is_new else 1] += 1
+
+    added = updated = skipped = 0
+    files_added = files_updated = files_removed = 0
+    for skill, plan in plans.items():
+        if plan is None:
+            skipped += 1
+            print(f"skip: {skill}")
+            continue
+        exists, inners = plan
+        files_new, files_changed = changes[skill]
+        files_gone = remove_stale(skills_dir / skill, inners, dry_run=dry_run)
+        files_added += files_new
+        files_updated += files_changed
+        files_removed += files_gone
+        if not exists:
+            added += 1
+            print(f"add: {skill}")
+        elif files_new or files_changed or files_gone:
+            updated += 1
+            print(f"update: {skill}")
+
+    if not dry_run:
+        skills_dir.mkdir(parents=True, exist_ok=True)
+    save_manifest_records(manifest_path, new_records, dry_run=dry_run)
+    total_skills = len(get_index(codex_home).files("skills/", "SKILL.md"))
+    return {
+        "added": added,
+        "updated": updated,
+        "skipped": skipped,
+        "total_skills": total_skills,
+        "files_added": files_added,
+        "files_updated": files_updated,
+        "files_removed": files_removed,
+    }
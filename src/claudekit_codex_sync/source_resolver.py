@@ -1,4 +1,4 @@
-"""Source resolution for ClaudeKit zip or live directory."""
+"""Source resolution for ClaudeKit archive or live directory."""
 
 from __future__ import annotations
 
@@ -6,27 +6,34 @@ import os
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
+from .constants import ARCHIVE_SUFFIXES
 from .utils import SyncError
 
+# Same suffixes open_archive() accepts, so every readable export is discoverable.
+EXPORT_PATTERNS = tuple(f"*{suffix}" for suffix in ARCHIVE_SUFFIXES)
 
-def find_latest_zip(explicit_zip: Optional[Path]) -> Path:
-    """Find the latest ClaudeKit zip file."""
-    if explicit_zip:
-        p = explicit_zip.expanduser().resolve()
+
+def find_latest_archive(explicit_archive: Optional[Path]) -> Path:
+    """Find the latest ClaudeKit export archive (zip or tar)."""
+    if explicit_archive:
+        p = explicit_archive.expanduser().resolve()
         if not p.exists():
-            raise SyncError(f"Zip not found: {p}")
+            raise SyncError(f"Archive not found: {p}")
         return p
 
     candidates: List[Path] = []
     roots = {Path("/tmp"), Path(tempfile.gettempdir())}
     for root in roots:
         if root.exists():
-            candidates.extend(root.glob("claudekit-*/*.zip"))
+            for pattern in EXPORT_PATTERNS:
+                candidates.extend(root.glob(f"claudekit-*/{pattern}"))
 
     if not candidates:
-        raise SyncError("No ClaudeKit zip found. Expected /tmp/claudekit-*/*.zip")
+        raise SyncError(
+            f"No ClaudeKit archive found. Expected /tmp/claudekit-*/ with one of: {', '.join(ARCHIVE_SUFFIXES)}"
+        )
 
     latest = max(candidates, key=lambda p: p.stat().st_mtime)
     return latest.resolve()
@@ -55,29 +62,6 @@ def validate_source(source: Path) -> Dict[str, bool]:
     }
 
 
-def collect_skill_entries(zf: zipfile.ZipFile) -> Dict[str, List[Tuple[str, str]]]:
-    """Collect skill entries from zip file."""
-    skill_files: Dict[str, List[Tuple[str, str]]] = {}
-    for name in zf.namelist():
-        if name.endswith("/") or not name.startswith(".claude/skills/"):
-            continue
-        rel = name[len(".claude/skills/") :].replace("\\", "/")
-        path = Path(rel)
-        if path.is_absolute() or ".." in path.parts:
-            raise SyncError(f"Unsafe zip entry path: {name}")
-        parts = rel.split("/", 1)
-        if len(parts) != 2:
-            continue
-        skill, inner = parts
-        inner_path = Path(inner)
-        if Path(skill).is_absolute() or ".." in Path(skill).parts:
-            raise SyncError(f"Unsafe skill name in zip entry: {name}")
-        if inner_path.is_absolute() or ".." in inner_path.parts:
-            raise SyncError(f"Unsafe skill file path in zip entry: {name}")
-        skill_files.setdefault(skill, []).append((name, inner))
-    return skill_files
-
-
 def zip_mode(info: zipfile.ZipInfo) -> Optional[int]:
     """Extract Unix mode from ZipInfo."""
     unix_mode = (info.external_attr >> 16) & 0o777
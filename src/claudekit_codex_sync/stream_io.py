@@ -0,0 +1,96 @@
+"""Bounded-memory streaming compare and write for archive members."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import secrets
+import sys
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional, Tuple
+
+from .fs_index import note_added
+from .hash_cache import remember_hash
+from .utils import write_bytes_if_changed
+
+CHUNK_SIZE = 1 << 20
+
+Opener = Callable[[], BinaryIO]
+Transform = Callable[[bytes], bytes]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def stream_matches(open_src: Opener, dst: Path, size: int) -> bool:
+    """True if dst holds exactly the bytes of the source stream; stops at the first difference."""
+    try:
+        if dst.stat().st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    with open_src() as fsrc, open(dst, "rb") as fdst:
+        while True:
+            chunk = fsrc.read(CHUNK_SIZE)
+            if chunk != fdst.read(len(chunk) or 1):
+                return False
+            if not chunk:
+                return True
+
+
+def write_stream(open_src: Opener, dst: Path, *, mode: Optional[int]) -> None:
+    """Stream the source into a temp file next to dst, then rename over dst."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.ck-{secrets.token_hex(4)}")
+    h = hashlib.sha256()
+    try:
+        with open_src() as fsrc, open(tmp, "wb") as fout:
+            while chunk := fsrc.read(CHUNK_SIZE):
+                h.update(chunk)
+                fout.write(chunk)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        elif dst.exists():
+            os.chmod(tmp, dst.stat().st_mode & 0o777)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    note_added(dst)
+    remember_hash(dst, h.hexdigest())
+
+
+def write_stream_if_changed(
+    dst: Path,
+    open_src: Opener,
+    *,
+    size: int,
+    mode: Optional[int],
+    dry_run: bool,
+    transform: Optional[Transform] = None,
+) -> Tuple[bool, bool]:
+    """Write the stream to dst if content differs. Returns (changed, is_new).
+
+    With a transform the (small) source is read whole, transformed in memory,
+    and the result is compared and written once.
+    """
+    if transform is not None:
+        with open_src() as fsrc:
+            data = transform(fsrc.read())
+        return write_bytes_if_changed(dst, data, mode=mode, dry_run=dry_run)
+    exists = dst.exists()
+    if exists and stream_matches(open_src, dst, size):
+        if mode is not None and not dry_run:
+            os.chmod(dst, mode)
+        return False, False
+    if not dry_run:
+        write_stream(open_src, dst, mode=mode)
+    return True, not exists
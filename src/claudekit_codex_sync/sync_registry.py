@@ -1,60 +1,176 @@
-"""Sync registry with SHA-256 checksums and backup support."""
+"""Sync registry with SHA-256 checksums, stat fast path and backup support."""
 
 from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
-from .utils import compute_hash, create_backup
+from .backup_store import store_backup
+from .utils import compute_hash
 
 REGISTRY_FILE = ".claudekit-sync-registry.json"
+REGISTRY_DB = ".claudekit-sync-registry.sqlite"
+REGISTRY_BACKENDS = ("json", "sqlite")
+# Entries under this prefix hold normalization records, not synced files.
+NORMALIZED_PREFIX = "normalized:"
 
 
-def load_registry(codex_home: Path) -> Dict[str, Any]:
-    """Load sync registry from disk."""
-    registry_path = codex_home / REGISTRY_FILE
+def _empty_registry() -> Dict[str, Any]:
+    return {
+        "version": 1,
+        "lastSync": None,
+        "sourceDir": None,
+        "entries": {},
+    }
+
+
+def _load_json(registry_path: Path) -> Dict[str, Any]:
     if not registry_path.exists():
-        return {
-            "version": 1,
-            "lastSync": None,
-            "sourceDir": None,
-            "entries": {},
-        }
+        return _empty_registry()
     return json.loads(registry_path.read_text(encoding="utf-8"))
 
 
+def load_registry(
+    codex_home: Path, backend: Optional[str] = None, *, dry_run: bool = False
+) -> Dict[str, Any]:
+    """Load sync registry from disk.
+
+    backend=None keeps whatever format is already on disk (JSON by default).
+    Selecting "sqlite" migrates an existing JSON registry into the database;
+    selecting "json" exports an existing database back to JSON. With
+    dry_run nothing on disk changes: no migration or export happens, and
+    an existing database is opened read-only.
+    """
+    registry_path = codex_home / REGISTRY_FILE
+    db_path = codex_home / REGISTRY_DB
+    if backend is None:
+        backend = "sqlite" if db_path.exists() else "json"
+
+    from .registry_sqlite import SqliteEntries
+
+    if backend == "json" or dry_run:
+        if not db_path.exists():
+            return _load_json(registry_path)
+        entries = SqliteEntries(db_path, read_only=True)
+        registry = {**_empty_registry(), **entries.load_meta(), "entries": entries}
+        if backend == "sqlite":
+            return registry
+        registry["entries"] = dict(entries)
+        entries.close()
+        if not dry_run:
+            save_registry(codex_home, registry)
+            for suffix in ("", "-wal", "-shm"):
+                db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+        return registry
+
+    entries = SqliteEntries(db_path)
+    registry = {**_empty_registry(), **entries.load_meta(), "entries": entries}
+    if registry_path.exists():
+        legacy = json.loads(registry_path.read_text(encoding="utf-8"))
+        for key, entry in legacy.pop("entries", {}).items():
+            entries[key] = entry
+        registry.update({k: v for k, v in legacy.items() if k != "entries"})
+        entries.flush(_registry_meta(registry))
+        registry_path.unlink()
+    return registry
+
+
+def _registry_meta(registry: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in registry.items() if k != "entries"}
+
+
 def save_registry(codex_home: Path, registry: Dict[str, Any]) -> None:
     """Save sync registry to disk."""
+    registry["lastSync"] = datetime.now(timezone.utc).isoformat()
+    entries = registry["entries"]
+    if hasattr(entries, "flush"):
+        entries.flush(_registry_meta(registry))
+        return
     registry_path = codex_home / REGISTRY_FILE
     registry_path.parent.mkdir(parents=True, exist_ok=True)
-    registry["lastSync"] = datetime.now(timezone.utc).isoformat()
     registry_path.write_text(json.dumps(registry, indent=2), encoding="utf-8")
 
 
-def check_user_edit(entry: Dict[str, str], target: Path) -> bool:
+def entries_with_prefix(entries: Mapping[str, Any], prefix: str) -> Dict[str, Any]:
+    """Entries whose key starts with prefix, keyed by the remainder."""
+    if hasattr(entries, "with_prefix"):
+        return entries.with_prefix(prefix)
+    return {k[len(prefix) :]: v for k, v in entries.items() if k.startswith(prefix)}
+
+
+def stat_key(path: Path) -> Optional[List[int]]:
+    """Return [size, mtime_ns, inode] for path, or None if missing."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def check_user_edit(entry: Dict[str, Any], target: Path, *, paranoid: bool = False) -> bool:
     """Check if user has modified the file since last sync."""
     if not target.exists():
         return False
+    if not paranoid and entry.get("targetStat") and entry["targetStat"] == stat_key(target):
+        return False
     current_hash = compute_hash(target)
     return current_hash != entry.get("targetHash", "")
 
 
-def update_entry(
-    registry: Dict[str, Any],
-    rel_path: str,
+def entry_is_fresh(
+    entry: Optional[Dict[str, Any]], source: Path, target: Path, *, rules: Optional[str] = None
+) -> bool:
+    """True when neither source nor target changed since the entry was recorded.
+
+    rules is the version of the transform that produced target (None for a
+    plain copy); an entry recorded under other rules is never fresh.
+    """
+    if not entry or not entry.get("sourceStat") or not entry.get("targetStat"):
+        return False
+    if entry.get("rules") != rules:
+        return False
+    return entry["sourceStat"] == stat_key(source) and entry["targetStat"] == stat_key(target)
+
+
+def make_entry(
     source: Path,
     target: Path,
-) -> None:
-    """Update registry entry after sync."""
-    source_hash = compute_hash(source) if source.exists() else ""
-    target_hash = compute_hash(target) if target.exists() else ""
-    registry["entries"][rel_path] = {
+    *,
+    previous: Optional[Dict[str, Any]] = None,
+    paranoid: bool = False,
+    rules: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a registry entry, reusing hashes from previous when stats still match.
+
+    rules records the transform version that produced target, if any.
+    """
+    source_stat = stat_key(source)
+    target_stat = stat_key(target)
+    prev = previous if previous and not paranoid else {}
+    if source_stat is None:
+        source_hash = ""
+    elif prev.get("sourceStat") == source_stat and prev.get("sourceHash"):
+        source_hash = prev["sourceHash"]
+    else:
+        source_hash = compute_hash(source)
+    if target_stat is None:
+        target_hash = ""
+    elif prev.get("targetStat") == target_stat and prev.get("targetHash"):
+        target_hash = prev["targetHash"]
+    else:
+        target_hash = compute_hash(target)
+    entry = {
         "sourceHash": source_hash,
         "targetHash": target_hash,
+        "sourceStat": source_stat,
+        "targetStat": target_stat,
         "syncedAt": datetime.now(timezone.utc).isoformat(),
     }
+    if rules is not None:
+        entry["rules"] = rules
+    return entry
 
 
 def maybe_backup(
@@ -62,6 +178,7 @@ def maybe_backup(
     rel_path: str,
     target: Path,
     respect_edits: bool,
+    paranoid: bool = False,
 ) -> Optional[Path]:
     """Backup file if user has edited it and respect_edits is enabled."""
     if not target.exists():
@@ -71,7 +188,7 @@ def maybe_backup(
         return None
     if not respect_edits:
         return None
-    if check_user_edit(entry, target):
-        backup = create_backup(target)
-        return backup
+    if check_user_edit(entry, target, paranoid=paranoid):
+        codex_home = target.parents[len(Path(rel_path).parts) - 1]
+        return store_backup(codex_home, rel_path, target)
     return None
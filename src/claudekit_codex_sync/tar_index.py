@@ -0,0 +1,139 @@
+"""Streaming index of tar archives (tar, tar.gz, tar.xz, tar.zst)."""
+
+from __future__ import annotations
+
+import tarfile
+import tempfile
+import threading
+from pathlib import Path
+from typing import IO, Callable, Collection, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .archive_index import ArchiveEntry, ArchiveIndex
+from .stream_io import CHUNK_SIZE, write_stream_if_changed
+from .sync_registry import stat_key
+from .utils import SyncError, map_ordered
+from .zip_extract import ExtractItem, ExtractResult
+
+
+class _SpanReader:
+    """Read-only view of one byte range of the tar index's spool file."""
+
+    def __init__(self, spool: IO[bytes], lock: threading.Lock, offset: int, size: int) -> None:
+        self._spool, self._lock = spool, lock
+        self._pos, self._end = offset, offset + size
+
+    def read(self, n: int = -1) -> bytes:
+        remaining = self._end - self._pos
+        if n < 0 or n > remaining:
+            n = remaining
+        with self._lock:
+            self._spool.seek(self._pos)
+            data = self._spool.read(n)
+        self._pos += len(data)
+        return data
+
+    def __enter__(self) -> "_SpanReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+def _open_zstd(raw: IO[bytes]) -> IO[bytes]:
+    try:
+        import zstandard
+    except ImportError:
+        try:
+            from compression import zstd  # Python 3.14+
+        except ImportError:
+            raise SyncError("Reading .tar.zst archives requires the 'zstandard' package") from None
+        return zstd.ZstdFile(raw)
+    return zstandard.ZstdDecompressor().stream_reader(raw)
+
+
+def _member_name(info: tarfile.TarInfo) -> str:
+    return info.name[2:] if info.name.startswith("./") else info.name
+
+
+class TarIndex(ArchiveIndex):
+    """Index built from one sequential pass over a (compressed) tar stream.
+
+    Tar has no central directory, so the pass that reads headers also
+    decompresses the members sync will extract into an uncompressed spool
+    file; extraction then reads byte ranges from the spool. Members the
+    skip predicate marks unchanged are indexed but not spooled; if sync
+    asks for one anyway, a second pass spools just those.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._spool = tempfile.TemporaryFile(prefix="ck-tar-")
+        self._lock = threading.Lock()
+        self._spans: Dict[str, Tuple[int, int]] = {}
+
+    @classmethod
+    def build(cls, path: Path, *, skip: Optional[Callable[[ArchiveEntry], bool]] = None) -> "TarIndex":
+        index = cls(path)
+        try:
+            for info, tf in index._members():
+                if not info.isreg():
+                    index.ignored += 1
+                    continue
+                name = _member_name(info)
+                entry = index._add(name, info.size, int(info.mtime), info.mode & 0o777 or None)
+                if entry is not None and not (skip and skip(entry)):
+                    index._spool_member(name, tf.extractfile(info))
+        except BaseException:
+            index.close()
+            raise
+        return index
+
+    def _members(self) -> Iterator[Tuple[tarfile.TarInfo, tarfile.TarFile]]:
+        """Yield every member header in archive order from one streaming read."""
+        with open(self.path, "rb") as raw:
+            stream: IO[bytes] = raw
+            if self.path.name.lower().endswith((".tar.zst", ".tzst")):
+                stream = _open_zstd(raw)
+            with tarfile.open(fileobj=stream, mode="r|*") as tf:
+                for info in tf:
+                    yield info, tf
+
+    def _spool_member(self, name: str, member: Optional[IO[bytes]]) -> None:
+        offset = self._spool.seek(0, 2)
+        size = 0
+        if member is not None:
+            while chunk := member.read(CHUNK_SIZE):
+                self._spool.write(chunk)
+                size += len(chunk)
+        self._spans[name] = (offset, size)
+
+    def _spool_missing(self, names: Collection[str]) -> None:
+        """Spool members that build() skipped but sync now wants."""
+        try:
+            for info, tf in self._members():
+                name = _member_name(info)
+                if info.isreg() and name in names and name not in self._spans:
+                    self._spool_member(name, tf.extractfile(info))
+        except tarfile.TarError as exc:
+            raise SyncError(f"Cannot read tar archive {self.path}: {exc}") from exc
+
+    def _extract_one(self, item: ExtractItem, dry_run: bool) -> ExtractResult:
+        offset, size = self._spans[item.name]
+        changed, is_new = write_stream_if_changed(
+            item.dst,
+            lambda: _SpanReader(self._spool, self._lock, offset, size),
+            size=item.size,
+            mode=item.mode,
+            dry_run=dry_run,
+            transform=item.transform,
+        )
+        return changed, is_new, None if dry_run else stat_key(item.dst)
+
+    def extract(self, items: Sequence[ExtractItem], *, jobs: int, dry_run: bool) -> List[ExtractResult]:
+        missing = {item.name for item in items} - self._spans.keys()
+        if missing:
+            self._spool_missing(missing)
+        return map_ordered(lambda item: self._extract_one(item, dry_run), items, jobs=jobs)
+
+    def close(self) -> None:
+        self._spool.close()
@@ -0,0 +1,177 @@
+"""Line-preserving TOML document model for targeted config edits."""
+
+from __future__ import annotations
+
+import json
+import tomllib
+from typing import Any, Dict, List, Optional
+
+from .toml_lines import KEY_LINE, TABLE_HEADER, canonical_key, scan_value
+
+
+def toml_string(value: str) -> str:
+    """Quote value as a TOML basic string."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+class _Item:
+    """One key/value entry (possibly multi-line), or a comment/blank line (key None)."""
+
+    __slots__ = ("key", "lines")
+
+    def __init__(self, key: Optional[str], lines: List[str]) -> None:
+        self.key = key
+        self.lines = lines
+
+
+class TomlTable:
+    """A [table], [[array table]] entry, or the root table, with a key index."""
+
+    def __init__(self, doc: "TomlDocument", name: str, header: List[str], array: bool) -> None:
+        self._doc = doc
+        self.name = name
+        self.array = array
+        self.header = header
+        self.items: List[_Item] = []
+        self._keys: Dict[str, _Item] = {}
+
+    def _append(self, item: _Item) -> None:
+        self.items.append(item)
+        if item.key is not None:
+            self._keys.setdefault(item.key, item)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def get(self, key: str) -> Any:
+        """Parsed value of key, or None if absent or unparseable."""
+        item = self._keys.get(key)
+        if item is None:
+            return None
+        try:
+            data: Any = tomllib.loads("".join(item.lines))
+        except tomllib.TOMLDecodeError:
+            return None
+        for part in key.split("."):
+            data = data.get(part.strip("\"'")) if isinstance(data, dict) else None
+        return data
+
+    def set(self, key: str, literal: str) -> bool:
+        """Set key to a TOML value literal. Untouched (comments kept) if the value is equal."""
+        line = f"{key} = {literal}\n"
+        item = self._keys.get(key)
+        if item is not None:
+            if self.get(key) == tomllib.loads(line)[key]:
+                return False
+            item.lines = [line]
+        else:
+            self._insert(_Item(key, [line]))
+        self._doc.revision += 1
+        return True
+
+    def setdefault(self, key: str, literal: str) -> bool:
+        """Add key only if missing. Returns True if added."""
+        if key in self._keys:
+            return False
+        self._insert(_Item(key, [f"{key} = {literal}\n"]))
+        self._doc.revision += 1
+        return True
+
+    def _insert(self, item: _Item) -> None:
+        # After the last entry (or last comment), so trailing blank lines stay last.
+        pos = 0
+        for i, existing in enumerate(self.items):
+            if existing.key is not None:
+                pos = i + 1
+        if pos == 0:
+            for i, existing in enumerate(self.items):
+                if existing.lines[0].strip():
+                    pos = i + 1
+        self.items.insert(pos, item)
+        self._keys[item.key] = item  # type: ignore[index]
+
+    def render(self) -> str:
+        return "".join(self.header) + "".join(line for item in self.items for line in item.lines)
+
+
+class TomlDocument:
+    """config.toml as tables of raw lines; unedited lines render byte-for-byte."""
+
+    def __init__(self) -> None:
+        self.revision = 0
+        self.root = TomlTable(self, "", [], False)
+        self.tables: List[TomlTable] = []
+        self._tables: Dict[str, TomlTable] = {}
+        self._arrays: Dict[str, List[TomlTable]] = {}
+
+    @classmethod
+    def parse(cls, text: str) -> "TomlDocument":
+        doc = cls()
+        if text and not text.endswith("\n"):
+            text += "\n"
+        current = doc.root
+        item: Optional[_Item] = None
+        quote: Optional[str] = None
+        depth = 0
+        for line in text.splitlines(keepends=True):
+            if item is not None and (quote or depth > 0):
+                item.lines.append(line)
+                quote, depth = scan_value(line, quote, depth)
+                continue
+            item = None
+            header = TABLE_HEADER.match(line)
+            if header and (header.group(1) == "[[") == (header.group(3) == "]]"):
+                current = doc._register(canonical_key(header.group(2)), [line], header.group(1) == "[[")
+                continue
+            key = KEY_LINE.match(line)
+            if key:
+                item = _Item(canonical_key(key.group(1)), [line])
+                quote, depth = scan_value(line[key.end() :], None, 0)
+                current._append(item)
+            else:
+                current._append(_Item(None, [line]))
+        return doc
+
+    def _register(self, name: str, header: List[str], array: bool) -> TomlTable:
+        table = TomlTable(self, name, header, array)
+        self.tables.append(table)
+        if array:
+            self._arrays.setdefault(name, []).append(table)
+        else:
+            self._tables.setdefault(name, table)
+        return table
+
+    def table(self, name: str) -> Optional[TomlTable]:
+        """The [name] table, or None."""
+        return self._tables.get(name)
+
+    def array(self, name: str) -> List[TomlTable]:
+        """Entries of the [[name]] array of tables, in document order."""
+        return list(self._arrays.get(name, ()))
+
+    def add_table(self, name: str, *, array: bool = False) -> TomlTable:
+        """Append a new [name] (or [[name]]) table, separated by a blank line."""
+        header = [f"[[{name}]]\n" if array else f"[{name}]\n"]
+        if self._last_line().strip():
+            header.insert(0, "\n")
+        self.revision += 1
+        return self._register(name, header, array)
+
+    def _last_line(self) -> str:
+        for table in reversed([self.root] + self.tables):
+            if table.items:
+                return table.items[-1].lines[-1]
+            if table.header:
+                return table.header[-1]
+        return ""
+
+    def remove_table(self, table: TomlTable) -> None:
+        self.tables.remove(table)
+        if table.array:
+            self._arrays[table.name].remove(table)
+        elif self._tables.get(table.name) is table:
+            del self._tables[table.name]
+        self.revision += 1
+
+    def render(self) -> str:
+        return self.root.render() + "".join(table.render() for table in self.tables)
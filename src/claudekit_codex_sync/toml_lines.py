@@ -0,0 +1,48 @@
+"""Line-level TOML lexing: table headers, key lines and multi-line values."""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Tuple
+
+TABLE_HEADER = re.compile(r"^\s*(\[\[?)\s*([^\[\]#]+?)\s*(\]\]?)\s*(?:#.*)?$")
+_KEY_PART = r"""(?:[A-Za-z0-9_-]+|"(?:[^"\\]|\\.)*"|'[^']*')"""
+KEY_LINE = re.compile(rf"^\s*({_KEY_PART}(?:\s*\.\s*{_KEY_PART})*)\s*=")
+
+
+def canonical_key(name: str) -> str:
+    """Dotted key or table name with whitespace around the dots removed."""
+    return re.sub(r"\s*\.\s*", ".", name.strip())
+
+
+def scan_value(text: str, quote: Optional[str], depth: int) -> Tuple[Optional[str], int]:
+    """Track open multi-line strings and bracket depth across one line of a value."""
+    i, n = 0, len(text)
+    while i < n:
+        if quote:
+            if quote == '"""' and text[i] == "\\":
+                i += 2
+            elif text.startswith(quote, i):
+                quote, i = None, i + 3
+            else:
+                i += 1
+            continue
+        c = text[i]
+        if c == "#":
+            break
+        if text.startswith('"""', i) or text.startswith("'''", i):
+            quote, i = text[i : i + 3], i + 3
+            continue
+        if c == '"':
+            i += 1
+            while i < n and text[i] != '"':
+                i += 2 if text[i] == "\\" else 1
+        elif c == "'":
+            end = text.find("'", i + 1)
+            i = n if end == -1 else end
+        elif c in "[{":
+            depth += 1
+        elif c in "]}":
+            depth -= 1
+        i += 1
+    return quote, depth
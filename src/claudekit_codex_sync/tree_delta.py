@@ -0,0 +1,178 @@
+"""Per-file delta sync for skill directories."""
+
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Collection, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .copy_backend import copy_file, files_equal
+from .fs_index import note_removed
+from .stream_io import Transform, stream_matches, write_stream, write_stream_if_changed
+from .sync_registry import stat_key
+from .utils import is_excluded_path, prune_empty_parents
+
+SKILL_IGNORE_DIRS = {"__pycache__", ".venv", "node_modules", "dist", "build"}
+SKILL_IGNORE_SUFFIXES = (".pyc",)
+
+
+class DeltaSource(NamedTuple):
+    """One file wanted in the target tree."""
+
+    size: int
+    mode: Optional[int]
+    open: Callable[[], BinaryIO]
+    path: Optional[Path] = None
+    link_ok: bool = False
+    stat: Optional[List[int]] = None
+    # Content rewrite applied on copy (e.g. path normalization) and its rules version
+    transform: Optional[Transform] = None
+    rules: Optional[str] = None
+
+
+def _is_ignored(rel: str) -> bool:
+    parts = rel.split("/")
+    return any(p in SKILL_IGNORE_DIRS for p in parts[:-1]) or rel.endswith(SKILL_IGNORE_SUFFIXES)
+
+
+def collect_dir_sources(root: Path) -> Dict[str, DeltaSource]:
+    """Collect files under root as delta sources, skipping ignored paths."""
+    sources: Dict[str, DeltaSource] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKILL_IGNORE_DIRS)
+        base = Path(dirpath)
+        for name in filenames:
+            if name.endswith(SKILL_IGNORE_SUFFIXES):
+                continue
+            path = base / name
+            st = path.stat()
+            rel = path.relative_to(root).as_posix()
+            mode = st.st_mode & 0o777
+            # A hardlink shares the source inode, so an in-place edit of the
+            # target would change the source. Only link read-only sources, and
+            # never markdown, which normalization rewrites.
+            link_ok = not name.endswith(".md") and not st.st_mode & 0o222
+            stat = [st.st_size, st.st_mtime_ns, st.st_ino]
+            sources[rel] = DeltaSource(
+                st.st_size, mode, functools.partial(path.open, "rb"), path, link_ok, stat
+            )
+    return sources
+
+
+def list_target_files(root: Path) -> Set[str]:
+    """List managed files under root, leaving runtime dirs (node_modules, .venv) alone."""
+    found: Set[str] = set()
+    if not root.is_dir():
+        return found
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not is_excluded_path((d,))]
+        base = Path(dirpath)
+        for name in filenames:
+            found.add((base / name).relative_to(root).as_posix())
+    return found
+
+
+def source_unchanged(
+    prev: Optional[Dict[str, Any]],
+    source_stat: Optional[List[int]],
+    dst: Path,
+    rules: Optional[str] = None,
+) -> bool:
+    """True if source and target stats (and transform rules) match the previous sync record."""
+    return (
+        bool(prev)
+        and source_stat is not None
+        and prev.get("rules") == rules
+        and prev.get("sourceStat") == source_stat
+        and prev.get("targetStat") == stat_key(dst)
+    )
+
+
+def stat_record(
+    source_stat: List[int], target_stat: Optional[List[int]], rules: Optional[str] = None
+) -> Dict[str, Any]:
+    """The record source_unchanged checks on the next run."""
+    record: Dict[str, Any] = {"sourceStat": source_stat, "targetStat": target_stat}
+    if rules is not None:
+        record["rules"] = rules
+    return record
+
+
+def _same_content(dst: Path, src: DeltaSource) -> bool:
+    if src.path is not None:
+        return files_equal(src.path, dst)
+    return stream_matches(src.open, dst, src.size)
+
+
+def _write_if_changed(dst: Path, src: DeltaSource, *, dry_run: bool) -> Tuple[bool, bool]:
+    """Bring one file up to date. Returns (changed, is_new)."""
+    if src.transform is not None:
+        return write_stream_if_changed(
+            dst, src.open, size=src.size, mode=src.mode, dry_run=dry_run, transform=src.transform
+        )
+    exists = dst.exists()
+    if exists and _same_content(dst, src):
+        if src.mode is not None and not dry_run and (dst.stat().st_mode & 0o777) != src.mode:
+            os.chmod(dst, src.mode)
+        return False, False
+    if not dry_run:
+        if src.path is not None:
+            copy_file(src.path, dst, mode=src.mode, link_ok=src.link_ok)
+        else:
+            write_stream(src.open, dst, mode=src.mode)
+    return True, not exists
+
+
+def sync_tree(
+    dst_dir: Path,
+    sources: Dict[str, DeltaSource],
+    *,
+    dry_run: bool,
+    known: Optional[Dict[str, Dict[str, Any]]] = None,
+    fresh: Optional[Dict[str, Dict[str, Any]]] = None,
+    paranoid: bool = False,
+) -> Dict[str, int]:
+    """Bring dst_dir in line with sources, touching only changed files.
+
+    known maps rel -> previous {sourceStat, targetStat}; files whose source
+    and target stats both match are skipped without reading. Up-to-date
+    stat records for every source file are written into fresh.
+    """
+    added = updated = 0
+
+    for rel in sorted(sources):
+        src = sources[rel]
+        dst = dst_dir / rel
+        prev = known.get(rel) if known is not None else None
+        if not paranoid and source_unchanged(prev, src.stat, dst, src.rules):
+            if fresh is not None:
+                fresh[rel] = prev
+            continue
+        changed, is_new = _write_if_changed(dst, src, dry_run=dry_run)
+        if changed:
+            if is_new:
+                added += 1
+            else:
+                updated += 1
+        if fresh is not None and src.stat is not None and not dry_run:
+            fresh[rel] = stat_record(src.stat, stat_key(dst), src.rules)
+
+    removed = remove_stale(dst_dir, sources, dry_run=dry_run)
+    return {"added": added, "updated": updated, "removed": removed}
+
+
+def remove_stale(dst_dir: Path, wanted: Collection[str], *, dry_run: bool) -> int:
+    """Delete managed files under dst_dir that are not in wanted. Returns count."""
+    removed = 0
+    for rel in sorted(list_target_files(dst_dir) - set(wanted)):
+        if _is_ignored(rel):
+            continue
+        removed += 1
+        if not dry_run:
+            target = dst_dir / rel
+            target.unlink()
+            note_removed(target)
+            prune_empty_parents(target.parent, stop=dst_dir)
+    return removed
+
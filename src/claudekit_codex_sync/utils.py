@@ -5,12 +5,19 @@ from __future__ import annotations
 import hashlib
 import json
 import os
-import shutil
+import secrets
 import subprocess
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from .fs_index import note_added
+from .hash_cache import cached_hash, remember_hash
+from .replacement_engine import compile_rules
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class SyncError(RuntimeError):
@@ -56,19 +63,35 @@ def write_bytes_if_changed(
 ) -> Tuple[bool, bool]:
     """Write bytes to file if content changed. Returns (changed, is_new)."""
     exists = path.exists()
-    if exists and path.read_bytes() == data:
+    digest = hashlib.sha256(data).hexdigest()
+    if exists and path.stat().st_size == len(data) and cached_hash(path) == digest:
         if mode is not None and not dry_run:
             os.chmod(path, mode)
         return False, False
     if dry_run:
         return True, not exists
-    ensure_parent(path, dry_run=False)
-    path.write_bytes(data)
-    if mode is not None:
-        os.chmod(path, mode)
+    atomic_write_bytes(path, data, mode=mode)
+    remember_hash(path, digest)
     return True, not exists
 
 
+def atomic_write_bytes(path: Path, data: bytes, *, mode: Optional[int] = None) -> None:
+    """Write bytes via a temp file + rename so hardlinked targets are never written through."""
+    ensure_parent(path, dry_run=False)
+    tmp = path.with_name(f".{path.name}.ck-{secrets.token_hex(4)}")
+    try:
+        tmp.write_bytes(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        elif path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    note_added(path)
+
+
 def write_text_if_changed(
     path: Path, text: str, *, executable: bool = False, dry_run: bool = False
 ) -> bool:
@@ -81,27 +104,27 @@ def write_text_if_changed(
     return changed
 
 
-def load_manifest(path: Path) -> Set[str]:
-    """Load manifest file as set of paths."""
-    if not path.exists():
-        return set()
-    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+def prune_empty_parents(directory: Path, *, stop: Path) -> None:
+    """Remove directory and its parents while empty, never going above stop."""
+    while directory != stop and stop in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
 
 
-def save_manifest(path: Path, values: Iterable[str], dry_run: bool) -> None:
-    """Save manifest file from set of paths."""
-    data = "\n".join(sorted(set(values)))
-    if data:
-        data += "\n"
-    write_text_if_changed(path, data, dry_run=dry_run)
+def apply_replacements(text: str, rules: Sequence[Tuple[str, str]]) -> str:
+    """Apply string replacements with in-sequence semantics via a cached compiled engine."""
+    return compile_rules(tuple(rules)).apply(text)
 
 
-def apply_replacements(text: str, rules: Sequence[Tuple[str, str]]) -> str:
-    """Apply string replacements in sequence."""
-    out = text
-    for old, new in rules:
-        out = out.replace(old, new)
-    return out
+def map_ordered(fn: Callable[[T], R], items: Sequence[T], *, jobs: int) -> List[R]:
+    """Map fn over items on a thread pool of size jobs, keeping input order."""
+    if jobs <= 1 or len(items) < 2:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(fn, items))
 
 
 def is_excluded_path(parts: Sequence[str]) -> bool:
@@ -111,16 +134,8 @@ def is_excluded_path(parts: Sequence[str]) -> bool:
 
 
 def compute_hash(path: Path) -> str:
-    """Compute SHA-256 hash of file contents."""
-    return hashlib.sha256(path.read_bytes()).hexdigest()
-
-
-def create_backup(path: Path) -> Path:
-    """Create a timestamped backup of a file."""
-    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-    backup = path.with_suffix(f".ck-backup-{ts}{path.suffix}")
-    shutil.copy2(path, backup)
-    return backup
+    """Compute SHA-256 hash of file contents (memoized for this run)."""
+    return cached_hash(path)
 
 
 def load_template(name: str) -> str:
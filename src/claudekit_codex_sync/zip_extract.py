@@ -0,0 +1,82 @@
+"""Zip member extraction, optionally spread over a process pool."""
+
+from __future__ import annotations
+
+import heapq
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from .fs_index import note_added
+from .stream_io import Transform, write_stream_if_changed
+from .sync_registry import stat_key
+
+
+class ExtractItem(NamedTuple):
+    """One archive member to bring to dst."""
+
+    name: str
+    dst: Path
+    size: int
+    mode: Optional[int]
+    transform: Optional[Transform] = None
+
+
+# (changed, is_new, target stat after the write)
+ExtractResult = Tuple[bool, bool, Optional[List[int]]]
+
+
+def _extract_one(zf: zipfile.ZipFile, item: ExtractItem, dry_run: bool) -> ExtractResult:
+    changed, is_new = write_stream_if_changed(
+        item.dst,
+        lambda: zf.open(item.name),
+        size=item.size,
+        mode=item.mode,
+        dry_run=dry_run,
+        transform=item.transform,
+    )
+    return changed, is_new, None if dry_run else stat_key(item.dst)
+
+
+def _extract_batch(
+    zip_path: str, batch: List[Tuple[int, ExtractItem]], dry_run: bool
+) -> List[Tuple[int, ExtractResult]]:
+    """Worker: open a private ZipFile handle and extract one batch."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return [(i, _extract_one(zf, item, dry_run)) for i, item in batch]
+
+
+def balance_batches(items: Sequence[ExtractItem], count: int) -> List[List[Tuple[int, ExtractItem]]]:
+    """Split items into count batches of near-equal total size (largest first)."""
+    heap = [(0, b) for b in range(count)]
+    batches: List[List[Tuple[int, ExtractItem]]] = [[] for _ in range(count)]
+    for i in sorted(range(len(items)), key=lambda i: items[i].size, reverse=True):
+        load, b = heapq.heappop(heap)
+        batches[b].append((i, items[i]))
+        heapq.heappush(heap, (load + items[i].size, b))
+    return [batch for batch in batches if batch]
+
+
+def extract_members(
+    zf: zipfile.ZipFile, items: Sequence[ExtractItem], *, jobs: int, dry_run: bool
+) -> List[ExtractResult]:
+    """Extract items, returning results in input order.
+
+    With jobs > 1 each worker process opens its own handle on the archive
+    and writes directly to the destination; only results come back.
+    """
+    if jobs <= 1 or len(items) < 2 or not zf.filename:
+        return [_extract_one(zf, item, dry_run) for item in items]
+    results: List[Optional[ExtractResult]] = [None] * len(items)
+    batches = balance_batches(items, jobs)
+    with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+        futures = [pool.submit(_extract_batch, zf.filename, b, dry_run) for b in batches]
+        for future in futures:
+            for i, result in future.result():
+                results[i] = result
+    if not dry_run:
+        for item, result in zip(items, results):
+            if result and result[0]:
+                note_added(item.dst)
+    return results  # type: ignore[return-value]
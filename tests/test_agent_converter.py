@@ -1,7 +1,8 @@
 """Tests for agent .md → .toml conversion."""
 from pathlib import Path
 
-from claudekit_codex_sync.path_normalizer import convert_agents_md_to_toml
+from claudekit_codex_sync.agent_converter import convert_agent_md, normalize_agent_toml
+from claudekit_codex_sync.agent_sync import convert_agents_md_to_toml
 
 
 def test_converts_md_to_toml(tmp_path: Path):
@@ -40,3 +41,26 @@ def test_skips_md_without_frontmatter(tmp_path: Path):
     converted = convert_agents_md_to_toml(codex_home=tmp_path, dry_run=False)
     assert converted == 0
     assert (agents / "readme.md").exists()
+
+
+def test_convert_matches_normalized_legacy_output():
+    """Direct conversion already carries the TOML normalization rewrites."""
+    agent = convert_agent_md(
+        "---\nmodel: inherit\n---\nUse Task(researcher) in Claude Code; see $HOME/.claude/rules/",
+        "planner",
+    )
+    assert agent.model == ""
+    assert normalize_agent_toml(agent.text, "planner") == agent.text
+    assert "model =" not in agent.text
+    assert "the researcher agent in Codex CLI" in agent.text
+    assert "${CODEX_HOME:-$HOME/.codex}/rules/" in agent.text
+
+
+def test_commented_models_are_activated():
+    """Commented Claude model lines become Codex model settings in one regex pass."""
+    text = '# model = "haiku"\n# model = "inherit"\n# model = "custom"\nsandbox_mode = "workspace-write"\n'
+    result = normalize_agent_toml(text, "researcher")
+    assert 'model = "gpt-5.3-codex-spark"\nmodel_reasoning_effort = "medium"' in result
+    assert '# model = "custom"' in result
+    assert '"inherit"' not in result
+    assert 'sandbox_mode = "read-only"' in result
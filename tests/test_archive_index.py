@@ -0,0 +1,180 @@
+"""Tests for archive_index module."""
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from claudekit_codex_sync.archive_index import ArchiveIndex, ZipIndex, open_archive
+from claudekit_codex_sync.asset_sync_zip import sync_assets, unchanged_members
+from claudekit_codex_sync.skill_sync_zip import sync_skills
+from claudekit_codex_sync.tar_index import TarIndex
+from claudekit_codex_sync.utils import SyncError
+
+
+def _index(tmp_path: Path, names) -> ZipIndex:
+    zip_path = tmp_path / "kit.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for name in names:
+            zf.writestr(name, name)
+    return ZipIndex.build(zipfile.ZipFile(zip_path))
+
+
+def test_entries_are_classified(tmp_path: Path):
+    """Each .claude/ member lands in exactly one bucket."""
+    index = _index(
+        tmp_path,
+        [
+            ".claude/rules/r.md",
+            ".claude/.ck.json",
+            ".claude/hooks/h.sh",
+            ".claude/skills/foo/SKILL.md",
+            ".claude/skills/foo/scripts/a.py",
+            ".claude/skills/README.md",
+            ".claude/agents/a.md",
+            "README.md",
+        ],
+    )
+    assert sorted(index.assets) == [".ck.json", "rules/r.md"]
+    assert list(index.hooks) == ["hooks/h.sh"]
+    assert sorted(index.skills["foo"]) == ["SKILL.md", "scripts/a.py"]
+    assert index.ignored == 3
+    entry = index.skills["foo"]["SKILL.md"]
+    assert entry.stamp == zipfile.crc32(b".claude/skills/foo/SKILL.md")
+    assert entry.size == len(".claude/skills/foo/SKILL.md")
+
+
+def test_managed_assets_include_hooks_on_request(tmp_path: Path):
+    """Hooks are only managed when requested; results are sorted by path."""
+    index = _index(tmp_path, [".claude/scripts/s.py", ".claude/hooks/h.sh", ".claude/rules/r.md"])
+    assert [e.rel for e in index.managed_assets(include_hooks=False)] == ["rules/r.md", "scripts/s.py"]
+    assert [e.rel for e in index.managed_assets(include_hooks=True)] == [
+        "hooks/h.sh",
+        "rules/r.md",
+        "scripts/s.py",
+    ]
+
+
+@pytest.mark.parametrize("name", [".claude/skills/foo/../../x", ".claude//etc/passwd", ".claude/rules\\..\\x"])
+def test_unsafe_paths_are_rejected(tmp_path: Path, name: str):
+    """Traversal and absolute paths fail while indexing."""
+    with pytest.raises(SyncError, match="Unsafe archive entry path"):
+        _index(tmp_path, [name])
+
+
+def _make_tar(path: Path, files: dict, *, mode: str = "w:gz") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(path, mode) as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1_700_000_000
+            info.mode = 0o755 if name.endswith(".sh") else 0o644
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.mark.parametrize("suffix,mode", [(".tar.gz", "w:gz"), (".tar.xz", "w:xz"), (".tar", "w")])
+def test_tar_archives_sync_like_zip(tmp_path: Path, suffix: str, mode: str):
+    """Tar sources are indexed in one pass and extract the same tree as zip."""
+    files = {
+        "./.claude/rules/r.md": b"rule",
+        "./.claude/hooks/h.sh": b"echo",
+        "./.claude/skills/foo/SKILL.md": b"# foo",
+        "./README.md": b"ignored",
+    }
+    archive = _make_tar(tmp_path / f"kit{suffix}", files, mode=mode)
+    home = tmp_path / "codex"
+    for _ in range(2):
+        with open_archive(archive) as index:
+            assert isinstance(index, TarIndex)
+            assets = sync_assets(index, codex_home=home, include_hooks=True, dry_run=False)
+            skills = sync_skills(
+                index, codex_home=home, include_mcp=False, include_conflicts=False, dry_run=False
+            )
+    assert assets["added"] == assets["updated"] == 0
+    assert skills["total_skills"] == 1
+    assert (home / "skills" / "foo" / "SKILL.md").read_bytes() == b"# foo"
+    assert (home / "hooks" / "h.sh").stat().st_mode & 0o777 == 0o755
+    assert index.ignored == 1
+
+
+def test_archive_index_is_abstract():
+    """Readers must implement extract; the base class cannot be instantiated."""
+    with pytest.raises(TypeError):
+        ArchiveIndex()
+
+
+def test_tar_skips_spooling_unchanged_members(tmp_path: Path):
+    """Members the manifests mark unchanged are indexed but never decompressed."""
+    files = {".claude/rules/r.md": b"rule", ".claude/skills/foo/SKILL.md": b"# foo"}
+    archive = _make_tar(tmp_path / "kit.tar.gz", files)
+    home = tmp_path / "codex"
+    with open_archive(archive, skip=unchanged_members(home)) as index:
+        assert len(index._spans) == 2
+        sync_assets(index, codex_home=home, include_hooks=False, dry_run=False)
+        sync_skills(index, codex_home=home, include_mcp=False, include_conflicts=False, dry_run=False)
+
+    (home / "rules" / "r.md").write_bytes(b"edited")
+    with open_archive(archive, skip=unchanged_members(home)) as index:
+        assert list(index._spans) == [".claude/rules/r.md"]
+        assert index.skills["foo"]["SKILL.md"].size == len(b"# foo")
+        assets = sync_assets(index, codex_home=home, include_hooks=False, dry_run=False)
+    assert assets["updated"] == 1
+    assert (home / "rules" / "r.md").read_bytes() == b"rule"
+
+
+def test_tar_spools_skipped_member_on_demand(tmp_path: Path):
+    """A member skipped while indexing is still extracted if sync asks for it."""
+    archive = _make_tar(tmp_path / "kit.tar", {".claude/rules/r.md": b"rule"}, mode="w")
+    home = tmp_path / "codex"
+    with open_archive(archive, skip=lambda entry: True) as index:
+        assert not index._spans
+        assets = sync_assets(index, codex_home=home, include_hooks=False, dry_run=False)
+    assert assets["added"] == 1
+    assert (home / "rules" / "r.md").read_bytes() == b"rule"
+
+
+def test_tar_unsafe_path_rejected(tmp_path: Path):
+    """Tar members get the same traversal checks as zip members."""
+    archive = _make_tar(tmp_path / "kit.tar.gz", {".claude/skills/../../evil": b"x"})
+    with pytest.raises(SyncError, match="Unsafe archive entry path"):
+        open_archive(archive)
+
+
+def test_unsupported_archive_type(tmp_path: Path):
+    """Unknown suffixes are reported instead of guessed."""
+    path = tmp_path / "kit.rar"
+    path.write_bytes(b"")
+    with pytest.raises(SyncError, match="Unsupported archive type"):
+        open_archive(path)
+
+
+def test_zstd_tar_without_module_reports_dependency(tmp_path: Path, monkeypatch):
+    """.tar.zst needs an optional zstd module; its absence is a clear SyncError."""
+    import builtins
+
+    real_import = builtins.__import__
+
+    def _no_zstd(name, *args, **kwargs):
+        if name in ("zstandard", "compression"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", _no_zstd)
+    path = tmp_path / "kit.tar.zst"
+    path.write_bytes(b"\x28\xb5\x2f\xfd")
+    with pytest.raises(SyncError, match="zstandard"):
+        open_archive(path)
+
+
+def test_auto_discovery_matches_readable_suffixes(tmp_path: Path, monkeypatch):
+    """Every suffix open_archive reads is also found by archive auto-discovery."""
+    from claudekit_codex_sync import source_resolver
+    from claudekit_codex_sync.archive_index import ARCHIVE_SUFFIXES
+
+    assert source_resolver.EXPORT_PATTERNS == tuple(f"*{s}" for s in ARCHIVE_SUFFIXES)
+    export = _make_tar(tmp_path / "claudekit-export" / "kit.txz", {}, mode="w:xz")
+    monkeypatch.setattr(source_resolver.tempfile, "gettempdir", lambda: str(tmp_path))
+    assert source_resolver.find_latest_archive(None) == export.resolve()
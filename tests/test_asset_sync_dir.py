@@ -1,7 +1,8 @@
 """Tests for asset_sync_dir module."""
 from pathlib import Path
 
-from claudekit_codex_sync.asset_sync_dir import sync_assets_from_dir, sync_skills_from_dir
+from claudekit_codex_sync.asset_sync_dir import sync_assets_from_dir
+from claudekit_codex_sync.skill_sync_dir import sync_skills_from_dir
 
 
 def test_copies_asset_dirs(tmp_path: Path):
@@ -41,19 +42,74 @@ def test_idempotent_sync(tmp_path: Path):
     assert stats["updated"] == 0
 
 
-def test_copies_agents_md(tmp_path: Path):
-    """Copies agents/*.md to codex_home/agents/."""
+def test_converts_agents_md(tmp_path: Path):
+    """Converts agents/*.md straight to codex_home/agents/*.toml."""
     source = tmp_path / "source"
     codex = tmp_path / "codex"
     (source / "agents").mkdir(parents=True)
     (source / "agents" / "planner.md").write_text("---\nmodel: opus\n---\nTest agent")
+    (source / "agents" / "code-reviewer.md").write_text("---\nmodel: haiku\n---\nSee ~/.claude/x")
+    (source / "agents" / "README.md").write_text("# no frontmatter")
 
     stats = sync_assets_from_dir(
         source, codex_home=codex, include_hooks=False,
         dry_run=False, registry=None, force=True,
     )
-    assert stats["added"] >= 1
-    assert (codex / "agents" / "planner.md").exists()
+    assert stats["added"] == 3
+    assert not (codex / "agents" / "planner.md").exists()
+    assert 'model = "gpt-5.3-codex"' in (codex / "agents" / "planner.toml").read_text()
+    reviewer = (codex / "agents" / "code_reviewer.toml").read_text()
+    assert 'sandbox_mode = "read-only"' in reviewer
+    assert "~/.codex/x" in reviewer
+    assert (codex / "agents" / "README.md").exists()
+
+
+def test_unchanged_agents_are_not_rewritten(tmp_path: Path):
+    """A re-sync leaves converted agents untouched and normalize finds nothing to do."""
+    from claudekit_codex_sync.agent_sync import normalize_agent_tomls
+
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    (source / "agents").mkdir(parents=True)
+    (source / "agents" / "planner.md").write_text("---\nmodel: opus\n---\nUse Task(Explore)")
+    registry = {"entries": {}}
+    sync_assets_from_dir(
+        source, codex_home=codex, include_hooks=False,
+        dry_run=False, registry=registry, force=True,
+    )
+    toml = codex / "agents" / "planner.toml"
+    before = toml.stat()
+    assert normalize_agent_tomls(codex_home=codex, dry_run=False) == 0
+
+    stats = sync_assets_from_dir(
+        source, codex_home=codex, include_hooks=False,
+        dry_run=False, registry=registry, force=True,
+    )
+    assert stats["added"] == stats["updated"] == 0
+    assert (toml.stat().st_ino, toml.stat().st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+def test_model_mapping_change_reconverts_agents(tmp_path: Path, monkeypatch):
+    """Changing a model mapping invalidates the agent fast path."""
+    from claudekit_codex_sync import constants
+
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    (source / "agents").mkdir(parents=True)
+    (source / "agents" / "planner.md").write_text("---\nmodel: opus\n---\nPlan.")
+    registry = {"entries": {}}
+
+    def run():
+        return sync_assets_from_dir(
+            source, codex_home=codex, include_hooks=False,
+            dry_run=False, registry=registry, force=True,
+        )
+
+    run()
+    monkeypatch.setitem(constants.CLAUDE_TO_CODEX_MODELS, "opus", "gpt-next")
+    assert run()["updated"] == 1
+    assert 'model = "gpt-next"' in (codex / "agents" / "planner.toml").read_text()
+    assert run()["updated"] == 0
 
 
 def test_dry_run_no_write(tmp_path: Path):
@@ -101,3 +157,172 @@ def test_excludes_template_skill(tmp_path: Path):
     )
     assert stats["skipped"] == 1
     assert not (codex / "skills" / "template-skill").exists()
+
+
+def test_sync_skills_delta_only_touches_changed_files(tmp_path: Path):
+    """Re-sync writes changed files only and removes files gone from source."""
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    skill = source / "skills" / "test-skill"
+    (skill / "references").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# Test Skill")
+    (skill / "references" / "a.md").write_text("a")
+    (skill / "references" / "old.md").write_text("old")
+
+    sync_skills_from_dir(
+        source, codex_home=codex, include_mcp=False,
+        include_conflicts=False, dry_run=False,
+    )
+    dst = codex / "skills" / "test-skill"
+    untouched_ino = (dst / "SKILL.md").stat().st_ino
+    (skill / "references" / "a.md").write_text("a2")
+    (skill / "references" / "old.md").unlink()
+    (skill / "references" / "new.md").write_text("new")
+
+    stats = sync_skills_from_dir(
+        source, codex_home=codex, include_mcp=False,
+        include_conflicts=False, dry_run=False,
+    )
+    assert stats["added"] == 0
+    assert stats["updated"] == 1
+    assert (stats["files_added"], stats["files_updated"], stats["files_removed"]) == (1, 1, 1)
+    assert (dst / "SKILL.md").stat().st_ino == untouched_ino
+    assert (dst / "references" / "a.md").read_text() == "a2"
+    assert not (dst / "references" / "old.md").exists()
+
+
+def test_sync_skills_unchanged_reports_no_updates(tmp_path: Path):
+    """Unchanged skills are not counted as updated and keep runtime dirs."""
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    skill = source / "skills" / "test-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# Test Skill")
+
+    sync_skills_from_dir(
+        source, codex_home=codex, include_mcp=False,
+        include_conflicts=False, dry_run=False,
+    )
+    node_modules = codex / "skills" / "test-skill" / "node_modules" / "pkg"
+    node_modules.mkdir(parents=True)
+    (node_modules / "index.js").write_text("")
+
+    stats = sync_skills_from_dir(
+        source, codex_home=codex, include_mcp=False,
+        include_conflicts=False, dry_run=False,
+    )
+    assert stats["updated"] == 0
+    assert stats["files_removed"] == 0
+    assert (node_modules / "index.js").exists()
+
+
+def test_parallel_sync_matches_serial(tmp_path: Path):
+    """jobs > 1 yields the same counts and registry order as a serial run."""
+    source = tmp_path / "source"
+    (source / "rules").mkdir(parents=True)
+    (source / "scripts").mkdir()
+    for i in range(20):
+        (source / "rules" / f"r{i:02}.md").write_text(f"rule {i}")
+        (source / "scripts" / f"s{i:02}.py").write_text(f"print({i})")
+    for i in range(5):
+        skill = source / "skills" / f"skill-{i}"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(f"# {i}")
+
+    results = []
+    for jobs in (1, 4):
+        codex = tmp_path / f"codex-{jobs}"
+        registry = {"entries": {}}
+        assets = sync_assets_from_dir(
+            source, codex_home=codex, include_hooks=False,
+            dry_run=False, registry=registry, force=True, jobs=jobs,
+        )
+        skills = sync_skills_from_dir(
+            source, codex_home=codex, include_mcp=False,
+            include_conflicts=False, dry_run=False, jobs=jobs,
+        )
+        results.append((assets, skills, list(registry["entries"])))
+    assert results[0] == results[1]
+    assert results[0][0]["added"] == 40
+
+
+def test_markdown_is_normalized_on_copy(tmp_path: Path, capsys):
+    """SKILL.md and rule files land normalized; normalize_files then has nothing to do."""
+    from claudekit_codex_sync.path_normalizer import normalize_files
+
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    (source / "rules").mkdir(parents=True)
+    (source / "rules" / "r.md").write_text("see ~/.claude/rules/x.md")
+    skill = source / "skills" / "test-skill"
+    (skill / "references").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("run $HOME/.claude/skills/test-skill/run.py")
+    (skill / "references" / "a.md").write_text("~/.claude/ stays verbatim")
+
+    registry = {"entries": {}}
+    sync_assets_from_dir(
+        source, codex_home=codex, include_hooks=False,
+        dry_run=False, registry=registry, force=False,
+    )
+    sync_skills_from_dir(
+        source, codex_home=codex, include_mcp=False,
+        include_conflicts=False, dry_run=False, registry=registry,
+    )
+    assert ".claude" not in (codex / "rules" / "r.md").read_text()
+    assert ".claude" not in (codex / "skills" / "test-skill" / "SKILL.md").read_text()
+    assert (codex / "skills" / "test-skill" / "references" / "a.md").read_text() == "~/.claude/ stays verbatim"
+
+    capsys.readouterr()
+    normalize_files(codex_home=codex, include_mcp=False, dry_run=False)
+    assert "normalize:" not in capsys.readouterr().out
+
+    assets = sync_assets_from_dir(
+        source, codex_home=codex, include_hooks=False,
+        dry_run=False, registry=registry, force=False,
+    )
+    skills = sync_skills_from_dir(
+        source, codex_home=codex, include_mcp=False,
+        include_conflicts=False, dry_run=False, registry=registry,
+    )
+    assert assets["updated"] == assets["skipped"] == 0
+    assert skills["files_updated"] == 0
+    assert not (codex / ".ck-backups").exists()
+
+
+def test_rule_change_resyncs_normalized_files_without_false_edits(tmp_path: Path, monkeypatch, capsys):
+    """A new markdown rule re-syncs normalized files and keeps their registry entries current."""
+    from claudekit_codex_sync import path_normalizer
+    from claudekit_codex_sync.path_normalizer import normalize_files
+
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    (source / "rules").mkdir(parents=True)
+    (source / "rules" / "r.md").write_text("use Claude Desktop")
+    skill = source / "skills" / "s"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("use Claude Desktop")
+    registry = {"entries": {}}
+
+    def run():
+        assets = sync_assets_from_dir(
+            source, codex_home=codex, include_hooks=False,
+            dry_run=False, registry=registry, force=False,
+        )
+        skills = sync_skills_from_dir(
+            source, codex_home=codex, include_mcp=False,
+            include_conflicts=False, dry_run=False, registry=registry,
+        )
+        normalize_files(codex_home=codex, include_mcp=False, dry_run=False, registry=registry)
+        return assets, skills
+
+    run()
+    rules = path_normalizer.SKILL_MD_REPLACEMENTS + [("Claude Desktop", "Codex Desktop")]
+    monkeypatch.setattr(path_normalizer, "SKILL_MD_REPLACEMENTS", rules)
+    assets, skills = run()
+    assert (assets["updated"], assets["skipped"], skills["files_updated"]) == (1, 0, 1)
+    assert (codex / "rules" / "r.md").read_text() == "use Codex Desktop"
+    assert (codex / "skills" / "s" / "SKILL.md").read_text() == "use Codex Desktop"
+    for _ in range(2):
+        assets, skills = run()
+        assert (assets["updated"], assets["skipped"], skills["files_updated"]) == (0, 0, 0)
+    assert not (codex / ".ck-backups").exists()
@@ -0,0 +1,162 @@
+"""Tests for asset_sync_zip module."""
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from claudekit_codex_sync.archive_index import ZipIndex
+from claudekit_codex_sync.asset_sync_zip import sync_assets
+from claudekit_codex_sync.manifest_store import load_manifest, load_manifest_records
+from claudekit_codex_sync.skill_sync_zip import sync_skills
+from claudekit_codex_sync.zip_extract import ExtractItem, balance_batches
+
+
+def _make_zip(path: Path, files: dict) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _sync(zip_path: Path, home: Path):
+    with zipfile.ZipFile(zip_path) as zf:
+        index = ZipIndex.build(zf)
+        assets = sync_assets(index, codex_home=home, include_hooks=True, dry_run=False)
+        skills = sync_skills(
+            index, codex_home=home, include_mcp=False, include_conflicts=False, dry_run=False
+        )
+    return assets, skills
+
+
+@pytest.fixture
+def kit(tmp_path: Path) -> Path:
+    return _make_zip(
+        tmp_path / "kit.zip",
+        {
+            ".claude/rules/r.md": "rule",
+            ".claude/hooks/h.sh": "echo",
+            ".claude/skills/foo/SKILL.md": "# foo",
+            ".claude/skills/foo/scripts/a.py": "print(1)",
+        },
+    )
+
+
+def test_unchanged_members_are_not_decompressed(kit: Path, tmp_path: Path, monkeypatch):
+    """Re-applying the same zip matches CRC, size and target stat without opening members."""
+    home = tmp_path / "codex"
+    _sync(kit, home)
+
+    def _no_open(self, *args, **kwargs):
+        raise AssertionError("member decompressed")
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", _no_open)
+    assets, skills = _sync(kit, home)
+    assert assets["added"] == assets["updated"] == 0
+    assert skills["files_added"] == skills["files_updated"] == 0
+
+
+def test_edited_target_is_resynced(kit: Path, tmp_path: Path):
+    """A target whose stat changed is compared and rewritten."""
+    home = tmp_path / "codex"
+    _sync(kit, home)
+    (home / "hooks" / "h.sh").write_text("changed!")
+    (home / "skills" / "foo" / "scripts" / "a.py").write_text("print(2)")
+    assets, skills = _sync(kit, home)
+    assert assets["updated"] == 1
+    assert skills["files_updated"] == 1
+    assert (home / "hooks" / "h.sh").read_text() == "echo"
+
+
+def test_manifest_records_crc_and_target_stat(kit: Path, tmp_path: Path):
+    """Asset and skill manifests carry a record for every managed file."""
+    home = tmp_path / "codex"
+    _sync(kit, home)
+    assets = load_manifest_records(home / ".sync-manifest-assets.txt")
+    skills = load_manifest_records(home / ".sync-manifest-skills.txt")
+    assert set(assets) == {"hooks/h.sh", "rules/r.md"}
+    assert set(skills) == {"skills/foo/SKILL.md", "skills/foo/scripts/a.py"}
+    record = assets["hooks/h.sh"]
+    assert record["sourceStat"] == [zipfile.crc32(b"echo"), 4]
+    assert record["targetStat"][0] == 4
+
+
+def test_legacy_manifest_is_upgraded(kit: Path, tmp_path: Path):
+    """A bare-path manifest from older versions still drives removals."""
+    home = tmp_path / "codex"
+    home.mkdir()
+    (home / "rules").mkdir()
+    (home / "rules" / "old.md").write_text("stale")
+    (home / ".sync-manifest-assets.txt").write_text("rules/old.md\n")
+    assets, _ = _sync(kit, home)
+    assert assets["removed"] == 1
+    assert not (home / "rules" / "old.md").exists()
+    assert load_manifest(home / ".sync-manifest-assets.txt") == {"hooks/h.sh", "rules/r.md"}
+
+
+def test_balance_batches_spreads_bytes():
+    """Largest-first assignment keeps batch totals close."""
+    items = [ExtractItem(f"m{i}", Path(f"m{i}"), size, None) for i, size in enumerate([8, 7, 6, 5, 4, 3])]
+    batches = balance_batches(items, 3)
+    totals = sorted(sum(item.size for _, item in batch) for batch in batches)
+    assert totals == [11, 11, 11]
+    assert sorted(i for batch in batches for i, _ in batch) == list(range(6))
+
+
+def test_parallel_extraction_matches_serial(tmp_path: Path):
+    """Process-pool extraction yields the same tree and stats as serial."""
+    files = {f".claude/skills/s{i}/SKILL.md": f"# s{i}\n" * (i + 1) for i in range(6)}
+    files.update({f".claude/rules/r{i}.md": "rule" * i for i in range(4)})
+    zip_path = _make_zip(tmp_path / "kit.zip", files)
+    outputs = []
+    for jobs in (1, 3):
+        home = tmp_path / f"codex{jobs}"
+        with zipfile.ZipFile(zip_path) as zf:
+            index = ZipIndex.build(zf)
+            assets = sync_assets(index, codex_home=home, include_hooks=True, dry_run=False, jobs=jobs)
+            skills = sync_skills(
+                index, codex_home=home, include_mcp=False, include_conflicts=False, dry_run=False, jobs=jobs
+            )
+        tree = {p.relative_to(home).as_posix(): p.read_bytes() for p in home.rglob("*") if p.is_file()}
+        tree.pop(".sync-manifest-assets.txt")
+        tree.pop(".sync-manifest-skills.txt")
+        outputs.append((assets, skills, tree))
+    assert outputs[0] == outputs[1]
+
+
+def test_removal_prunes_only_emptied_parents(tmp_path: Path, monkeypatch):
+    """Dropping a file removes its now-empty dirs; unrelated empty dirs are left alone."""
+    home = tmp_path / "codex"
+    first = _make_zip(tmp_path / "one.zip", {".claude/rules/deep/nested/r.md": "rule"})
+    _sync(first, home)
+    (home / "skills" / "node_modules" / "empty").mkdir(parents=True)
+
+    def _no_rglob(self, pattern):
+        raise AssertionError("whole-tree walk")
+
+    second = _make_zip(tmp_path / "two.zip", {".claude/rules/keep.md": "rule"})
+    monkeypatch.setattr(Path, "rglob", _no_rglob)
+    assets, _ = _sync(second, home)
+    assert assets["removed"] == 1
+    assert not (home / "rules" / "deep").exists()
+    assert (home / "rules" / "keep.md").exists()
+    assert (home / "skills" / "node_modules" / "empty").is_dir()
+
+
+def test_zip_markdown_is_normalized_on_extract(tmp_path: Path):
+    """Archive SKILL.md and rules are written normalized and stay unchanged on re-sync."""
+    zip_path = _make_zip(
+        tmp_path / "kit.zip",
+        {
+            ".claude/rules/r.md": "see ~/.claude/rules/x.md",
+            ".claude/skills/foo/SKILL.md": "run $HOME/.claude/skills/foo/run.py",
+            ".claude/skills/foo/notes.md": "~/.claude/",
+        },
+    )
+    home = tmp_path / "codex"
+    _sync(zip_path, home)
+    assert ".claude" not in (home / "rules" / "r.md").read_text()
+    assert ".claude" not in (home / "skills" / "foo" / "SKILL.md").read_text()
+    assert (home / "skills" / "foo" / "notes.md").read_text() == "~/.claude/"
+
+    assets, skills = _sync(zip_path, home)
+    assert assets["updated"] == skills["files_updated"] == 0
@@ -0,0 +1,68 @@
+"""Tests for backup_store module."""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from claudekit_codex_sync.backup_store import (
+    BACKUP_DIR,
+    gc_backups,
+    list_backups,
+    restore_backup,
+    store_backup,
+)
+
+
+def _objects(codex: Path):
+    return sorted((codex / BACKUP_DIR / "objects").glob("*/*"))
+
+
+def test_identical_backups_share_one_object(tmp_path: Path):
+    """Same content stores one object; a repeat backup of a path adds no record."""
+    target = tmp_path / "rules" / "a.md"
+    target.parent.mkdir()
+    target.write_text("edited")
+    store_backup(tmp_path, "rules/a.md", target)
+    store_backup(tmp_path, "rules/a.md", target)
+    store_backup(tmp_path, "rules/b.md", target)
+    assert len(_objects(tmp_path)) == 1
+    assert [r["path"] for r in list_backups(tmp_path)] == ["rules/a.md", "rules/b.md"]
+    assert not list(tmp_path.glob("rules/*.ck-backup-*"))
+
+
+def test_gc_leaves_index_alone_when_nothing_expires(tmp_path: Path):
+    """gc without removals does not rewrite index.jsonl."""
+    target = tmp_path / "a.md"
+    target.write_text("edited")
+    store_backup(tmp_path, "a.md", target)
+    index = tmp_path / BACKUP_DIR / "index.jsonl"
+    before = index.stat().st_ino, index.stat().st_mtime_ns
+    assert gc_backups(tmp_path) == (0, 0)
+    assert (index.stat().st_ino, index.stat().st_mtime_ns) == before
+
+
+def test_restore_newest(tmp_path: Path):
+    """restore_backup writes the newest backed-up content back."""
+    target = tmp_path / "a.md"
+    target.write_text("v1")
+    store_backup(tmp_path, "a.md", target)
+    target.write_text("v2")
+    store_backup(tmp_path, "a.md", target)
+    target.write_text("synced")
+    assert restore_backup(tmp_path, "a.md") is not None
+    assert target.read_text() == "v2"
+    assert restore_backup(tmp_path, "missing.md") is None
+
+
+def test_gc_applies_count_and_age(tmp_path: Path):
+    """gc keeps the newest N per path, drops old ones and unreferenced objects."""
+    target = tmp_path / "a.md"
+    for i in range(4):
+        target.write_text(f"v{i}")
+        store_backup(tmp_path, "a.md", target)
+    records, objects = gc_backups(tmp_path, keep=2)
+    assert (records, objects) == (2, 2)
+    assert {r["hash"] for r in list_backups(tmp_path)} == {o.name for o in _objects(tmp_path)}
+
+    later = datetime.now(timezone.utc) + timedelta(days=60)
+    records, _ = gc_backups(tmp_path, keep=2, max_age_days=30, now=later)
+    assert records == 1
+    assert len(list_backups(tmp_path)) == 1
@@ -55,3 +55,22 @@ def test_mcp_flag():
     with patch.object(sys, "argv", ["ckc-sync", "--mcp"]):
         args = parse_args()
     assert args.mcp
+
+
+def test_jobs_flag():
+    """'-j' sets worker count and defaults to 1."""
+    with patch.object(sys, "argv", ["ckc-sync", "-j", "8"]):
+        args = parse_args()
+    assert args.jobs == 8
+    with patch.object(sys, "argv", ["ckc-sync"]):
+        args = parse_args()
+    assert args.jobs == 1
+
+
+def test_registry_compact_command():
+    """'registry compact' selects the registry maintenance command."""
+    with patch.object(sys, "argv", ["ckc-sync", "-g", "registry", "compact"]):
+        args = parse_args()
+    assert args.command == "registry"
+    assert args.action == "compact"
+    assert args.global_scope
@@ -1,14 +1,28 @@
 """Tests for config_enforcer module."""
 
+import tomllib
+
 import pytest
-from claudekit_codex_sync.config_enforcer import enforce_multi_agent_flag
+from claudekit_codex_sync.config_enforcer import (
+    apply_agent_roles,
+    apply_config_defaults,
+    apply_multi_agent_flag,
+    load_config,
+    save_config,
+)
+
+
+def _enforce_multi_agent(config_path):
+    doc = load_config(config_path)
+    apply_multi_agent_flag(doc)
+    return save_config(doc, config_path, dry_run=False)
 
 
 def test_adds_multi_agent_to_existing_features(tmp_path):
     """Test adding multi_agent to existing [features] section."""
     config = tmp_path / "config.toml"
     config.write_text("[features]\n")
-    enforce_multi_agent_flag(config, dry_run=False)
+    _enforce_multi_agent(config)
     content = config.read_text()
     assert "multi_agent = true" in content
 
@@ -17,7 +31,7 @@ def test_creates_features_section_if_missing(tmp_path):
     """Test creating [features] section if it doesn't exist."""
     config = tmp_path / "config.toml"
     config.write_text("some_other_setting = 1\n")
-    enforce_multi_agent_flag(config, dry_run=False)
+    _enforce_multi_agent(config)
     content = config.read_text()
     assert "[features]" in content
     assert "multi_agent = true" in content
@@ -28,7 +42,7 @@ def test_preserves_existing_config(tmp_path):
     config = tmp_path / "config.toml"
     original = 'project_doc_max_bytes = 65536\n'
     config.write_text(original)
-    enforce_multi_agent_flag(config, dry_run=False)
+    _enforce_multi_agent(config)
     content = config.read_text()
     assert "project_doc_max_bytes = 65536" in content
     assert "multi_agent = true" in content
@@ -37,8 +51,57 @@ def test_preserves_existing_config(tmp_path):
 def test_creates_file_if_not_exists(tmp_path):
     """Test creating config file if it doesn't exist."""
     config = tmp_path / "config.toml"
-    enforce_multi_agent_flag(config, dry_run=False)
+    _enforce_multi_agent(config)
     assert config.exists()
     content = config.read_text()
     assert "[features]" in content
     assert "multi_agent = true" in content
+
+
+def _pipeline(codex_home, include_mcp=False):
+    config_path = codex_home / "config.toml"
+    doc = load_config(config_path)
+    apply_config_defaults(doc, codex_home=codex_home, include_mcp=include_mcp)
+    apply_multi_agent_flag(doc)
+    apply_agent_roles(doc, codex_home=codex_home)
+    return save_config(doc, config_path, dry_run=False)
+
+
+def test_single_pass_is_idempotent_and_keeps_user_lines(tmp_path):
+    """All steps edit one document; a second run writes nothing and comments survive."""
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    (agents / "planner.toml").write_text('developer_instructions = """\nPlan the work. Then stop.\n"""\n')
+    config = tmp_path / "config.toml"
+    config.write_text('# mine\nmodel = "o3"\n\n[features]\nmulti_agent = false  # off on purpose\n')
+
+    assert _pipeline(tmp_path)
+    text = config.read_text()
+    data = tomllib.loads(text)
+    assert text.startswith('# mine\nmodel = "o3"\n')
+    assert "multi_agent = false  # off on purpose" in text
+    assert data["features"]["child_agents_md"] is True
+    assert data["project_doc_max_bytes"] == 65536
+    assert data["agents"]["planner"] == {
+        "description": "Plan the work.",
+        "config_file": "agents/planner.toml",
+    }
+    assert [s["enabled"] for s in data["skills"]["config"]] == [False, False]
+
+    mtime = config.stat().st_mtime_ns
+    assert not _pipeline(tmp_path)
+    assert config.stat().st_mtime_ns == mtime
+
+
+def test_mcp_entries_are_updated_in_place(tmp_path):
+    """Existing MCP skill entries are toggled in place and duplicates dropped."""
+    path = str((tmp_path / "skills" / "mcp-builder").resolve())
+    config = tmp_path / "config.toml"
+    entry = f'[[skills.config]]\npath = "{path}"\nenabled = false\n'
+    config.write_text(entry + "\n[other]\nx = 1\n\n" + entry)
+
+    _pipeline(tmp_path, include_mcp=True)
+    data = tomllib.loads(config.read_text())
+    assert [s["enabled"] for s in data["skills"]["config"]] == [True, True]
+    assert [s["path"] for s in data["skills"]["config"]].count(path) == 1
+    assert config.read_text().index("[other]") > config.read_text().index(path)
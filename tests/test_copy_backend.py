@@ -0,0 +1,105 @@
+"""Tests for copy_backend module."""
+import errno
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from claudekit_codex_sync import copy_backend
+from claudekit_codex_sync.copy_backend import (
+    COPY_BACKENDS,
+    copy_file,
+    copy_file_if_changed,
+    copy_stats,
+    set_copy_backend,
+)
+from claudekit_codex_sync.tree_delta import collect_dir_sources
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    yield
+    set_copy_backend("auto")
+
+
+@pytest.mark.parametrize("backend", COPY_BACKENDS)
+def test_every_backend_copies_content(tmp_path: Path, backend: str):
+    """Each selectable backend (or its fallback) materializes identical bytes."""
+    set_copy_backend(backend)
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"x" * 100_000)
+    dst = tmp_path / "out" / "dst.bin"
+    copy_file(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_hardlink_only_when_allowed(tmp_path: Path):
+    """Hardlink backend falls back to a real copy unless link_ok is set."""
+    set_copy_backend("hardlink")
+    src = tmp_path / "src.txt"
+    src.write_text("data")
+    copy_file(src, tmp_path / "copy.txt")
+    copy_file(src, tmp_path / "link.txt", link_ok=True)
+    assert (tmp_path / "copy.txt").stat().st_ino != src.stat().st_ino
+    assert (tmp_path / "link.txt").stat().st_ino == src.stat().st_ino
+
+
+def test_copy_if_changed_is_idempotent(tmp_path: Path):
+    """Second copy of identical content reports no change."""
+    src = tmp_path / "src.txt"
+    src.write_text("same")
+    dst = tmp_path / "dst.txt"
+    assert copy_file_if_changed(src, dst, mode=None, dry_run=False) == (True, True)
+    assert copy_file_if_changed(src, dst, mode=None, dry_run=False) == (False, False)
+    src.write_text("diff")
+    assert copy_file_if_changed(src, dst, mode=None, dry_run=False) == (True, False)
+    assert dst.read_text() == "diff"
+
+
+def test_short_kernel_copy_falls_back(tmp_path: Path, monkeypatch):
+    """A kernel copy that stops early is rejected instead of renamed over dst."""
+    set_copy_backend("copy_file_range")
+    monkeypatch.setattr(copy_backend.os, "copy_file_range", lambda src, dst, n: 0, raising=False)
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"y" * 4096)
+    dst = tmp_path / "dst.bin"
+    assert copy_file(src, dst) == "copy"
+    assert dst.read_bytes() == src.read_bytes()
+    assert copy_stats() == {"copy": 1}
+
+
+def test_only_read_only_skill_files_may_be_linked(tmp_path: Path):
+    """Editable files (scripts) are never hardlinked; read-only non-markdown files may be."""
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "run.py").write_text("print()")
+    (tmp_path / "data.json").write_text("{}")
+    (tmp_path / "data.json").chmod(0o444)
+    (tmp_path / "SKILL.md").write_text("x")
+    (tmp_path / "SKILL.md").chmod(0o444)
+    sources = collect_dir_sources(tmp_path)
+    assert {rel: src.link_ok for rel, src in sources.items()} == {
+        "scripts/run.py": False,
+        "data.json": True,
+        "SKILL.md": False,
+    }
+
+
+def test_concurrent_fallbacks_share_unsupported_cache(tmp_path: Path, monkeypatch):
+    """Worker threads marking backends unsupported never race on the cache."""
+    real = copy_backend._try_backend
+
+    def flaky(name, src, tmp, size):
+        if name != "copy":
+            raise OSError(errno.EOPNOTSUPP, name)
+        real(name, src, tmp, size)
+
+    monkeypatch.setattr(copy_backend, "_try_backend", flaky)
+    src = tmp_path / "src.txt"
+    src.write_text("data")
+    dsts = [tmp_path / "out" / f"{i}.txt" for i in range(64)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        used = list(pool.map(lambda dst: copy_file(src, dst), dsts))
+    assert set(used) == {"copy"}
+    assert all(dst.read_text() == "data" for dst in dsts)
+    (failed,) = copy_backend._unsupported.values()
+    assert failed == {"reflink", "copy_file_range", "sendfile"}
@@ -0,0 +1,200 @@
+"""Tests for dep_bootstrapper module."""
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from claudekit_codex_sync import dep_bootstrapper, installer_backend, node_deps
+from claudekit_codex_sync.cli_report import log_bootstrap
+from claudekit_codex_sync.deps_fingerprint import DepsFingerprints
+from claudekit_codex_sync.installer_backend import PipInstaller
+from claudekit_codex_sync.requirements_merge import merge_requirements
+
+
+def _skills(home: Path, names):
+    for name in names:
+        pkg = home / "skills" / name
+        pkg.mkdir(parents=True)
+        (pkg / "package.json").write_text("{}")
+
+
+def _fake_npm(monkeypatch, *, fail=(), delay=0.0):
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def run_cmd(cmd, *, dry_run=False, check=True, capture=False, cwd=None):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(delay)
+        with lock:
+            state["active"] -= 1
+        code = 1 if Path(cmd[-1]).name in fail else 0
+        return subprocess.CompletedProcess(cmd, code, "npm out\n", "npm ERR! boom\n" if code else "")
+
+    monkeypatch.setattr(node_deps.shutil, "which", lambda name: "/usr/bin/npm")
+    monkeypatch.setattr(node_deps, "run_cmd", run_cmd)
+    return state
+
+
+def _install_node_deps(home: Path, **kwargs):
+    report = node_deps.install_node_deps(codex_home=home, include_mcp=False, dry_run=False, **kwargs)
+    return report.ok, report.failed, report.skipped
+
+
+def test_npm_installs_run_concurrently(tmp_path, monkeypatch):
+    """Installs overlap up to the limit and all are counted."""
+    _skills(tmp_path, [f"s{i}" for i in range(6)])
+    state = _fake_npm(monkeypatch, delay=0.05)
+    assert _install_node_deps(tmp_path, jobs=3) == (6, 0, 0)
+    assert state["peak"] == 3
+
+
+def test_failed_install_does_not_block_others(tmp_path, monkeypatch, capsys):
+    """A failing package is reported with its exit code and captured output."""
+    _skills(tmp_path, ["a", "b", "c", "mcp-builder"])
+    _fake_npm(monkeypatch, fail={"b"})
+    report = node_deps.install_node_deps(
+        codex_home=tmp_path, include_mcp=False, dry_run=False, jobs=2
+    )
+    assert [(r.package, r.returncode) for r in report.installs] == [
+        ("skills/a", 0), ("skills/b", 1), ("skills/c", 0)
+    ]
+    stats = dict.fromkeys(("python_ok", "python_fail", "python_skipped"), 0)
+    stats.update(node=report, node_ok=report.ok, node_fail=report.failed, node_skipped=report.skipped)
+    assert log_bootstrap(stats, codex_home=tmp_path)
+    out, err = capsys.readouterr()
+    assert "npm: skills/a (" in out and "npm: 2 ok, 1 failed, 0 skipped" in out
+    assert "npm: skills/b exit 1" in err and "npm ERR! boom" in err
+
+
+def _fake_pip(monkeypatch, calls, *, freeze="click==8.1.7\n"):
+    def run_cmd(cmd, *, dry_run=False, check=True, capture=False, cwd=None):
+        calls.append(list(cmd))
+        return subprocess.CompletedProcess(cmd, 0, freeze if "freeze" in cmd else "", "")
+
+    monkeypatch.setattr(installer_backend, "run_cmd", run_cmd)
+
+
+def _requirements(home: Path, specs):
+    files = []
+    for name, text in specs.items():
+        req = home / "skills" / name / "requirements.txt"
+        req.parent.mkdir(parents=True)
+        req.write_text(text)
+        files.append(req)
+    return files
+
+
+def test_python_requirements_install_in_one_pass(tmp_path, monkeypatch):
+    """All requirements files go through a single pip run and a lock is written."""
+    files = _requirements(tmp_path, {"a": "click>=8\n", "b": "click<9\nrich\n"})
+    calls = []
+    _fake_pip(monkeypatch, calls)
+    merged = merge_requirements(files, root=tmp_path)
+    ok, fail, seconds = installer_backend.install_merged(
+        PipInstaller(Path("venv")), merged, codex_home=tmp_path, dry_run=False
+    )
+    assert (ok, fail) == (2, 0) and seconds >= 0
+    deps = tmp_path / "skills" / installer_backend.DEPS_DIR
+    merged_path = deps / installer_backend.MERGED_REQUIREMENTS
+    assert calls[0] == ["venv/bin/python3", "-m", "pip", "install", "-r", str(merged_path)]
+    assert len(calls) == 2
+    assert (deps / installer_backend.PIP_LOCK).read_text() == "click==8.1.7\n"
+
+
+def test_python_conflicts_skip_install(tmp_path, monkeypatch, capsys):
+    """Conflicting pins are reported up front and pip never runs."""
+    files = _requirements(tmp_path, {"a": "click==7.0\n", "b": "click==8.1.7\n"})
+    calls = []
+    _fake_pip(monkeypatch, calls)
+    merged = merge_requirements(files, root=tmp_path)
+    ok, fail, _ = installer_backend.install_merged(
+        PipInstaller(Path("venv")), merged, codex_home=tmp_path, dry_run=False
+    )
+    assert (ok, fail) == (0, 2)
+    assert calls == []
+    assert "pip conflict: click" in capsys.readouterr().err
+
+
+def test_unchanged_node_packages_are_skipped(tmp_path, monkeypatch):
+    """A matching fingerprint with node_modules present skips npm; refresh forces it."""
+    _skills(tmp_path, ["a", "b"])
+    _fake_npm(monkeypatch)
+    registry = {}
+
+    def run(refresh=False):
+        fingerprints = DepsFingerprints(registry, refresh=refresh)
+        counts = _install_node_deps(tmp_path, fingerprints=fingerprints)
+        fingerprints.save(dry_run=False)
+        return counts
+
+    assert run() == (2, 0, 0)
+    assert run() == (2, 0, 0)  # no node_modules yet: the environment is not satisfied
+    for name in ("a", "b"):
+        (tmp_path / "skills" / name / "node_modules").mkdir()
+    assert run() == (0, 0, 2)
+    (tmp_path / "skills" / "b" / "package-lock.json").write_text("{}")
+    assert run() == (1, 0, 1)
+    assert run(refresh=True) == (2, 0, 0)
+    assert sorted(registry["deps"]) == ["node:skills/a", "node:skills/b"]
+
+
+def test_unchanged_python_requirements_skip_venv_and_pip(tmp_path, monkeypatch):
+    """A second bootstrap with the same requirements runs no commands at all."""
+    _requirements(tmp_path, {"a": "click>=8\n"})
+    venv = tmp_path / "skills" / ".venv"
+    (venv / "bin").mkdir(parents=True)
+    (venv / "bin" / "python3").write_text("")
+    (venv / "pyvenv.cfg").write_text("version = 3.11.9\n")
+    dist_info = venv / "lib" / "python3.11" / "site-packages" / "click-8.1.7.dist-info"
+    dist_info.mkdir(parents=True)
+    monkeypatch.setattr(dep_bootstrapper, "_try_symlink_venv", lambda home, dry_run: False)
+    monkeypatch.setattr(
+        installer_backend.shutil, "which", lambda name: "/usr/bin/python3" if name == "python3" else None
+    )
+    calls = []
+    _fake_pip(monkeypatch, calls)
+    registry = {}
+
+    def run(**kwargs):
+        calls.clear()
+        return dep_bootstrapper.bootstrap_deps(
+            codex_home=tmp_path, include_mcp=False, dry_run=False, registry=registry, **kwargs
+        )
+
+    stats = run()
+    assert (stats["python_ok"], stats["python_installer"]) == (1, "pip")
+    assert len(calls) == 4  # venv, pip upgrade, install, freeze
+    stats = run()
+    assert (stats["python_ok"], stats["python_skipped"], calls) == (0, 1, [])
+    dist_info.rmdir()  # package removed from the venv behind our back
+    assert run()["python_ok"] == 1
+    dist_info.mkdir()
+    assert run()["python_skipped"] == 1
+    (venv / "pyvenv.cfg").write_text("version = 3.12.1\n")
+    assert run()["python_ok"] == 1
+    assert run(refresh=True)["python_ok"] == 1
+
+
+def test_node_skip_requires_declared_dependencies(tmp_path, monkeypatch, capsys):
+    """node_modules missing a package.json dependency is reinstalled; installs print nothing."""
+    _skills(tmp_path, ["a"])
+    pkg = tmp_path / "skills" / "a"
+    (pkg / "package.json").write_text('{"dependencies": {"left-pad": "^1.3.0"}}')
+    (pkg / "node_modules").mkdir()
+    _fake_npm(monkeypatch)
+    registry = {}
+
+    def run():
+        fingerprints = DepsFingerprints(registry)
+        counts = _install_node_deps(tmp_path, fingerprints=fingerprints)
+        fingerprints.save(dry_run=False)
+        return counts
+
+    assert run() == (1, 0, 0)
+    assert run() == (1, 0, 0)  # fake npm created nothing: still incomplete
+    (pkg / "node_modules" / "left-pad").mkdir()
+    (pkg / "node_modules" / "left-pad" / "package.json").write_text("{}")
+    assert run() == (0, 0, 1)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,36 @@
+"""Tests for fs_index module."""
+from pathlib import Path
+
+from claudekit_codex_sync.fs_index import FsIndex, activate_index, deactivate_index, get_index
+from claudekit_codex_sync.utils import write_text_if_changed
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x")
+
+
+def test_build_prunes_runtime_dirs(tmp_path: Path):
+    """Files under node_modules and .venv are never indexed."""
+    _touch(tmp_path / "skills" / "a" / "SKILL.md")
+    _touch(tmp_path / "skills" / "a" / "node_modules" / "p" / "SKILL.md")
+    _touch(tmp_path / "skills" / ".venv" / "lib" / "requirements.txt")
+    _touch(tmp_path / "skills" / "a" / "requirements-dev.txt")
+    index = FsIndex.build(tmp_path)
+    assert index.files("skills/", "SKILL.md") == [tmp_path / "skills" / "a" / "SKILL.md"]
+    assert index.files("skills/", "requirements*.txt") == [
+        tmp_path / "skills" / "a" / "requirements-dev.txt"
+    ]
+
+
+def test_active_index_tracks_writes(tmp_path: Path):
+    """Writers keep the active index current without another walk."""
+    index = activate_index(tmp_path)
+    try:
+        write_text_if_changed(tmp_path / "rules" / "a.md", "# a")
+        assert get_index(tmp_path) is index
+        assert index.files("rules/", "*.md") == [tmp_path / "rules" / "a.md"]
+        index.discard(tmp_path / "rules" / "a.md")
+        assert index.files("rules/", "*.md") == []
+    finally:
+        deactivate_index()
@@ -0,0 +1,42 @@
+"""Tests for hash_cache module."""
+from pathlib import Path
+
+from claudekit_codex_sync.asset_sync_dir import sync_assets_from_dir
+from claudekit_codex_sync.hash_cache import cached_hash, hash_cache_stats, reset_hash_cache
+
+
+def test_cached_hash_reads_once(tmp_path: Path):
+    """Repeated lookups of an unchanged file are cache hits."""
+    reset_hash_cache()
+    f = tmp_path / "a.txt"
+    f.write_text("hello")
+    first = cached_hash(f)
+    assert cached_hash(f) == first
+    assert hash_cache_stats() == {"hits": 1, "misses": 1}
+
+
+def test_changed_file_is_rehashed(tmp_path: Path):
+    """A rewrite changes the identity key, so the digest is recomputed."""
+    reset_hash_cache()
+    f = tmp_path / "a.txt"
+    f.write_text("hello")
+    first = cached_hash(f)
+    f.write_text("hello world")
+    assert cached_hash(f) != first
+    assert hash_cache_stats()["misses"] == 2
+
+
+def test_asset_sync_hashes_each_file_once(tmp_path: Path):
+    """Copy + registry entry reuse one digest per file."""
+    reset_hash_cache()
+    source = tmp_path / "source"
+    (source / "rules").mkdir(parents=True)
+    (source / "rules" / "a.md").write_text("# a")
+    registry = {"entries": {}}
+    sync_assets_from_dir(
+        source, codex_home=tmp_path / "codex", include_hooks=False,
+        dry_run=False, registry=registry, force=True,
+    )
+    assert hash_cache_stats()["misses"] == 1
+    entry = registry["entries"]["rules/a.md"]
+    assert entry["sourceHash"] == entry["targetHash"]
@@ -0,0 +1,65 @@
+"""Tests for installer_backend module."""
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from claudekit_codex_sync import installer_backend
+from claudekit_codex_sync.installer_backend import (
+    PipInstaller,
+    UvInstaller,
+    WheelhouseInstaller,
+    select_installer,
+)
+from claudekit_codex_sync.utils import SyncError
+
+
+def _which(monkeypatch, *tools):
+    monkeypatch.setattr(
+        installer_backend.shutil, "which", lambda name: f"/usr/bin/{name}" if name in tools else None
+    )
+
+
+def test_auto_prefers_uv_when_on_path(tmp_path: Path, monkeypatch):
+    """auto resolves to uv if present, else pip; explicit uv without uv fails."""
+    _which(monkeypatch, "python3", "uv")
+    assert isinstance(select_installer("auto", tmp_path / ".venv"), UvInstaller)
+    _which(monkeypatch, "python3")
+    assert type(select_installer("auto", tmp_path / ".venv")) is PipInstaller
+    with pytest.raises(SyncError, match="uv not found"):
+        select_installer("uv", tmp_path / ".venv")
+
+
+def test_wheelhouse_installs_offline(tmp_path: Path):
+    """The wheelhouse backend needs a populated directory and never hits an index."""
+    wheels = tmp_path / "wheels"
+    with pytest.raises(SyncError, match="requires --wheelhouse"):
+        select_installer("wheelhouse", tmp_path / ".venv")
+    with pytest.raises(SyncError, match="empty or missing"):
+        select_installer("wheelhouse", tmp_path / ".venv", wheelhouse=wheels)
+    wheels.mkdir()
+    (wheels / "click-8.1.7-py3-none-any.whl").write_bytes(b"")
+    installer = select_installer("wheelhouse", tmp_path / ".venv", wheelhouse=wheels)
+    assert isinstance(installer, WheelhouseInstaller)
+    cmd = installer.install_cmd(Path("reqs.txt"))
+    assert cmd[cmd.index("--find-links") + 1] == str(wheels)
+    assert "--no-index" in cmd
+
+
+def test_uv_creates_seeded_venv_and_installs(tmp_path: Path, monkeypatch):
+    """uv builds the venv and installs into it; pip-based steps still work."""
+    calls = []
+    monkeypatch.setattr(
+        installer_backend,
+        "run_cmd",
+        lambda cmd, **kw: calls.append(cmd) or subprocess.CompletedProcess(cmd, 0, "", ""),
+    )
+    venv = tmp_path / ".venv"
+    installer = UvInstaller(venv, "/usr/bin/uv")
+    installer.create_venv(dry_run=False)
+    installer.install(Path("reqs.txt"), dry_run=False)
+    installer.populate_wheelhouse(Path("reqs.txt"), tmp_path / "wheels", dry_run=False)
+    assert calls[0] == ["/usr/bin/uv", "venv", "--seed", "--allow-existing", str(venv)]
+    assert calls[1][:4] == ["/usr/bin/uv", "pip", "install", "--python"]
+    assert calls[2][1:4] == ["-m", "pip", "wheel"]
+    assert (tmp_path / "wheels").is_dir()
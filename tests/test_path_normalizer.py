@@ -1,8 +1,16 @@
 """Tests for path_normalizer module."""
 
+from pathlib import Path
+
 import pytest
+from claudekit_codex_sync import path_normalizer
+from claudekit_codex_sync.agent_sync import normalize_agent_tomls
 from claudekit_codex_sync.constants import SKILL_MD_REPLACEMENTS
-from claudekit_codex_sync.path_normalizer import apply_replacements
+from claudekit_codex_sync.normalize_state import rules_version
+from claudekit_codex_sync.path_normalizer import (
+    apply_replacements,
+    normalize_files,
+)
 
 
 def test_claude_to_codex_path():
@@ -59,3 +67,126 @@ def test_multiple_replacements():
     assert "$HOME/.claude/skills/" not in result
     assert "./.claude/scripts/" not in result
     assert "~/.claude/.ck.json" not in result
+
+
+def _kit(home):
+    skill = home / "skills" / "foo"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("run $HOME/.claude/skills/foo/run.py")
+    (home / "rules").mkdir()
+    (home / "rules" / "r.md").write_text("plain rule")
+    (home / "agents").mkdir()
+    (home / "agents" / "planner.toml").write_text('sandbox_mode = "workspace-write"\n# see ~/.claude/x\n')
+
+
+def _normalize(home, registry):
+    md = normalize_files(codex_home=home, include_mcp=False, dry_run=False, registry=registry)["updated"]
+    toml = normalize_agent_tomls(codex_home=home, dry_run=False, registry=registry)
+    return md, toml
+
+
+def test_steady_state_normalize_reads_nothing(tmp_path, monkeypatch):
+    """A second run with unchanged files and rules skips them without reading."""
+    registry = {"entries": {}}
+    _kit(tmp_path)
+    _normalize(tmp_path, registry)
+    record = registry["entries"]["normalized:markdown:skills/foo/SKILL.md"]
+    assert record["inputHash"] != record["outputHash"]
+
+    read = []
+    real = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: read.append(self.name) or real(self))
+    assert _normalize(tmp_path, registry) == (0, 0)
+    assert read == []
+
+
+def test_edited_file_is_renormalized(tmp_path):
+    """A file whose stat changed is read and normalized again."""
+    registry = {"entries": {}}
+    _kit(tmp_path)
+    _normalize(tmp_path, registry)
+    (tmp_path / "rules" / "r.md").write_text("see ~/.claude/rules/x.md")
+    assert _normalize(tmp_path, registry)[0] == 1
+    assert ".claude" not in (tmp_path / "rules" / "r.md").read_text()
+
+
+def test_rule_change_reprocesses_only_its_class(tmp_path, monkeypatch):
+    """Changing the markdown table re-reads markdown but not agent TOMLs."""
+    registry = {"entries": {}}
+    _kit(tmp_path)
+    _normalize(tmp_path, registry)
+
+    monkeypatch.setattr(
+        path_normalizer, "SKILL_MD_REPLACEMENTS", SKILL_MD_REPLACEMENTS + [("plain", "simple")]
+    )
+    read = []
+    real = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: read.append(self.name) or real(self))
+    assert _normalize(tmp_path, registry) == (1, 0)
+    assert sorted(read) == ["SKILL.md", "codex-command-map.md", "r.md"]
+    assert (tmp_path / "rules" / "r.md").read_text() == "simple rule"
+
+
+def test_rules_version_tracks_table_content():
+    """The version digest is stable and changes with any rule or mapping."""
+    assert rules_version(SKILL_MD_REPLACEMENTS) == rules_version(list(SKILL_MD_REPLACEMENTS))
+    assert rules_version(SKILL_MD_REPLACEMENTS) != rules_version(SKILL_MD_REPLACEMENTS[:-1])
+    assert rules_version({"b", "a"}) == rules_version({"a", "b"})
+
+
+def test_parallel_normalize_matches_serial(tmp_path, capsys):
+    """A process pool yields the same log lines, count and files as a serial run."""
+    outputs = []
+    for jobs in (1, 3):
+        home = tmp_path / f"codex-{jobs}"
+        for i in range(12):
+            skill = home / "skills" / f"s{i:02}"
+            skill.mkdir(parents=True)
+            body = "run $HOME/.claude/skills/x.py" if i % 3 else "nothing to rewrite"
+            (skill / "SKILL.md").write_text(body)
+        (home / "rules").mkdir()
+        (home / "rules" / "r.md").write_text("see ~/.claude/rules/x.md")
+        capsys.readouterr()
+        count = normalize_files(codex_home=home, include_mcp=False, dry_run=False, jobs=jobs)["updated"]
+        files = sorted((p.relative_to(home).as_posix(), p.read_text()) for p in home.rglob("*.md"))
+        outputs.append((count, capsys.readouterr().out, files))
+    assert outputs[0] == outputs[1]
+    assert outputs[0][0] == 10
+
+
+def test_prefilter_skips_files_without_anchors(tmp_path, monkeypatch):
+    """Files with no rule anchor are scanned as bytes but never decoded."""
+    skill = tmp_path / "skills" / "foo"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("run $HOME/.claude/skills/foo/run.py")
+    (tmp_path / "rules").mkdir()
+    (tmp_path / "rules" / "plain.md").write_bytes("no targets here \u2014 caf\u00e9".encode("utf-8"))
+    assert path_normalizer.normalize_bytes(b"plain text") == b"plain text"
+
+    stats = normalize_files(codex_home=tmp_path, include_mcp=False, dry_run=False)
+    assert stats["scanned"] == 3  # SKILL.md, plain.md and the generated command map
+    assert stats["transformed"] == 1
+    assert stats["updated"] == 2  # SKILL.md rewrite + command map upsert
+
+
+def test_sqlite_registry_writes_only_changed_records(tmp_path):
+    """Normalization records are registry rows; a steady-state run writes none of them."""
+    from claudekit_codex_sync.registry_compact import compact_registry
+    from claudekit_codex_sync.sync_registry import load_registry, save_registry
+
+    _kit(tmp_path)
+    registry = load_registry(tmp_path, "sqlite")
+    _normalize(tmp_path, registry)
+    save_registry(tmp_path, registry)
+    assert "normalized" not in registry["entries"].load_meta()
+
+    _normalize(tmp_path, registry)
+    assert registry["entries"].flush({}) == 0
+    (tmp_path / "rules" / "r.md").write_text("see ~/.claude/rules/x.md")
+    _normalize(tmp_path, registry)
+    assert registry["entries"].flush({}) == 1
+
+    (tmp_path / "rules" / "r.md").unlink()
+    assert compact_registry(tmp_path, registry) == 1
+    assert "normalized:markdown" in registry["entries"]
+    registry["entries"].close()
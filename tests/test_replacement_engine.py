@@ -0,0 +1,90 @@
+"""Tests for replacement_engine module."""
+import random
+
+import pytest
+
+from claudekit_codex_sync.constants import (
+    AGENT_TOML_REPLACEMENTS,
+    CLAUDE_SYNTAX_ADAPTATIONS,
+    SKILL_MD_REPLACEMENTS,
+)
+from claudekit_codex_sync.replacement_engine import ReplacementEngine, compile_rules
+from claudekit_codex_sync.utils import apply_replacements
+
+TABLES = {
+    "skill": SKILL_MD_REPLACEMENTS,
+    "agent": AGENT_TOML_REPLACEMENTS + CLAUDE_SYNTAX_ADAPTATIONS,
+}
+
+
+def _sequential(text, rules):
+    for old, new in rules:
+        text = text.replace(old, new)
+    return text
+
+
+@pytest.mark.parametrize("name", sorted(TABLES))
+def test_engine_matches_sequential_on_fuzzed_text(name):
+    """Random splices of patterns, outputs and their fragments give identical results."""
+    rules = TABLES[name]
+    engine = ReplacementEngine(rules)
+    frags = [s for rule in rules for s in rule] + ["$HOME/", "./", "<project>/", "/", " ", "x"]
+    rnd = random.Random(1234)
+    for _ in range(20000):
+        text = "".join(rnd.choice(frags)[rnd.randrange(3) :] for _ in range(rnd.randrange(1, 8)))
+        assert engine.apply(text) == _sequential(text, rules), text
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Run `python $HOME/.claude/skills/foo/run.py` or ./.claude/skills/foo",
+        "See <project>/.claude/skills/x and <project>/.claude/agents",
+        "$HOME/./.claude/skills/bar and ~/.claude/.ck.json and .claude/.ck.json",
+        "The `.claude` dir; ./.claude/ root; .claude/rules/a.md",
+    ],
+)
+def test_skill_table_known_cases(text):
+    """Hand-picked cases, including the fix-up rule, match the ordered loop."""
+    assert apply_replacements(text, SKILL_MD_REPLACEMENTS) == _sequential(text, SKILL_MD_REPLACEMENTS)
+
+
+def test_dependent_rules_get_their_own_pass():
+    """A rule whose pattern can arise from an earlier output is not merged into its pass."""
+    engine = ReplacementEngine([("a", "b"), ("b", "c")])
+    assert engine.passes == 2
+    assert engine.apply("ab") == "cc"
+    independent = ReplacementEngine([("foo", "1"), ("bar", "2"), ("baz", "3")])
+    assert independent.passes == 1
+    assert independent.apply("foobarbaz") == "123"
+
+
+def test_earlier_rule_wins_overlap():
+    """When a later pattern overlaps an earlier one from the left, order is preserved."""
+    rules = [("cd", "X"), ("bc", "Y")]
+    assert ReplacementEngine(rules).apply("abcd") == _sequential("abcd", rules) == "abX"
+
+
+def test_real_tables_need_few_passes():
+    """The shipped tables compile to far fewer scans than rules."""
+    for rules in TABLES.values():
+        assert ReplacementEngine(rules).passes <= 2
+
+
+def test_compiled_engine_is_cached():
+    """Repeated use of a table reuses the compiled engine."""
+    rules = tuple(SKILL_MD_REPLACEMENTS)
+    assert compile_rules(rules) is compile_rules(rules)
+
+
+def test_anchors_cover_every_pattern():
+    """Each rule pattern contains an anchor, so anchor-free text is left untouched."""
+    for rules in TABLES.values():
+        engine = ReplacementEngine(rules)
+        assert all(any(a in old for a in engine.anchors) for old, _ in rules)
+        assert all(len(a) >= 4 for a in engine.anchors)
+    text = "plain markdown with no targets"
+    assert apply_replacements(text, SKILL_MD_REPLACEMENTS) is text
+    engine = compile_rules(tuple(SKILL_MD_REPLACEMENTS))
+    assert not engine.may_match(text.encode())
+    assert all(engine.may_match(old.encode()) for old, _ in SKILL_MD_REPLACEMENTS)
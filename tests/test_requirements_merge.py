@@ -0,0 +1,43 @@
+"""Tests for requirements_merge module."""
+from pathlib import Path
+
+from claudekit_codex_sync.requirements_merge import merge_requirements, parse_requirements
+
+
+def _req(home: Path, skill: str, text: str) -> Path:
+    path = home / "skills" / skill / "requirements.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_merge_combines_specs_per_project(tmp_path: Path):
+    """Specs for one project from different skills land on one line."""
+    a = _req(tmp_path, "a", "Requests>=2.0  # http\npyyaml\n")
+    b = _req(tmp_path, "b", "requests<3\n--extra-index-url https://example.test/simple\n")
+    merged = merge_requirements([a, b], root=tmp_path)
+    assert merged.conflicts == []
+    lines = merged.text.splitlines()
+    assert lines[0] == "--extra-index-url https://example.test/simple"
+    assert "pyyaml  # skills/a/requirements.txt" in lines
+    assert "requests>=2.0,<3  # skills/a/requirements.txt, skills/b/requirements.txt" in lines
+
+
+def test_conflicting_pins_are_reported(tmp_path: Path):
+    """Pins and bounds that can never hold together are conflicts."""
+    a = _req(tmp_path, "a", "numpy==1.26.4\npillow>=10\nrich~=13.0\n")
+    b = _req(tmp_path, "b", "numpy==2.0.0\npillow<9\nrich==13.7.1\n")
+    conflicts = merge_requirements([a, b], root=tmp_path).conflicts
+    assert [c.split(":")[0] for c in conflicts] == ["numpy", "pillow"]
+    assert "==2.0.0 (skills/b/requirements.txt)" in conflicts[0]
+
+
+def test_includes_are_followed_and_paths_absolutized(tmp_path: Path):
+    """-r includes are parsed inline; relative -c/-e paths still resolve."""
+    _req(tmp_path, "a", "")
+    (tmp_path / "skills" / "a" / "base.txt").write_text("click==8.1.7\n")
+    req = _req(tmp_path, "a", "-r base.txt\n-c constraints.txt\n-e ./lib\n")
+    reqs, other = parse_requirements(req, root=tmp_path)
+    assert [(r.name, r.specs) for r in reqs] == [("click", (("==", "8.1.7"),))]
+    skill_dir = (tmp_path / "skills" / "a").resolve()
+    assert other == [f"-c {skill_dir / 'constraints.txt'}", f"-e {skill_dir / 'lib'}"]
@@ -16,3 +16,12 @@ def test_empty_codex_home(tmp_path: Path):
     result = verify_runtime(codex_home=tmp_path, dry_run=False)
     assert result["copywriting"] in ("not-found", "no-venv")
     assert result["skills"] == 0
+
+
+def test_skill_count_ignores_node_modules(tmp_path: Path):
+    """SKILL.md files vendored under node_modules are not counted."""
+    (tmp_path / "skills" / "a" / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "skills" / "a" / "SKILL.md").write_text("# a")
+    (tmp_path / "skills" / "a" / "node_modules" / "dep" / "SKILL.md").write_text("# dep")
+    result = verify_runtime(codex_home=tmp_path, dry_run=False)
+    assert result["skills"] == 1
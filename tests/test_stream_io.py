@@ -0,0 +1,75 @@
+"""Tests for stream_io module."""
+import io
+import zipfile
+from pathlib import Path
+
+from claudekit_codex_sync import stream_io
+from claudekit_codex_sync.archive_index import ZipIndex
+from claudekit_codex_sync.asset_sync_zip import sync_assets
+from claudekit_codex_sync.hash_cache import cached_hash, hash_cache_stats, reset_hash_cache
+from claudekit_codex_sync.stream_io import peak_rss_bytes, write_stream_if_changed
+
+
+def _opener(data: bytes):
+    return lambda: io.BytesIO(data)
+
+
+def test_stream_compare_stops_at_first_difference(tmp_path: Path, monkeypatch):
+    """A difference in the first chunk ends the compare without reading the rest."""
+    monkeypatch.setattr(stream_io, "CHUNK_SIZE", 4)
+    dst = tmp_path / "f.bin"
+    dst.write_bytes(b"aaaa" + b"b" * 100)
+    reads = []
+
+    class Counting(io.BytesIO):
+        def read(self, n=-1):
+            reads.append(n)
+            return super().read(n)
+
+    data = b"xxxx" + b"b" * 100
+    assert not stream_io.stream_matches(lambda: Counting(data), dst, len(data))
+    assert len(reads) == 1
+
+
+def test_write_stream_if_changed(tmp_path: Path):
+    """New, unchanged and changed content; dry-run leaves the file alone."""
+    dst = tmp_path / "sub" / "f.bin"
+    assert write_stream_if_changed(dst, _opener(b"one"), size=3, mode=0o644, dry_run=False) == (True, True)
+    assert write_stream_if_changed(dst, _opener(b"one"), size=3, mode=0o644, dry_run=False) == (False, False)
+    assert write_stream_if_changed(dst, _opener(b"two"), size=3, mode=0o644, dry_run=True) == (True, False)
+    assert dst.read_bytes() == b"one"
+    assert write_stream_if_changed(dst, _opener(b"two!"), size=4, mode=0o755, dry_run=False) == (True, False)
+    assert dst.read_bytes() == b"two!"
+    assert dst.stat().st_mode & 0o777 == 0o755
+    assert [p.name for p in dst.parent.iterdir()] == ["f.bin"]
+
+
+def test_write_stream_records_hash(tmp_path: Path):
+    """The digest computed while streaming serves later hash lookups."""
+    reset_hash_cache()
+    dst = tmp_path / "f.bin"
+    write_stream_if_changed(dst, _opener(b"payload"), size=7, mode=None, dry_run=False)
+    cached_hash(dst)
+    assert hash_cache_stats() == {"hits": 1, "misses": 0}
+
+
+def test_zip_assets_stream_multi_chunk_members(tmp_path: Path, monkeypatch):
+    """Members larger than one chunk round-trip and compare equal on resync."""
+    monkeypatch.setattr(stream_io, "CHUNK_SIZE", 1024)
+    payload = bytes(range(256)) * 40
+    zip_path = tmp_path / "kit.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr(".claude/rules/big.bin", payload)
+    home = tmp_path / "codex"
+    with zipfile.ZipFile(zip_path) as zf:
+        first = sync_assets(ZipIndex.build(zf), codex_home=home, include_hooks=False, dry_run=False)
+        second = sync_assets(ZipIndex.build(zf), codex_home=home, include_hooks=False, dry_run=False)
+    assert first["added"] == 1
+    assert second["added"] == second["updated"] == 0
+    assert (home / "rules" / "big.bin").read_bytes() == payload
+
+
+def test_peak_rss_reported():
+    """Peak RSS is available on POSIX hosts."""
+    peak = peak_rss_bytes()
+    assert peak is None or peak > 0
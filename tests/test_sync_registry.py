@@ -0,0 +1,160 @@
+"""Tests for sync_registry module."""
+import json
+from pathlib import Path
+
+import pytest
+
+from claudekit_codex_sync import asset_sync_dir, sync_registry, tree_delta
+from claudekit_codex_sync.asset_sync_dir import sync_assets_from_dir
+from claudekit_codex_sync.registry_compact import compact_registry
+from claudekit_codex_sync.skill_sync_dir import sync_skills_from_dir
+from claudekit_codex_sync.sync_registry import (
+    REGISTRY_DB,
+    REGISTRY_FILE,
+    check_user_edit,
+    load_registry,
+    make_entry,
+    save_registry,
+)
+
+
+def _no_hash(path):
+    raise AssertionError(f"unexpected hash of {path}")
+
+
+def test_check_user_edit_uses_stat_fast_path(tmp_path: Path, monkeypatch):
+    """Matching target stat skips hashing; --paranoid forces it."""
+    src = tmp_path / "src.md"
+    dst = tmp_path / "dst.md"
+    src.write_text("a")
+    dst.write_text("a")
+    entry = make_entry(src, dst)
+    monkeypatch.setattr(sync_registry, "compute_hash", _no_hash)
+    assert check_user_edit(entry, dst) is False
+    with pytest.raises(AssertionError):
+        check_user_edit(entry, dst, paranoid=True)
+
+
+def test_make_entry_reuses_hashes_when_stats_match(tmp_path: Path, monkeypatch):
+    """Unchanged files keep their previous hashes without re-reading."""
+    src = tmp_path / "src.md"
+    dst = tmp_path / "dst.md"
+    src.write_text("a")
+    dst.write_text("a")
+    first = make_entry(src, dst)
+    monkeypatch.setattr(sync_registry, "compute_hash", _no_hash)
+    second = make_entry(src, dst, previous=first)
+    assert second["sourceHash"] == first["sourceHash"]
+    assert second["targetStat"] == first["targetStat"]
+
+
+def test_steady_state_sync_is_stat_only(tmp_path: Path, monkeypatch):
+    """Second sync of an unchanged tree neither hashes nor copies."""
+    source = tmp_path / "source"
+    codex = tmp_path / "codex"
+    (source / "rules").mkdir(parents=True)
+    (source / "rules" / "a.md").write_text("# a")
+    skill = source / "skills" / "demo"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# demo")
+    registry = {"entries": {}}
+
+    def run():
+        assets = sync_assets_from_dir(
+            source, codex_home=codex, include_hooks=False,
+            dry_run=False, registry=registry, force=False,
+        )
+        skills = sync_skills_from_dir(
+            source, codex_home=codex, include_mcp=False,
+            include_conflicts=False, dry_run=False, registry=registry,
+        )
+        return assets, skills
+
+    run()
+    assert "skills/demo/SKILL.md" in registry["entries"]
+    monkeypatch.setattr(sync_registry, "compute_hash", _no_hash)
+    monkeypatch.setattr(Path, "read_bytes", _no_hash)
+    monkeypatch.setattr(tree_delta, "files_equal", _no_hash)
+    monkeypatch.setattr(asset_sync_dir, "copy_file_if_changed", _no_hash)
+    assets, skills = run()
+    assert assets["added"] == assets["updated"] == 0
+    assert skills["files_added"] == skills["files_updated"] == 0
+
+
+def test_sqlite_backend_migrates_json(tmp_path: Path):
+    """Selecting sqlite imports the JSON registry and removes the JSON file."""
+    legacy = {"version": 1, "lastSync": None, "sourceDir": "/src",
+              "entries": {"rules/a.md": {"sourceHash": "s", "targetHash": "t"}}}
+    (tmp_path / REGISTRY_FILE).write_text(json.dumps(legacy))
+    registry = load_registry(tmp_path, "sqlite")
+    assert not (tmp_path / REGISTRY_FILE).exists()
+    assert registry["sourceDir"] == "/src"
+    assert registry["entries"]["rules/a.md"]["targetHash"] == "t"
+    registry["entries"].close()
+
+    reloaded = load_registry(tmp_path)
+    assert "rules/a.md" in reloaded["entries"]
+    reloaded["entries"].close()
+
+
+def test_sqlite_flush_writes_only_changed_rows(tmp_path: Path):
+    """Only rows set or deleted since the last flush are written."""
+    registry = load_registry(tmp_path, "sqlite")
+    entries = registry["entries"]
+    for i in range(10):
+        entries[f"rules/{i}.md"] = {"targetHash": str(i)}
+    save_registry(tmp_path, registry)
+    entries["rules/3.md"] = {"targetHash": "x"}
+    del entries["rules/4.md"]
+    assert entries.flush({}) == 2
+    assert entries.with_prefix("rules/")["3.md"] == {"targetHash": "x"}
+    assert len(entries) == 9
+    entries.close()
+
+
+def test_compact_drops_orphans(tmp_path: Path):
+    """compact_registry removes entries whose target is gone."""
+    (tmp_path / "rules").mkdir()
+    (tmp_path / "rules" / "kept.md").write_text("k")
+    registry = {"entries": {"rules/kept.md": {}, "rules/gone.md": {}}}
+    assert compact_registry(tmp_path, registry) == 1
+    assert list(registry["entries"]) == ["rules/kept.md"]
+
+
+def test_dry_run_never_touches_registry_files(tmp_path: Path):
+    """Dry runs skip migration, never create a database and open existing ones read-only."""
+    home = tmp_path / ".codex"
+    registry = load_registry(home, "sqlite", dry_run=True)
+    assert registry["entries"] == {}
+    assert not home.exists()
+
+    home.mkdir()
+    legacy = {"version": 1, "entries": {"rules/a.md": {"targetHash": "t"}}}
+    (home / REGISTRY_FILE).write_text(json.dumps(legacy))
+    registry = load_registry(home, "sqlite", dry_run=True)
+    assert registry["entries"]["rules/a.md"]["targetHash"] == "t"
+    assert sorted(p.name for p in home.iterdir()) == [REGISTRY_FILE]
+
+    load_registry(home, "sqlite")["entries"].close()
+    before = sorted(p.name for p in home.iterdir())
+    registry = load_registry(home, dry_run=True)
+    assert registry["entries"]["rules/a.md"]["targetHash"] == "t"
+    registry["entries"]["rules/b.md"] = {}
+    assert registry["entries"].flush({}) == 0
+    registry["entries"].close()
+    assert sorted(p.name for p in home.iterdir()) == before
+
+
+def test_json_backend_exports_existing_database(tmp_path: Path):
+    """Selecting json over a database exports it instead of ignoring it."""
+    registry = load_registry(tmp_path, "sqlite")
+    registry["entries"]["rules/a.md"] = {"targetHash": "t"}
+    registry["sourceDir"] = "/src"
+    save_registry(tmp_path, registry)
+    registry["entries"].close()
+
+    exported = load_registry(tmp_path, "json")
+    assert exported["entries"] == {"rules/a.md": {"targetHash": "t"}}
+    assert exported["sourceDir"] == "/src"
+    assert not (tmp_path / REGISTRY_DB).exists()
+    assert json.loads((tmp_path / REGISTRY_FILE).read_text())["entries"] == exported["entries"]
@@ -0,0 +1,68 @@
+"""Tests for toml_document module."""
+import tomllib
+
+from claudekit_codex_sync.toml_document import TomlDocument, toml_string
+
+SAMPLE = '''# user config
+model = "o3"  # keep me
+list = [
+  "a", # trailing [ bracket in comment
+  "b",
+]
+notes = """
+[not.a.table]
+key = "inside string"
+"""
+
+[features]
+multi_agent = false
+
+[[skills.config]]
+path = "/x"
+enabled = true
+
+[ agents . planner ]
+description = "Plans"
+inline = { a = 1, b = [2, 3] }'''
+
+
+def test_round_trip_is_byte_identical():
+    """Parsing and rendering without edits reproduces the text (plus a final newline)."""
+    doc = TomlDocument.parse(SAMPLE)
+    assert doc.render() == SAMPLE + "\n"
+    assert doc.revision == 0
+
+
+def test_indexes_tables_keys_and_multiline_values():
+    """Tables, array entries and keys are indexed; multi-line values stay one entry."""
+    doc = TomlDocument.parse(SAMPLE)
+    assert doc.table("not.a.table") is None
+    assert doc.table("features").get("multi_agent") is False
+    assert doc.table("agents.planner").get("inline") == {"a": 1, "b": [2, 3]}
+    assert [t.get("path") for t in doc.array("skills.config")] == ["/x"]
+    assert doc.root.get("list") == ["a", "b"]
+    assert doc.root.get("notes").startswith("[not.a.table]")
+
+
+def test_edits_keep_comments_and_unrelated_lines():
+    """Setting an equal value is a no-op; edits and additions touch only their lines."""
+    doc = TomlDocument.parse(SAMPLE)
+    assert not doc.root.set("model", '"o3"')
+    assert doc.root.set("project_doc_max_bytes", "65536")
+    doc.table("features").setdefault("child_agents_md", "true")
+    role = doc.add_table("agents.tester")
+    role.set("description", toml_string('Runs "tests"'))
+    text = doc.render()
+    assert 'model = "o3"  # keep me' in text
+    assert '"""\nproject_doc_max_bytes = 65536\n\n[features]' in text
+    data = tomllib.loads(text)
+    assert data["features"] == {"multi_agent": False, "child_agents_md": True}
+    assert data["agents"]["tester"]["description"] == 'Runs "tests"'
+    assert doc.revision == 4
+
+
+def test_remove_array_entry():
+    """Removing an array-of-tables entry drops exactly its lines."""
+    doc = TomlDocument.parse("[[s]]\nk = 1\n\n[[s]]\nk = 2\n")
+    doc.remove_table(doc.array("s")[0])
+    assert doc.render() == "[[s]]\nk = 2\n"